@@ -295,6 +295,7 @@ def initialize_cbm(
     sit: SIT,
     dll_path=None,
     parameters_factory: Callable[[], dict] | None = None,
+    spinup_cache_dir: str | None = None,
 ) -> Iterator[CBM]:
     """Create an initialized instance of
         :py:class:`libcbm.model.cbm.cbm_model.CBM` based on SIT input
@@ -306,6 +307,11 @@ def initialize_cbm(
         parameters_factory (func, optional): a parameterless function that
             returns parameters for the cbm model.  If unspecified the sit
             default is used. Defaults to None.
+        spinup_cache_dir (str, optional): if specified, spinup results are
+            cached in this directory and reused by subsequent runs with
+            identical inputs. See
+            :py:class:`libcbm.model.cbm.cbm_spinup_cache.SpinupCache`.
+            Defaults to None.
 
     Returns:
         libcbm.model.cbm.cbm_model.CBM: an initialized CBM instance
@@ -334,6 +340,7 @@ def initialize_cbm(
         classifiers_factory=lambda: sit_cbm_config.get_classifiers(
             sit.sit_data.classifiers, sit.sit_data.classifier_values
         ),
+        spinup_cache_dir=spinup_cache_dir,
     ) as cbm:
         yield cbm
 
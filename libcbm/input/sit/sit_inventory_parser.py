@@ -4,6 +4,7 @@
 
 import pandas as pd
 import numpy as np
+from typing import Iterable
 from libcbm.input.sit import sit_format
 from libcbm.input.sit import sit_parser
 
@@ -144,6 +145,86 @@ def parse(
     Returns:
         pandas.DataFrame: validated inventory
     """
+    inventory = _unpack_inventory(
+        inventory_table,
+        classifiers,
+        classifier_values,
+        disturbance_types,
+        has_inventory_ids,
+    )
+    return _finalize_inventory(inventory, age_classes, has_inventory_ids)
+
+
+def parse_chunks(
+    inventory_chunks: Iterable[pd.DataFrame],
+    classifiers: pd.DataFrame,
+    classifier_values: pd.DataFrame,
+    disturbance_types: pd.DataFrame,
+    age_classes: pd.DataFrame,
+    has_inventory_ids: bool = False,
+) -> pd.DataFrame:
+    """Parses and validates SIT formatted inventory data which is read in
+    row chunks, for example the return value of :py:func:`pandas.read_csv`
+    with the chunksize parameter.  Each chunk is validated and unpacked as
+    it is read, and its classifier columns are stored as
+    :py:class:`pandas.Categorical` with the defined classifier values as
+    categories, so that only the compact parsed form of the inventory is
+    held in memory.
+
+    The result is the same as that of :py:func:`parse` on the entire table,
+    other than the classifier column dtypes.
+
+    Args:
+        inventory_chunks (Iterable[pandas.DataFrame]): the row chunks of a
+            SIT formatted inventory
+        classifiers (pandas.DataFrame): see :py:func:`parse`
+        classifier_values (pandas.DataFrame): see :py:func:`parse`
+        disturbance_types (pandas.DataFrame): see :py:func:`parse`
+        age_classes (pandas.DataFrame): see :py:func:`parse`
+        has_inventory_ids (bool, optional): see :py:func:`parse`
+
+    Raises:
+        ValueError: no inventory chunks were specified
+
+    Returns:
+        pandas.DataFrame: validated inventory
+    """
+    classifier_dtypes = {
+        row.name: pd.CategoricalDtype(
+            classifier_values[classifier_values["classifier_id"] == row.id][
+                "name"
+            ].unique()
+        )
+        for row in classifiers.itertuples()
+    }
+    parsed_chunks = []
+    for inventory_chunk in inventory_chunks:
+        parsed_chunk = _unpack_inventory(
+            inventory_chunk,
+            classifiers,
+            classifier_values,
+            disturbance_types,
+            has_inventory_ids,
+        )
+        # the classifier values are validated on unpacking, so none are
+        # lost in conversion to the categorical type
+        parsed_chunks.append(parsed_chunk.astype(classifier_dtypes))
+    if not parsed_chunks:
+        raise ValueError("no inventory chunks specified")
+    inventory = pd.concat(parsed_chunks, ignore_index=True)
+    return _finalize_inventory(inventory, age_classes, has_inventory_ids)
+
+
+def _unpack_inventory(
+    inventory_table: pd.DataFrame,
+    classifiers: pd.DataFrame,
+    classifier_values: pd.DataFrame,
+    disturbance_types: pd.DataFrame,
+    has_inventory_ids: bool,
+) -> pd.DataFrame:
+    """Unpack and validate the rows of a SIT formatted inventory table.
+    Each row is validated independently of the others.
+    """
     inventory_format = sit_format.get_inventory_format(
         classifiers["name"].tolist(),
         len(inventory_table.columns),
@@ -211,6 +292,17 @@ def parse(
         "inventory",
     )
 
+    return inventory
+
+
+def _finalize_inventory(
+    inventory: pd.DataFrame,
+    age_classes: pd.DataFrame,
+    has_inventory_ids: bool,
+) -> pd.DataFrame:
+    """Expand the age class rows of an unpacked inventory, and validate the
+    constraints between rows.
+    """
     if inventory.using_age_class.any():
         if has_inventory_ids:
             raise ValueError(
@@ -259,8 +351,6 @@ def expand_age_class_inventory(
     Returns:
         pandas.DataFrame: the age class expanded inventory
     """
-    expanded_age_classes = pd.DataFrame()
-
     undefined_age_class_name = np.setdiff1d(
         inventory.loc[inventory.using_age_class].age.astype(str).unique(),
         age_classes.name.unique(),
@@ -270,30 +360,9 @@ def expand_age_class_inventory(
             "Undefined age class ids (as defined in sit "
             f"age classes) detected: {undefined_age_class_name}"
         )
-    for row in age_classes.itertuples():
-        age_range = (
-            range(
-                row.start_year, row.start_year + row.class_size  # type: ignore
-            )
-            if row.class_size > 0  # type: ignore
-            else [0]
-        )
-
-        expanded_age_classes = pd.concat(
-            [
-                expanded_age_classes,
-                pd.DataFrame(
-                    {
-                        "name": row.name,
-                        "age": age_range,
-                        "class_size": row.class_size,
-                    }
-                ),
-            ]
-        )
 
     non_using_age_class_rows = inventory.loc[~inventory["using_age_class"]]
-    using_age_class_rows = inventory.loc[inventory["using_age_class"]].copy()
+    using_age_class_rows = inventory.loc[inventory["using_age_class"]]
 
     if "spatial_reference" in using_age_class_rows:
         if (using_age_class_rows.spatial_reference >= 0).any():
@@ -301,25 +370,38 @@ def expand_age_class_inventory(
                 "using_age_class=true and spatial reference may not be "
                 "used together"
             )
-    using_age_class_rows = using_age_class_rows.assign(
-        age=using_age_class_rows["age"].astype(str)
-    )
 
-    age_class_merge = using_age_class_rows.merge(
-        expanded_age_classes, left_on="age", right_on="name"
+    # each age class expands to one record per year in the class, or to a
+    # single record of age 0 for zero sized classes
+    class_size = age_classes["class_size"].to_numpy()
+    class_n_ages = np.where(class_size > 0, class_size, 1)
+    class_first_age = np.where(
+        class_size > 0, age_classes["start_year"].to_numpy(), 0
+    )
+    class_index = pd.Index(age_classes["name"]).get_indexer(
+        using_age_class_rows["age"].astype(str)
     )
 
-    age_class_merge["age_x"] = age_class_merge["age_y"]
-    age_class_merge.loc[
-        age_class_merge["class_size"] > 0, "area"
-    ] /= age_class_merge.loc[age_class_merge["class_size"] > 0, "class_size"]
-
-    age_class_merge = age_class_merge.rename(columns={"age_x": "age"})
-    age_class_merge = age_class_merge.drop(
-        columns=["age_y", "class_size", "name"]
+    # the output size is known up front: each inventory row is repeated
+    # once per age in its class, and the age is the class's first age plus
+    # the offset of the repeated row
+    n_ages = class_n_ages[class_index]
+    row_index = np.repeat(np.arange(len(class_index)), n_ages)
+    row_start = np.repeat(np.cumsum(n_ages) - n_ages, n_ages)
+    age_offset = np.arange(len(row_index)) - row_start
+    expanded_class_index = class_index[row_index]
+
+    age_class_rows = using_age_class_rows.iloc[row_index].reset_index(
+        drop=True
     )
+    age_class_rows["age"] = class_first_age[expanded_class_index] + age_offset
+    expanded_class_size = class_size[expanded_class_index]
+    age_class_rows["area"] = age_class_rows["area"] / np.where(
+        expanded_class_size > 0, expanded_class_size, 1
+    )
+
     result = pd.concat(
-        [non_using_age_class_rows, age_class_merge]
+        [non_using_age_class_rows, age_class_rows]
     ).reset_index(drop=True)
 
     return result
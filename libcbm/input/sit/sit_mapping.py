@@ -10,6 +10,43 @@ from libcbm.input.sit import sit_format
 from typing import Callable
 
 
+def _map_distinct_rows(func: Callable, *columns: pd.Series) -> np.ndarray:
+    """Apply func to each distinct combination of values in the specified
+    columns, and broadcast the results to all rows.  The columns are
+    factorized, so func is called once per distinct combination rather than
+    once per row.
+
+    Args:
+        func (Callable): function of one positional argument per column
+        columns (pandas.Series): equal length columns
+
+    Returns:
+        numpy.ndarray: the result of func for each row
+    """
+    n_rows = len(columns[0])
+    row_codes = np.zeros(n_rows, dtype="int64")
+    column_uniques = []
+    for column in columns:
+        codes, uniques = pd.factorize(column)
+        # null values are factorized as -1, so they are assigned an
+        # additional code
+        uniques = list(uniques) + [np.nan]
+        codes = np.where(codes < 0, len(uniques) - 1, codes)
+        row_codes = row_codes * len(uniques) + codes
+        column_uniques.append(uniques)
+
+    distinct_row_codes, distinct_codes = pd.factorize(row_codes)
+    results = []
+    for distinct_code in distinct_codes:
+        code = int(distinct_code)
+        values = []
+        for uniques in reversed(column_uniques):
+            code, value_code = divmod(code, len(uniques))
+            values.append(uniques[value_code])
+        results.append(func(*reversed(values)))
+    return np.array(results)[distinct_row_codes]
+
+
 class SITMapping:
     def __init__(self, config: dict, sit_cbm_defaults: SITCBMDefaults):
         self.config = config
@@ -185,18 +222,20 @@ class SITMapping:
                 }
             ).iterrows()
         }
-        output = []
-        for admin, eco in inventory[spu_classifier].map(default_spu_map):
+
+        def spu_map_func(spu_classifier_value: str) -> int:
+            admin, eco = default_spu_map[spu_classifier_value]
             try:
-                output.append(
-                    self.sit_cbm_defaults.get_spatial_unit_id(admin, eco)
-                )
+                return self.sit_cbm_defaults.get_spatial_unit_id(admin, eco)
             except KeyError:
                 raise KeyError(
                     "The specified administrative/ecological boundary "
                     f"combination does not exist: '{admin}', '{eco}'"
                 )
-        return pd.Series(output)
+
+        return pd.Series(
+            _map_distinct_rows(spu_map_func, inventory[spu_classifier])
+        )
 
     def _get_spatial_unit_separate_admin_eco(
         self,
@@ -263,29 +302,29 @@ class SITMapping:
             ).iterrows()
         }
 
-        def spu_map_func(row: pd.Series) -> int:
+        def spu_map_func(admin_value: str, eco_value: str) -> int:
+            default_admin_boundary = default_admin_map.get(admin_value, np.nan)
+            default_eco_boundary = default_eco_map.get(eco_value, np.nan)
             try:
                 return self.sit_cbm_defaults.get_spatial_unit_id(
-                    row.default_admin_boundary, row.default_eco_boundary
+                    default_admin_boundary, default_eco_boundary
                 )
             except KeyError:
                 raise KeyError(
                     "The specified administrative/ecological boundary "
                     "combination does not exist: "
-                    f"'{row.default_admin_boundary}', "
-                    f"'{row.default_eco_boundary}'"
+                    f"'{default_admin_boundary}', "
+                    f"'{default_eco_boundary}'"
                 )
 
-        return pd.DataFrame(
-            {
-                "default_admin_boundary": inventory[admin_classifier].map(
-                    default_admin_map
-                ),
-                "default_eco_boundary": inventory[eco_classifier].map(
-                    default_eco_map
-                ),
-            }
-        ).apply(spu_map_func, axis=1)
+        return pd.Series(
+            _map_distinct_rows(
+                spu_map_func,
+                inventory[admin_classifier],
+                inventory[eco_classifier],
+            ),
+            index=inventory.index,
+        )
 
     def get_spatial_unit(
         self,
@@ -484,7 +523,16 @@ class SITMapping:
                 "Undefined non forest classifier values found in inventory "
                 f"{undefined_values}"
             )
-        return inventory[non_forest_classifier].map(default_nonforest_type_map)
+        non_forest_cover_ids = inventory[non_forest_classifier].map(
+            default_nonforest_type_map
+        )
+        if isinstance(non_forest_cover_ids.dtype, pd.CategoricalDtype):
+            # categorical classifier columns, as produced by
+            # sit_inventory_parser.parse_chunks, map to categorical ids
+            non_forest_cover_ids = non_forest_cover_ids.astype(
+                non_forest_cover_ids.cat.categories.dtype
+            )
+        return non_forest_cover_ids
 
     def get_sit_disturbance_type_id(
         self, disturbance_type: pd.Series
@@ -5,6 +5,7 @@
 # Built-in modules #
 from __future__ import annotations
 import os
+from typing import Iterable
 
 # Third party modules #
 import pandas as pd
@@ -69,6 +70,11 @@ def load_table(config: dict, config_dir: str) -> pd.DataFrame:
             {"type": "excel"
              "params: {"path": "my_file.xls", "header": null}
 
+        If the "chunksize" parameter is specified for a csv table, the
+        return value is an iterator of pandas.DataFrame row chunks, as
+        with pandas.read_csv.  Of the SIT tables, only the inventory may be
+        read in chunks.
+
     Args:
         config (dict): configuration specifying a source of data
         config_dir (str): directory containing the configuration
@@ -78,7 +84,8 @@ def load_table(config: dict, config_dir: str) -> pd.DataFrame:
             supported data source.
 
     Returns:
-        pandas.DataFrame: the loaded data
+        pandas.DataFrame: the loaded data, or an iterator of row chunks of
+            the data if "chunksize" is specified
     """
     load_type = config["type"]
     load_params = config["params"]
@@ -109,6 +116,8 @@ def read(config: dict, config_dir: str) -> SITData:
     sit_classifiers = load_table(config["classifiers"], config_dir)
     sit_disturbance_types = load_table(config["disturbance_types"], config_dir)
     sit_age_classes = load_table(config["age_classes"], config_dir)
+    # if the inventory params specify "chunksize" this is a reader which
+    # streams the inventory rows to the parser
     sit_inventory = load_table(config["inventory"], config_dir)
     sit_yield = load_table(config["yield"], config_dir)
     sit_events = (
@@ -139,17 +148,21 @@ def read(config: dict, config_dir: str) -> SITData:
             ],
         )
     # Validate data #
-    sit_data = parse(
-        sit_classifiers,
-        sit_disturbance_types,
-        sit_age_classes,
-        sit_inventory,
-        sit_yield,
-        sit_events,
-        sit_transitions,
-        sit_eligibilities,
-        parse_options,
-    )
+    try:
+        sit_data = parse(
+            sit_classifiers,
+            sit_disturbance_types,
+            sit_age_classes,
+            sit_inventory,
+            sit_yield,
+            sit_events,
+            sit_transitions,
+            sit_eligibilities,
+            parse_options,
+        )
+    finally:
+        if not isinstance(sit_inventory, pd.DataFrame):
+            sit_inventory.close()
     # Return #
     return sit_data
 
@@ -190,7 +203,7 @@ def parse(
     sit_classifiers: pd.DataFrame,
     sit_disturbance_types: pd.DataFrame,
     sit_age_classes: pd.DataFrame,
-    sit_inventory: pd.DataFrame,
+    sit_inventory: pd.DataFrame | Iterable[pd.DataFrame],
     sit_yield: pd.DataFrame,
     sit_events: pd.DataFrame | None = None,
     sit_transitions: pd.DataFrame | None = None,
@@ -230,7 +243,10 @@ def parse(
         sit_disturbance_types (pandas.DataFrame): SIT formatted disturbance
             types
         sit_age_classes (pandas.DataFrame): SIT formatted age classes
-        sit_inventory (pandas.DataFrame): SIT formatted inventory
+        sit_inventory (pandas.DataFrame, Iterable[pandas.DataFrame]): SIT
+            formatted inventory, or an iterable of its row chunks, in which
+            case the inventory is parsed by
+            :py:func:`libcbm.input.sit.sit_inventory_parser.parse_chunks`
         sit_yield (pandas.DataFrame): SIT formatted yield curves
         sit_events (pandas.DataFrame, optional): SIT formatted disturbance
             events
@@ -258,14 +274,24 @@ def parse(
     )
     age_classes = sit_age_class_parser.parse(sit_age_classes)
 
-    inventory = sit_inventory_parser.parse(
-        sit_inventory,
-        classifiers,
-        classifier_values,
-        disturbance_types,
-        age_classes,
-        sit_parse_options.inventory_ids,
-    )
+    if isinstance(sit_inventory, pd.DataFrame):
+        inventory = sit_inventory_parser.parse(
+            sit_inventory,
+            classifiers,
+            classifier_values,
+            disturbance_types,
+            age_classes,
+            sit_parse_options.inventory_ids,
+        )
+    else:
+        inventory = sit_inventory_parser.parse_chunks(
+            sit_inventory,
+            classifiers,
+            classifier_values,
+            disturbance_types,
+            age_classes,
+            sit_parse_options.inventory_ids,
+        )
 
     yield_table = sit_yield_parser.parse(
         sit_yield, classifiers, classifier_values, age_classes
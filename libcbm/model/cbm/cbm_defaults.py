@@ -3,11 +3,209 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 import os
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any
 from typing import Callable
 import sqlite3
 import pandas as pd
+import libcbm
 from libcbm.resources import cbm_defaults_queries
 
+# incremented whenever the layout of the cached tables changes
+_CACHE_FORMAT_VERSION = 1
+
+_PARAMETER_TABLES = [
+    "decay_parameters",
+    "slow_mixing_rate",
+    "mean_annual_temp",
+    "turnover_parameters",
+    "disturbance_matrix_values",
+    "disturbance_matrix_associations",
+    "root_parameter",
+    "growth_multipliers",
+    "land_classes",
+    "disturbance_type_land_type",
+    "spatial_units",
+    "random_return_interval",
+    "spinup_parameter",
+    "afforestation_pre_type",
+]
+
+
+def connect(sqlite_path: str) -> sqlite3.Connection:
+    """Open a read-only connection to a cbm_defaults database.
+
+    Args:
+        sqlite_path (str): path to a cbm_defaults database
+
+    Raises:
+        ValueError: the specified path does not exist
+
+    Returns:
+        sqlite3.Connection: a read-only connection to the database
+    """
+    if not os.path.exists(sqlite_path):
+        # sqlite3.connect does not raise an error on no path
+        raise ValueError(
+            "specified path does not exist '{0}'".format(sqlite_path)
+        )
+    uri = Path(sqlite_path).resolve().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True)
+
+
+def _get_cache_key(sqlite_path: str, *key_parts: str) -> str:
+    cache_hash = hashlib.sha256()
+    cache_hash.update(str(_CACHE_FORMAT_VERSION).encode("UTF-8"))
+    cache_hash.update(libcbm.__version__.encode("UTF-8"))
+    with open(sqlite_path, "rb") as db_file:
+        for block in iter(lambda: db_file.read(1 << 20), b""):
+            cache_hash.update(block)
+    for key_part in key_parts:
+        cache_hash.update(b"\0" + key_part.encode("UTF-8"))
+    return cache_hash.hexdigest()
+
+
+def load_cached(
+    cache_dir: str | None,
+    sqlite_path: str,
+    loader: Callable[[sqlite3.Connection], Any],
+    *key_parts: str,
+) -> Any:
+    """Load data from a cbm_defaults database using a single read-only
+    connection, optionally storing the decoded result in a local cache
+    keyed by the hash of the database file, the libcbm version, and the
+    specified key parts.
+
+    Args:
+        cache_dir (str, optional): directory in which decoded results are
+            stored. If None, no caching is performed.
+        sqlite_path (str): path to a cbm_defaults database
+        loader (Callable[[sqlite3.Connection], Any]): function which loads
+            the data from an open connection. Its result must be picklable.
+        key_parts (str): strings identifying the loaded data, for example
+            the loader name and the locale code
+
+    Returns:
+        Any: the result of loader, or the cached equivalent
+    """
+    cache_path = None
+    if cache_dir is not None:
+        key = _get_cache_key(sqlite_path, *key_parts)
+        cache_path = os.path.join(cache_dir, f"{key}.pkl")
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as cache_file:
+                return pickle.load(cache_file)
+
+    conn = connect(sqlite_path)
+    try:
+        result = loader(conn)
+    finally:
+        conn.close()
+
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".pkl", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as cache_file:
+                pickle.dump(
+                    result, cache_file, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return result
+
+
+def _read_cbm_parameters(
+    conn: sqlite3.Connection,
+) -> dict[str, pd.DataFrame]:
+    return {
+        table: pd.read_sql(
+            cbm_defaults_queries.get_query("{}.sql".format(table)), conn
+        )
+        for table in _PARAMETER_TABLES
+    }
+
+
+def _read_cbm_pools(conn: sqlite3.Connection) -> list[dict]:
+    query = cbm_defaults_queries.get_query("pools.sql")
+    return [
+        {"name": row[0], "id": row[1], "index": index}
+        for index, row in enumerate(conn.execute(query))
+    ]
+
+
+def _read_flux_indicator_pools(
+    conn: sqlite3.Connection, query_filename: str
+) -> dict[int, list[int]]:
+    result: dict[int, list[int]] = {}
+    query = cbm_defaults_queries.get_query(query_filename)
+    for flux_indicator_id, pool_id in conn.execute(query):
+        result.setdefault(flux_indicator_id, []).append(int(pool_id))
+    return result
+
+
+def _read_cbm_flux_indicators(conn: sqlite3.Connection) -> list[dict]:
+    source_pools = _read_flux_indicator_pools(
+        conn, "flux_indicator_sources.sql"
+    )
+    sink_pools = _read_flux_indicator_pools(conn, "flux_indicator_sinks.sql")
+    flux_indicator_sql = cbm_defaults_queries.get_query("flux_indicator.sql")
+    return [
+        {
+            "id": row[0],
+            "name": row[1],
+            "index": index,
+            "process_id": row[2],
+            "source_pools": source_pools.get(row[0], []),
+            "sink_pools": sink_pools.get(row[0], []),
+        }
+        for index, row in enumerate(conn.execute(flux_indicator_sql))
+    ]
+
+
+def _read_cbm_configuration(conn: sqlite3.Connection) -> dict[str, list]:
+    return {
+        "pools": _read_cbm_pools(conn),
+        "flux_indicators": _read_cbm_flux_indicators(conn),
+    }
+
+
+def _read_cbm_defaults(conn: sqlite3.Connection) -> dict[str, Any]:
+    result: dict[str, Any] = {"parameters": _read_cbm_parameters(conn)}
+    result.update(_read_cbm_configuration(conn))
+    return result
+
+
+def load_cbm_defaults(
+    sqlite_path: str, cache_dir: str | None = None
+) -> dict[str, Any]:
+    """Loads the cbm default parameters, pools and flux indicators using a
+    single read-only connection.
+
+    Args:
+        sqlite_path (str): Path to a CBM parameters database as formatted
+            like: https://github.com/cat-cfs/cbm_defaults
+        cache_dir (str, optional): if specified, the decoded tables are
+            stored in this directory, keyed by the hash of the database,
+            and re-used by subsequent calls. Defaults to None.
+
+    Returns:
+        dict: a dictionary with keys:
+
+            - "parameters": see :py:func:`load_cbm_parameters`
+            - "pools": see :py:func:`load_cbm_pools`
+            - "flux_indicators": see :py:func:`load_cbm_flux_indicators`
+    """
+    return load_cached(
+        cache_dir, sqlite_path, _read_cbm_defaults, "cbm_defaults"
+    )
+
 
 def load_cbm_parameters(sqlite_path: str) -> dict[str, pd.DataFrame]:
     """Loads cbm default parameters into configuration dictionary format.
@@ -19,53 +217,18 @@ def load_cbm_parameters(sqlite_path: str) -> dict[str, pd.DataFrame]:
             like: https://github.com/cat-cfs/cbm_defaults
 
     Raises:
-        AssertionError:  if the name of any 2 queries is the same, an error is
-            raised.
+        ValueError: the specified path does not exist
 
     Returns:
         dict: a dictionary of name/pandas.DataFrame pairs for use with LibCBM
             configuration.
     """
-    result = {}
-
-    queries = {
-        k: cbm_defaults_queries.get_query("{}.sql".format(k))
-        for k in [
-            "decay_parameters",
-            "slow_mixing_rate",
-            "mean_annual_temp",
-            "turnover_parameters",
-            "disturbance_matrix_values",
-            "disturbance_matrix_associations",
-            "root_parameter",
-            "growth_multipliers",
-            "land_classes",
-            "disturbance_type_land_type",
-            "spatial_units",
-            "random_return_interval",
-            "spinup_parameter",
-            "afforestation_pre_type",
-        ]
-    }
-
-    if not os.path.exists(sqlite_path):
-        # sqlite3.connect does not raise an error on no path
-        raise ValueError(
-            "specified path does not exist '{0}'".format(sqlite_path)
-        )
-    conn = sqlite3.connect(sqlite_path)
+    conn = connect(sqlite_path)
     try:
-        for table, query in queries.items():
-            if table in result:
-                raise AssertionError(
-                    "duplicate table name detected {}".format(table)
-                )
-            result[table] = pd.read_sql(query, conn)
+        return _read_cbm_parameters(conn)
     finally:
         conn.close()
 
-    return result
-
 
 def load_cbm_pools(sqlite_path: str) -> list[dict]:
     """Loads cbm pool information from a cbm_defaults database into the
@@ -86,18 +249,10 @@ def load_cbm_pools(sqlite_path: str) -> list[dict]:
                     {"name": "poolN", "id": N, "index": N-1},
                 ]
     """
-    result = []
-    conn = sqlite3.connect(sqlite_path)
-    cursor = conn.cursor()
+    conn = connect(sqlite_path)
     try:
-        index = 0
-        query = cbm_defaults_queries.get_query("pools.sql")
-        for row in cursor.execute(query):
-            result.append({"name": row[0], "id": row[1], "index": index})
-            index += 1
-        return result
+        return _read_cbm_pools(conn)
     finally:
-        cursor.close()
         conn.close()
 
 
@@ -127,48 +282,15 @@ def load_cbm_flux_indicators(sqlite_path: str) -> list[dict]:
                     },
                 ]
     """
-    result = []
-    flux_indicator_source_sql = cbm_defaults_queries.get_query(
-        "flux_indicator_source.sql"
-    )
-    flux_indicator_sink_sql = cbm_defaults_queries.get_query(
-        "flux_indicator_sink.sql"
-    )
-    conn = sqlite3.connect(sqlite_path)
-    cursor = conn.cursor()
+    conn = connect(sqlite_path)
     try:
-        index = 0
-        flux_indicator_sql = cbm_defaults_queries.get_query(
-            "flux_indicator.sql"
-        )
-        flux_indicator_rows = list(cursor.execute(flux_indicator_sql))
-        for row in flux_indicator_rows:
-            flux_indicator = {
-                "id": row[0],
-                "name": row[1],
-                "index": index,
-                "process_id": row[2],
-                "source_pools": [],
-                "sink_pools": [],
-            }
-            for source_pool_row in cursor.execute(
-                flux_indicator_source_sql, (row[0],)
-            ):
-                flux_indicator["source_pools"].append(int(source_pool_row[0]))
-            for sink_pool_row in cursor.execute(
-                flux_indicator_sink_sql, (row[0],)
-            ):
-                flux_indicator["sink_pools"].append(int(sink_pool_row[0]))
-            result.append(flux_indicator)
-            index += 1
-        return result
+        return _read_cbm_flux_indicators(conn)
     finally:
-        cursor.close()
         conn.close()
 
 
 def get_cbm_parameters_factory(
-    db_path: str,
+    db_path: str, cache_dir: str | None = None
 ) -> Callable[[], dict[str, pd.DataFrame]]:
     """Get a function that formats CBM parameters for
     :py:class:`libcbm.wrapper.cbm.cbm_wrapper.CBMWrapper`
@@ -176,6 +298,8 @@ def get_cbm_parameters_factory(
 
     Args:
         db_path (str): path to a cbm_defaults database
+        cache_dir (str, optional): directory for caching the decoded
+            tables. See :py:func:`load_cbm_defaults`. Defaults to None.
 
     Returns:
         func: a function that creates CBM parameters
@@ -184,19 +308,23 @@ def get_cbm_parameters_factory(
     """
 
     def factory():
-        return load_cbm_parameters(db_path)
+        if cache_dir is None:
+            return load_cbm_parameters(db_path)
+        return load_cbm_defaults(db_path, cache_dir)["parameters"]
 
     return factory
 
 
 def get_libcbm_configuration_factory(
-    db_path: str,
+    db_path: str, cache_dir: str | None = None
 ) -> Callable[[], dict[str, list[dict]]]:
     """Get a parameterless function that creates configuration for
     :py:class:`libcbm.wrapper.libcbm_wrapper.LibCBMWrapper`
 
     Args:
         db_path (str): path to a cbm_defaults database
+        cache_dir (str, optional): directory for caching the decoded
+            tables. See :py:func:`load_cbm_defaults`. Defaults to None.
 
     Returns:
         func: a function that creates CBM configuration input for libcbm
@@ -205,9 +333,12 @@ def get_libcbm_configuration_factory(
     """
 
     def factory():
+        if cache_dir is None:
+            return load_cached(None, db_path, _read_cbm_configuration)
+        cbm_defaults = load_cbm_defaults(db_path, cache_dir)
         return {
-            "pools": load_cbm_pools(db_path),
-            "flux_indicators": load_cbm_flux_indicators(db_path),
+            "pools": cbm_defaults["pools"],
+            "flux_indicators": cbm_defaults["flux_indicators"],
         }
 
     return factory
@@ -6,9 +6,24 @@ from __future__ import annotations
 import sqlite3
 import pandas as pd
 import libcbm.resources.cbm_defaults_queries as queries
+from libcbm.model.cbm import cbm_defaults
 from typing import Tuple
 
 
+def _load_rows(
+    conn: sqlite3.Connection, query: str, query_params: tuple | None = None
+) -> list[dict]:
+    cursor = conn.cursor()
+    try:
+        if query_params:
+            rows = cursor.execute(query, query_params).fetchall()
+        else:
+            rows = cursor.execute(query).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        cursor.close()
+
+
 class CBMDefaultsReference:
     """Creates a reference to the localized name and id relationships
     stored in a cbm_defaults database.
@@ -17,9 +32,18 @@ class CBMDefaultsReference:
         sqlite_path (str): path to a cbm_defaults sqlite database.
         locale_code (str, optional): locale code as defined in the locale
             table of the cbm_defaults database. Defaults to "en-CA".
+        cache_dir (str, optional): if specified, the reference tables are
+            stored in this directory, keyed by the hash of the database and
+            the locale code, and re-used by subsequent instances. Defaults
+            to None.
     """
 
-    def __init__(self, sqlite_path: str, locale_code: str = "en-CA"):
+    def __init__(
+        self,
+        sqlite_path: str,
+        locale_code: str = "en-CA",
+        cache_dir: str | None = None,
+    ):
         # queries for species name/species id associations
         self.species_reference_query = queries.get_query("species_ref.sql")
 
@@ -56,22 +80,48 @@ class CBMDefaultsReference:
         self.bio_pools_query = queries.get_query("bio_pools.sql")
         self.dom_pools_query = queries.get_query("dom_pools.sql")
 
-        locale_param = (locale_code,)
-        self.species_ref = self.load_data(
-            sqlite_path, self.species_reference_query, locale_param
+        localized_queries = {
+            "species": self.species_reference_query,
+            "disturbance_types": self.disturbance_reference_query,
+            "spatial_units": self.spatial_unit_reference_query,
+            "afforestation_pre_types": self.afforestation_pre_type_query,
+            "land_classes": self.land_class_query,
+            "land_type_disturbance": self.land_type_disturbance_query,
+        }
+        unlocalized_queries = {
+            "pools": self.pools_query,
+            "bio_pools": self.bio_pools_query,
+            "dom_pools": self.dom_pools_query,
+            "flux_indicators": self.flux_indicator_query,
+        }
+
+        def load_tables(conn: sqlite3.Connection) -> dict[str, list[dict]]:
+            conn.row_factory = sqlite3.Row
+            tables = {
+                name: _load_rows(conn, query, (locale_code,))
+                for name, query in localized_queries.items()
+            }
+            for name, query in unlocalized_queries.items():
+                tables[name] = _load_rows(conn, query)
+            return tables
+
+        tables = cbm_defaults.load_cached(
+            cache_dir,
+            sqlite_path,
+            load_tables,
+            "cbm_defaults_reference",
+            locale_code,
         )
+
+        self.species_ref = tables["species"]
         self.species_by_name = {x["species_name"]: x for x in self.species_ref}
 
-        self.disturbance_type_ref = self.load_data(
-            sqlite_path, self.disturbance_reference_query, locale_param
-        )
+        self.disturbance_type_ref = tables["disturbance_types"]
         self.disturbance_type_by_name = {
             x["disturbance_type_name"]: x for x in self.disturbance_type_ref
         }
 
-        self.spatial_unit_ref = self.load_data(
-            sqlite_path, self.spatial_unit_reference_query, locale_param
-        )
+        self.spatial_unit_ref = tables["spatial_units"]
         self.spatial_unit_by_admin_eco_names = {
             (x["admin_boundary_name"], x["eco_boundary_name"]): x
             for x in self.spatial_unit_ref
@@ -80,30 +130,22 @@ class CBMDefaultsReference:
             x["spatial_unit_id"]: x for x in self.spatial_unit_ref
         }
 
-        self.afforestation_pre_type_ref = self.load_data(
-            sqlite_path, self.afforestation_pre_type_query, locale_param
-        )
+        self.afforestation_pre_type_ref = tables["afforestation_pre_types"]
         self.afforestation_pre_type_by_name = {
             x["afforestation_pre_type_name"]: x
             for x in self.afforestation_pre_type_ref
         }
 
-        self.land_class_ref = self.load_data(
-            sqlite_path, self.land_class_query, locale_param
-        )
+        self.land_class_ref = tables["land_classes"]
         self.land_class_by_code = {x["code"]: x for x in self.land_class_ref}
 
-        self.pools_ref = self.load_data(sqlite_path, self.pools_query)
-        self.bio_pools_ref = self.load_data(sqlite_path, self.bio_pools_query)
-        self.dom_pools_ref = self.load_data(sqlite_path, self.dom_pools_query)
+        self.pools_ref = tables["pools"]
+        self.bio_pools_ref = tables["bio_pools"]
+        self.dom_pools_ref = tables["dom_pools"]
 
-        self.flux_indicator_ref = self.load_data(
-            sqlite_path, self.flux_indicator_query
-        )
+        self.flux_indicator_ref = tables["flux_indicators"]
 
-        self.land_type_disturbance_ref = self.load_data(
-            sqlite_path, self.land_type_disturbance_query, locale_param
-        )
+        self.land_type_disturbance_ref = tables["land_type_disturbance"]
         self.land_classes_by_dist_type = {
             x["disturbance_type_name"]: x
             for x in self.land_type_disturbance_ref
@@ -123,17 +165,11 @@ class CBMDefaultsReference:
         Returns:
             list: a list of sqlite3.Row objects containing the query results
         """
-        conn = sqlite3.connect(sqlite_path)
+        conn = cbm_defaults.connect(sqlite_path)
         conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
         try:
-            if query_params:
-                rows = cursor.execute(query, query_params).fetchall()
-            else:
-                rows = cursor.execute(query).fetchall()
-            return [dict(row) for row in rows]
+            return _load_rows(conn, query, query_params)
         finally:
-            cursor.close()
             conn.close()
 
     def get_species_id(self, species_name: str) -> int:
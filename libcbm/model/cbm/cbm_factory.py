@@ -1,14 +1,15 @@
 # This Source Code Form is subject to the terms of the Mozilla Public
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
-
-
+from __future__ import annotations
 import json
 import pandas as pd
 from typing import Callable
 from typing import Iterator
 from contextlib import contextmanager
 from libcbm.model.cbm.cbm_model import CBM
+from libcbm.model.cbm import cbm_spinup_cache
+from libcbm.model.cbm.cbm_spinup_cache import SpinupCache
 from libcbm.wrapper.cbm.cbm_wrapper import CBMWrapper
 from libcbm.wrapper.libcbm_wrapper import LibCBMWrapper
 from libcbm.wrapper.libcbm_handle import LibCBMHandle
@@ -33,6 +34,48 @@ def _dataframe_to_json(df: pd.DataFrame):
     }
 
 
+def _cbm_config_to_json(
+    parameters: dict[str, pd.DataFrame],
+    merch_volume_to_biomass_config: dict,
+    classifiers_config: dict,
+) -> str:
+    """Serialize the CBM configuration to the json string accepted by
+    :py:class:`libcbm.wrapper.cbm.cbm_wrapper.CBMWrapper`.
+
+    The parameter tables are serialized one at a time, so that the nested
+    list form of only a single table exists at once.  The result is
+    identical to the json serialization of the entire configuration
+    dictionary.
+
+    Args:
+        parameters (dict[str, pandas.DataFrame]): CBM parameter tables by
+            name
+        merch_volume_to_biomass_config (dict): merchantable volume to
+            biomass configuration
+        classifiers_config (dict): classifier configuration
+
+    Returns:
+        str: the json formatted configuration
+    """
+    cbm_defaults = ", ".join(
+        f"{json.dumps(k)}: {json.dumps(_dataframe_to_json(v))}"
+        for k, v in parameters.items()
+    )
+    return "".join(
+        [
+            '{"cbm_defaults": {',
+            cbm_defaults,
+            '}, "merch_volume_to_biomass": ',
+            json.dumps(merch_volume_to_biomass_config),
+            ', "classifiers": ',
+            json.dumps(classifiers_config["classifiers"]),
+            ', "classifier_values": ',
+            json.dumps(classifiers_config["classifier_values"]),
+            "}",
+        ]
+    )
+
+
 @contextmanager
 def create(
     dll_path: str,
@@ -40,6 +83,7 @@ def create(
     cbm_parameters_factory: Callable[[], dict],
     merch_volume_to_biomass_factory: Callable[[], dict],
     classifiers_factory: Callable[[], dict],
+    spinup_cache_dir: str | None = None,
 ) -> Iterator[CBM]:
     """Create and initialize an instance of the CBM model
 
@@ -54,6 +98,11 @@ def create(
         classifiers_factory (func): function that creates a valid classifier
             configuration for CBM (see:
             :py:func:`libcbm.model.cbm.cbm_config.classifier_config`)
+        spinup_cache_dir (str, optional): if specified, spinup results are
+            cached in this directory, and spinup is skipped when it is run
+            again on identical inputs with an identical model. See
+            :py:class:`libcbm.model.cbm.cbm_spinup_cache.SpinupCache`.
+            Defaults to None.
 
     In the following example a CBM instance is built with a single growth
     curve, and classifier set.  The :py:mod:`libcbm.model.cbm.cbm_defaults`
@@ -105,26 +154,32 @@ def create(
     with LibCBMHandle(dll_path, configuration_string) as libcbm_handle:
         libcbm_wrapper = LibCBMWrapper(libcbm_handle)
 
-        merch_volume_to_biomass_config = merch_volume_to_biomass_factory()
-        classifiers_config = classifiers_factory()
-        parameters = {
-            k: _dataframe_to_json(v)
-            for k, v in cbm_parameters_factory().items()
-        }
-        cbm_config = {
-            "cbm_defaults": parameters,
-            "merch_volume_to_biomass": merch_volume_to_biomass_config,
-            "classifiers": classifiers_config["classifiers"],
-            "classifier_values": classifiers_config["classifier_values"],
-        }
-
-        cbm_config_string = json.dumps(cbm_config)
+        # the native library is configured by json only, which is built
+        # incrementally here to limit peak memory
+        cbm_config_string = _cbm_config_to_json(
+            cbm_parameters_factory(),
+            merch_volume_to_biomass_factory(),
+            classifiers_factory(),
+        )
         cbm_wrapper = CBMWrapper(libcbm_handle, cbm_config_string)
-        yield CBM(
+        spinup_cache = None
+        if spinup_cache_dir:
+            spinup_cache = SpinupCache(
+                spinup_cache_dir,
+                cbm_spinup_cache.get_model_key(
+                    dll_path, configuration_string, cbm_config_string
+                ),
+            )
+        cbm = CBM(
             libcbm_wrapper,
             cbm_wrapper,
             pool_codes=[p["name"] for p in dll_config["pools"]],
             flux_indicator_codes=[
                 f["name"] for f in dll_config["flux_indicators"]
             ],
+            spinup_cache=spinup_cache,
         )
+        try:
+            yield cbm
+        finally:
+            cbm.free_ops()
@@ -6,6 +6,8 @@ from __future__ import annotations
 from typing import Callable
 from typing import Union
 from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.model.cbm.cbm_spinup_cache import SpinupCache
+from libcbm.model.model_definition import spinup_engine
 from libcbm.wrapper.libcbm_wrapper import LibCBMWrapper
 from libcbm.wrapper.cbm.cbm_wrapper import CBMWrapper
 from libcbm.storage.series import Series
@@ -51,6 +53,88 @@ def get_op_processes() -> dict[str, int]:
     }
 
 
+# the spinup working set is compacted to the stands that have not yet
+# finished once at least this proportion of the working set is finished
+_SPINUP_COMPACTION_RATIO = 0.5
+
+# inventory columns which have no effect on the result of spinup
+_SPINUP_SIGNATURE_EXCLUDED_COLUMNS = [
+    "inventory_id",
+    "parent_inventory_id",
+    "area",
+    "spatial_reference",
+]
+
+
+def _take_spinup_vars(cbm_vars: CBMVariables, indices: Series) -> CBMVariables:
+    """gather the rows at the specified indices of spinup variables into a
+    new, dense, instance of spinup variables
+    """
+    return CBMVariables(
+        pools=cbm_vars.pools.take(indices),
+        flux=None,
+        classifiers=cbm_vars.classifiers.take(indices),
+        state=cbm_vars.state.take(indices),
+        inventory=cbm_vars.inventory.take(indices),
+        parameters=cbm_vars.parameters.take(indices),
+    )
+
+
+def _scatter_spinup_vars(
+    working_vars: CBMVariables,
+    cbm_vars: CBMVariables,
+    indices: Series | None = None,
+):
+    """assign the pools and state of the working spinup variables to the
+    rows of cbm_vars at the specified indices, or to all rows if indices
+    is None
+    """
+    for df_name in ["pools", "state"]:
+        src: DataFrame = getattr(working_vars, df_name)
+        dest: DataFrame = getattr(cbm_vars, df_name)
+        for col in src.columns:
+            dest[col].assign(src[col], indices)
+
+
+class _OperationPool:
+    """Holds allocated libcbm operation handles keyed by operation name so
+    that they can be reused across calls. A handle is only reallocated when
+    the number of stands it was allocated for changes.
+
+    Args:
+        compute_functions (LibCBMWrapper): an instance of LibCBMWrapper.
+    """
+
+    def __init__(self, compute_functions: LibCBMWrapper):
+        self._compute_functions = compute_functions
+        self._ops: dict[str, tuple[int, int]] = {}
+
+    def get_op(self, op_name: str, n_stands: int) -> int:
+        """get an op id allocated for the specified number of stands"""
+        existing = self._ops.get(op_name)
+        if existing is not None:
+            op_size, op_id = existing
+            if op_size == n_stands:
+                return op_id
+            self._compute_functions.free_op(op_id)
+            del self._ops[op_name]
+        op_id = self._compute_functions.allocate_op(n_stands)
+        self._ops[op_name] = (n_stands, op_id)
+        return op_id
+
+    def get_ops(self, op_names: list[str], n_stands: int) -> dict[str, int]:
+        """get a dictionary of op name to op id for each of the specified
+        names, allocated for the specified number of stands
+        """
+        return {x: self.get_op(x, n_stands) for x in op_names}
+
+    def free(self):
+        """free all allocated operations"""
+        for _, op_id in self._ops.values():
+            self._compute_functions.free_op(op_id)
+        self._ops.clear()
+
+
 class CBM:
     """The CBM model.
 
@@ -60,6 +144,8 @@ class CBM:
         pool_codes (list): list of pool code names (non localizable)
         flux_indicator_codes (list): list of flux indicator code names (non
             localizable)
+        spinup_cache (SpinupCache, optional): if specified, spinup results
+            are stored in, and drawn from this cache. Defaults to None.
     """
 
     def __init__(
@@ -68,6 +154,7 @@ class CBM:
         model_functions: CBMWrapper,
         pool_codes: list[str],
         flux_indicator_codes: list[str],
+        spinup_cache: SpinupCache | None = None,
     ):
         self.compute_functions = compute_functions
         self.model_functions = model_functions
@@ -78,6 +165,36 @@ class CBM:
 
         self.pool_codes = pool_codes
         self.flux_indicator_codes = flux_indicator_codes
+        self._op_pool = _OperationPool(compute_functions)
+        self.spinup_cache = spinup_cache
+
+    def free_ops(self):
+        """Free the libcbm operations that are held by this instance for
+        reuse across spinup iterations and timesteps. Operations are
+        reallocated as needed if this instance is used afterwards.
+        """
+        self._op_pool.free()
+
+    def _get_spinup_ops(self, cbm_vars: CBMVariables) -> dict[str, int]:
+        """get the spinup operations sized for the specified variables,
+        with the operations that are constant over the spinup routine
+        computed.
+        """
+        ops = self._op_pool.get_ops(self.op_names, cbm_vars.pools.n_rows)
+
+        self.model_functions.get_turnover_ops(
+            ops["snag_turnover"], ops["biomass_turnover"], cbm_vars.inventory
+        )
+
+        self.model_functions.get_decay_ops(
+            ops["dom_decay"],
+            ops["slow_decay"],
+            ops["slow_mixing"],
+            cbm_vars.inventory,
+            cbm_vars.parameters,
+            historical_mean_annual_temp=True,
+        )
+        return ops
 
     def spinup(
         self,
@@ -90,6 +207,18 @@ class CBM:
         See :py:mod:`libcbm.model.cbm.cbm_variables` for initialization
         routines for the cbm_vars object.
 
+        If no reporting_func is specified, spinup is run once for each group
+        of stands with an identical spinup signature, and the result is
+        assigned to every member of the group. Stands which have finished
+        the spinup routine are also periodically dropped from the set of
+        stands being computed, and their results are assigned back to
+        cbm_vars on completion.
+
+        If this instance has a spinup_cache, and no reporting_func is
+        specified, a cached result for identical spinup inputs is assigned
+        to cbm_vars in place of running spinup, and otherwise the result of
+        spinup is stored in the cache.
+
         Args:
             cbm_vars (CBMVariables): spinup CBM variables
             reporting_func (function): a function which accepts the spinup
@@ -105,25 +234,55 @@ class CBM:
             # will not be visible
             raise ValueError("flux specified without reporting_func")
 
-        n_stands = cbm_vars.pools.n_rows
+        spinup_cache_key = None
+        if reporting_func is None and self.spinup_cache is not None:
+            spinup_cache_key = self.spinup_cache.get_key(
+                cbm_vars, _SPINUP_SIGNATURE_EXCLUDED_COLUMNS
+            )
+            if self.spinup_cache.load(spinup_cache_key, cbm_vars):
+                return cbm_vars
 
-        ops = {
-            x: self.compute_functions.allocate_op(n_stands)
-            for x in self.op_names
-        }
+        spinup_groups = None
+        if reporting_func is None:
+            spinup_groups = spinup_engine.get_spinup_groups(
+                [
+                    cbm_vars.classifiers,
+                    cbm_vars.inventory,
+                    cbm_vars.parameters,
+                    cbm_vars.pools,
+                    cbm_vars.state,
+                ],
+                exclude_columns=_SPINUP_SIGNATURE_EXCLUDED_COLUMNS,
+            )
+        if spinup_groups is None:
+            self._spinup(cbm_vars, reporting_func)
+        else:
+            representative_index, group_index = spinup_groups
+            representative_vars = self._spinup(
+                _take_spinup_vars(cbm_vars, representative_index), None
+            )
+            _scatter_spinup_vars(
+                _take_spinup_vars(representative_vars, group_index), cbm_vars
+            )
 
-        self.model_functions.get_turnover_ops(
-            ops["snag_turnover"], ops["biomass_turnover"], cbm_vars.inventory
-        )
+        if spinup_cache_key is not None:
+            self.spinup_cache.save(spinup_cache_key, cbm_vars)
+        return cbm_vars
 
-        self.model_functions.get_decay_ops(
-            ops["dom_decay"],
-            ops["slow_decay"],
-            ops["slow_mixing"],
-            cbm_vars.inventory,
-            cbm_vars.parameters,
-            historical_mean_annual_temp=True,
-        )
+    def _spinup(
+        self,
+        cbm_vars: CBMVariables,
+        reporting_func: Callable[[int, CBMVariables], None] | None,
+    ) -> CBMVariables:
+        """run the spinup routine on every stand in cbm_vars"""
+        # when no reporting function is specified, only the final state of
+        # each stand is visible, so finished stands can be dropped from the
+        # working set. Otherwise the full set of stands is reported on each
+        # iteration and so it is retained throughout.
+        compact = reporting_func is None
+        working_vars = cbm_vars
+        working_idx = None
+        ops = self._get_spinup_ops(working_vars)
 
         op_schedule = [
             "growth",
@@ -140,8 +299,11 @@ class CBM:
         iteration = 0
 
         while True:
+            n_stands = working_vars.pools.n_rows
             n_finished = self.model_functions.advance_spinup_state(
-                cbm_vars.inventory, cbm_vars.state, cbm_vars.parameters
+                working_vars.inventory,
+                working_vars.state,
+                working_vars.parameters,
             )
 
             if n_finished == n_stands:
@@ -150,41 +312,56 @@ class CBM:
             self.model_functions.get_merch_volume_growth_ops(
                 ops["growth"],
                 ops["overmature_decline"],
-                cbm_vars.classifiers,
-                cbm_vars.inventory,
-                cbm_vars.pools,
-                cbm_vars.state,
+                working_vars.classifiers,
+                working_vars.inventory,
+                working_vars.pools,
+                working_vars.state,
             )
 
             self.model_functions.get_disturbance_ops(
-                ops["disturbance"], cbm_vars.inventory, cbm_vars.state
+                ops["disturbance"], working_vars.inventory, working_vars.state
             )
 
-            if cbm_vars.flux is None:
+            if working_vars.flux is None:
                 self.compute_functions.compute_pools(
                     [ops[x] for x in op_schedule],
-                    cbm_vars.pools,
-                    cbm_vars.state["enabled"],
+                    working_vars.pools,
+                    working_vars.state["enabled"],
                 )
             else:
-                cbm_vars.flux.zero()
+                working_vars.flux.zero()
                 self.compute_functions.compute_flux(
                     [ops[x] for x in op_schedule],
                     [self.op_processes[x] for x in op_schedule],
-                    cbm_vars.pools,
-                    cbm_vars.flux,
-                    cbm_vars.state["enabled"],
+                    working_vars.pools,
+                    working_vars.flux,
+                    working_vars.state["enabled"],
                 )
 
             self.model_functions.end_spinup_step(
-                cbm_vars.pools, cbm_vars.state
+                working_vars.pools, working_vars.state
             )
+            # stands finished by this iteration have had their final end
+            # of spinup step applied, and are no longer modified
+            if compact and n_finished >= _SPINUP_COMPACTION_RATIO * n_stands:
+                active = dataframe.indices_nonzero(
+                    working_vars.state["enabled"]
+                )
+                if working_idx is not None:
+                    _scatter_spinup_vars(working_vars, cbm_vars, working_idx)
+                    working_idx = working_idx.take(active)
+                else:
+                    working_idx = active
+                working_vars = _take_spinup_vars(cbm_vars, working_idx)
+                ops = self._get_spinup_ops(working_vars)
+
             if reporting_func:
                 reporting_func(iteration, cbm_vars)
             iteration = iteration + 1
 
-        for op_name in self.op_names:
-            self.compute_functions.free_op(ops[op_name])
+        if working_idx is not None:
+            _scatter_spinup_vars(working_vars, cbm_vars, working_idx)
+
         return cbm_vars
 
     def init(self, cbm_vars: CBMVariables) -> CBMVariables:
@@ -266,7 +443,9 @@ class CBM:
                 specifies the index is eligible for the disturbance, and
                 false the opposite. In the returned result False indices
                 will be set with 0's.  Specifying None is equivant to an
-                full array of True values. Defaults to None.
+                full array of True values. Only the eligible indices are
+                gathered for computation, so the cost of this function
+                scales with the number of eligible stands. Defaults to None.
             density (bool, optional): if set to True the return value is
                 expressed in units of tonnes Carbon/hectare, and if False
                 the return value is expressed in units of tonnes Carbon.
@@ -293,9 +472,6 @@ class CBM:
         # The number of stands is the number of rows in the inventory table.
         n_stands = cbm_vars.inventory.n_rows
 
-        # allocate space for computing the Carbon flows
-        disturbance_op = self.compute_functions.allocate_op(n_stands)
-
         if (
             not isinstance(disturbance_type, Series)
             and disturbance_type is not None
@@ -318,47 +494,74 @@ class CBM:
                 cbm_vars.inventory.backend_type,
             )
 
-        self.model_functions.get_disturbance_ops(
-            disturbance_op,
-            cbm_vars.inventory,
-            parameters,
-        )
+        production_cols = [
+            "DisturbanceSoftProduction",
+            "DisturbanceHardProduction",
+            "DisturbanceDOMProduction",
+        ]
+        eligible_index = None
+        if eligible is not None and not eligible.all():
+            # only the eligible stands are gathered for computing flux, and
+            # the ineligible stands have 0 production
+            eligible_index = eligible.indices_nonzero()
+            inventory = cbm_vars.inventory.take(eligible_index)
+            pools = cbm_vars.pools.take(eligible_index)
+            parameters = parameters.take(eligible_index)
+            enabled = None
+            disturbance_op = self._op_pool.get_op(
+                "disturbance_production", inventory.n_rows
+            )
+        else:
+            inventory = cbm_vars.inventory
+            pools = cbm_vars.pools.copy()
+            enabled = eligible
+            disturbance_op = self._op_pool.get_op("disturbance", n_stands)
 
         flux = dataframe.numeric_dataframe(
             cols=self.flux_indicator_codes,
-            nrows=n_stands,
+            nrows=inventory.n_rows,
             back_end=cbm_vars.inventory.backend_type,
         )
 
-        pools_copy = cbm_vars.pools.copy()
+        if inventory.n_rows > 0:
+            self.model_functions.get_disturbance_ops(
+                disturbance_op,
+                inventory,
+                parameters,
+            )
+
+            # compute the flux based on the specified disturbance type
+            self.compute_functions.compute_flux(
+                [disturbance_op],
+                [disturbance_op_process_id],
+                pools,
+                flux,
+                enabled=enabled,
+            )
 
-        # compute the flux based on the specified disturbance type
-        self.compute_functions.compute_flux(
-            [disturbance_op],
-            [disturbance_op_process_id],
-            pools_copy,
-            flux,
-            enabled=(eligible if eligible is not None else None),
-        )
+        if eligible_index is not None:
+            production = dataframe.numeric_dataframe(
+                cols=production_cols,
+                nrows=n_stands,
+                back_end=cbm_vars.inventory.backend_type,
+            )
+            for col in production_cols:
+                production[col].assign(flux[col], eligible_index)
+        else:
+            production = flux
 
-        self.compute_functions.free_op(disturbance_op)
         # computes C harvested by applying the disturbance matrix to the
         # specified carbon pools
         total_series = (
-            flux["DisturbanceSoftProduction"]
-            + flux["DisturbanceHardProduction"]
-            + flux["DisturbanceDOMProduction"]
+            production["DisturbanceSoftProduction"]
+            + production["DisturbanceHardProduction"]
+            + production["DisturbanceDOMProduction"]
         )
         total_series.name = "Total"
         df = dataframe.from_series_list(
-            [
-                flux["DisturbanceSoftProduction"],
-                flux["DisturbanceHardProduction"],
-                flux["DisturbanceDOMProduction"],
-                total_series,
-            ],
-            nrows=flux.n_rows,
-            back_end=flux.backend_type,
+            [production[col] for col in production_cols] + [total_series],
+            nrows=n_stands,
+            back_end=cbm_vars.inventory.backend_type,
         )
         if density:
             return df
@@ -385,7 +588,7 @@ class CBM:
             CBMVariables: cbm_vars
         """
         n_stands = cbm_vars.pools.n_rows
-        disturbance_op = self.compute_functions.allocate_op(n_stands)
+        disturbance_op = self._op_pool.get_op("disturbance", n_stands)
         self.model_functions.get_disturbance_ops(
             disturbance_op, cbm_vars.inventory, cbm_vars.parameters
         )
@@ -401,7 +604,6 @@ class CBM:
         # is very much an edge case:
         # stands can be disturbed despite having all other C-dynamics processes
         # disabled (which happens in peatland)
-        self.compute_functions.free_op(disturbance_op)
         return cbm_vars
 
     def step_annual_process(self, cbm_vars: CBMVariables) -> CBMVariables:
@@ -417,10 +619,7 @@ class CBM:
         """
         n_stands = cbm_vars.pools.n_rows
 
-        ops = {
-            x: self.compute_functions.allocate_op(n_stands)
-            for x in self.op_names
-        }
+        ops = self._op_pool.get_ops(self.op_names, n_stands)
 
         self.model_functions.get_merch_volume_growth_ops(
             ops["growth"],
@@ -461,8 +660,6 @@ class CBM:
             cbm_vars.flux,
             cbm_vars.state["enabled"],
         )
-        for op_name in self.op_names:
-            self.compute_functions.free_op(ops[op_name])
         return cbm_vars
 
     def step_end(self, cbm_vars: CBMVariables) -> CBMVariables:
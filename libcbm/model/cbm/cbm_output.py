@@ -1,49 +1,191 @@
 from __future__ import annotations
+import numpy as np
+import pandas as pd
 from libcbm.model.cbm.cbm_variables import CBMVariables
 from libcbm.storage import dataframe
 from libcbm.storage.dataframe import DataFrame
-from libcbm.storage import series
 from libcbm.storage.backends import BackendType
+from libcbm.storage.parquet_writer import ParquetResultWriter
 
 
-def _add_timestep_series(timestep: int, dataframe: DataFrame) -> DataFrame:
-    dataframe.add_column(
-        series.range(
-            "identifier",
-            1,
-            dataframe.n_rows + 1,
-            1,
-            "int64",
-            dataframe.backend_type,
-        ),
-        0,
-    )
-    dataframe.add_column(
-        series.allocate(
-            "timestep",
-            dataframe.n_rows,
-            timestep,
-            "int",
-            dataframe.backend_type,
-        ),
-        1,
+def _promote_dtype(a: np.dtype, b: np.dtype) -> np.dtype:
+    try:
+        return np.promote_types(a, b)
+    except TypeError:
+        return np.dtype("object")
+
+
+def _get_columns(data: DataFrame) -> dict[str, np.ndarray]:
+    if data.is_matrix() and data.n_cols > 0:
+        matrix = data.to_numpy(make_c_contiguous=False)
+        return {col: matrix[:, i] for i, col in enumerate(data.columns)}
+    return {col: data[col].to_numpy() for col in data.columns}
+
+
+def _get_timestep_results(
+    cbm_vars: CBMVariables,
+    density: bool,
+    classifier_map: dict[int, str] | None,
+    disturbance_type_map: dict[int, str] | None,
+) -> dict[str, DataFrame]:
+    """get the named reporting tables for a single timestep.  The returned
+    dataframes may reference the storage in cbm_vars and must not be
+    modified.
+    """
+    results: dict[str, DataFrame] = {}
+    results["pools"] = (
+        cbm_vars.pools
+        if density
+        else cbm_vars.pools.multiply(cbm_vars.inventory["area"])
     )
-    return dataframe
 
+    if cbm_vars.flux is not None and cbm_vars.flux.n_rows > 0:
+        results["flux"] = (
+            cbm_vars.flux
+            if density
+            else cbm_vars.flux.multiply(cbm_vars.inventory["area"])
+        )
+
+    if disturbance_type_map:
+        timestep_state_data = {
+            c: cbm_vars.state[c] for c in cbm_vars.state.columns
+        }
+        timestep_state_data["last_disturbance_type"] = timestep_state_data[
+            "last_disturbance_type"
+        ].map(disturbance_type_map)
+        results["state"] = dataframe.from_series_dict(
+            timestep_state_data,
+            cbm_vars.state.n_rows,
+            cbm_vars.state.backend_type,
+        )
+
+        timestep_params_data = {
+            c: cbm_vars.parameters[c] for c in cbm_vars.parameters.columns
+        }
+        timestep_params_data["disturbance_type"] = timestep_params_data[
+            "disturbance_type"
+        ].map(disturbance_type_map)
+        results["parameters"] = dataframe.from_series_dict(
+            timestep_params_data,
+            cbm_vars.parameters.n_rows,
+            cbm_vars.parameters.backend_type,
+        )
+    else:
+        results["state"] = cbm_vars.state
+        results["parameters"] = cbm_vars.parameters
 
-def _concat_timestep_results(
-    timestep: int,
-    running_result: DataFrame | None,
-    timestep_result: DataFrame,
-    backend_type: BackendType | None,
-) -> DataFrame:
-    _add_timestep_series(timestep, timestep_result)
+    if classifier_map is None:
+        results["classifiers"] = cbm_vars.classifiers
+    else:
+        results["classifiers"] = cbm_vars.classifiers.map(classifier_map)
 
-    result = dataframe.concat_data_frame(
-        [running_result, timestep_result], backend_type
+    results["area"] = dataframe.from_series_list(
+        [cbm_vars.inventory["area"]],
+        nrows=cbm_vars.inventory.n_rows,
+        back_end=cbm_vars.inventory.backend_type,
     )
-    assert result is not None
-    return result
+    return results
+
+
+def _get_index_columns(timestep: int, n_rows: int) -> dict[str, np.ndarray]:
+    return {
+        "identifier": np.arange(1, n_rows + 1, dtype="int64"),
+        "timestep": np.full(n_rows, timestep, dtype="int"),
+    }
+
+
+class _TimestepResultStore:
+    """Accumulates timestep results into preallocated column buffers.
+
+    The buffers are sized on the first append for the expected number of
+    timesteps (when known) and otherwise grow geometrically, so that each
+    appended row is copied a bounded number of times over the course of a
+    simulation rather than once per subsequent timestep.
+
+    Args:
+        backend_type (BackendType): the storage backend of the DataFrame
+            produced by :py:meth:`get_result`
+        n_timesteps (int, optional): the expected number of appends, used
+            to size the buffers up front. Defaults to None.
+    """
+
+    def __init__(
+        self, backend_type: BackendType, n_timesteps: int | None = None
+    ):
+        self._backend_type = backend_type
+        self._n_timesteps = n_timesteps
+        self._columns: list[str] | None = None
+        self._buffers: dict[str, np.ndarray] = {}
+        self._capacity = 0
+        self._n_rows = 0
+        self._n_appends = 0
+        self._result: DataFrame | None = None
+
+    def _reserve(self, n_new_rows: int, data: dict[str, np.ndarray]):
+        required = self._n_rows + n_new_rows
+        capacity = self._capacity
+        if required > capacity:
+            if self._n_timesteps is not None:
+                remaining = max(self._n_timesteps - self._n_appends, 1)
+                capacity = max(capacity + n_new_rows * remaining, required)
+            else:
+                capacity = max(capacity * 2, required)
+        for col, values in data.items():
+            buffer = self._buffers.get(col)
+            if buffer is None:
+                self._buffers[col] = np.empty(capacity, dtype=values.dtype)
+                continue
+            dtype = _promote_dtype(buffer.dtype, values.dtype)
+            if capacity != self._capacity or dtype != buffer.dtype:
+                new_buffer = np.empty(capacity, dtype=dtype)
+                new_buffer[: self._n_rows] = buffer[: self._n_rows]
+                self._buffers[col] = new_buffer
+        self._capacity = capacity
+
+    def append(self, timestep: int, timestep_result: DataFrame):
+        """Write the specified timestep result into the column buffers,
+        adding the identifier and timestep columns.
+
+        Args:
+            timestep (int): the timestep corresponding to the result
+            timestep_result (DataFrame): the timestep result
+        """
+        n_rows = timestep_result.n_rows
+        data = _get_index_columns(timestep, n_rows)
+        data.update(_get_columns(timestep_result))
+        if self._columns is None:
+            self._columns = list(data.keys())
+        elif list(data.keys()) != self._columns:
+            raise ValueError(
+                "timestep result columns do not match previously appended "
+                "columns"
+            )
+        self._reserve(n_rows, data)
+        end = self._n_rows + n_rows
+        for col, values in data.items():
+            self._buffers[col][self._n_rows : end] = values
+        self._n_rows = end
+        self._n_appends += 1
+        self._result = None
+
+    def get_result(self) -> DataFrame | None:
+        """Get the accumulated results as a DataFrame, or None if nothing
+        has been appended.
+        """
+        if self._columns is None:
+            return None
+        if self._result is None:
+            data = {
+                col: self._buffers[col][: self._n_rows]
+                for col in self._columns
+            }
+            if self._backend_type == BackendType.pandas:
+                self._result = dataframe.from_pandas(pd.DataFrame(data))
+            else:
+                self._result = dataframe.convert_dataframe_backend(
+                    dataframe.from_numpy(data), self._backend_type
+                )
+        return self._result
 
 
 class CBMOutput:
@@ -69,6 +211,11 @@ class CBMOutput:
             :py:class:`libcbm.storage.backends.BackendType`. Defaults to
             `BackendType.numpy` meaning simulation results will be stored
             in memory.
+        n_timesteps (int, optional): the expected number of calls to
+            :py:meth:`append_simulation_result`.  If specified, result
+            buffers are allocated for all timesteps when the first
+            timestep is appended, otherwise they grow in large chunks as
+            needed. Defaults to None.
     """
 
     def __init__(
@@ -77,17 +224,18 @@ class CBMOutput:
         classifier_map: dict[int, str] | None = None,
         disturbance_type_map: dict[int, str] | None = None,
         backend_type: BackendType = BackendType.numpy,
+        n_timesteps: int | None = None,
     ):
         self._density = density
         self._disturbance_type_map = disturbance_type_map
         self._classifier_map = classifier_map
         self._backend_type = backend_type
-        self._pools: DataFrame | None = None
-        self._flux: DataFrame | None = None
-        self._state: DataFrame | None = None
-        self._classifiers: DataFrame | None = None
-        self._parameters: DataFrame | None = None
-        self._area: DataFrame | None = None
+        self._pools = _TimestepResultStore(backend_type, n_timesteps)
+        self._flux = _TimestepResultStore(backend_type, n_timesteps)
+        self._state = _TimestepResultStore(backend_type, n_timesteps)
+        self._classifiers = _TimestepResultStore(backend_type, n_timesteps)
+        self._parameters = _TimestepResultStore(backend_type, n_timesteps)
+        self._area = _TimestepResultStore(backend_type, n_timesteps)
 
     @property
     def density(self) -> bool:
@@ -111,32 +259,32 @@ class CBMOutput:
     @property
     def pools(self) -> DataFrame | None:
         """get all accumulated pool results"""
-        return self._pools
+        return self._pools.get_result()
 
     @property
     def flux(self) -> DataFrame | None:
         """get all accumulated flux results"""
-        return self._flux
+        return self._flux.get_result()
 
     @property
     def state(self) -> DataFrame | None:
         """get all accumulated state results"""
-        return self._state
+        return self._state.get_result()
 
     @property
     def classifiers(self) -> DataFrame | None:
         """get all accumulated clasifier results"""
-        return self._classifiers
+        return self._classifiers.get_result()
 
     @property
     def parameters(self) -> DataFrame | None:
         """get all accumulated parameter results"""
-        return self._parameters
+        return self._parameters.get_result()
 
     @property
     def area(self) -> DataFrame | None:
         """get all accumulated area results"""
-        return self._area
+        return self._area.get_result()
 
     def append_simulation_result(self, timestep: int, cbm_vars: CBMVariables):
         """Append simulation resuls
@@ -145,89 +293,86 @@ class CBMOutput:
             timestep (int): the timestep corresponding to the results
             cbm_vars (CBMVariables): The cbm vars for the timestep
         """
-        timestep_pools = (
-            cbm_vars.pools.copy()
-            if self._density
-            else cbm_vars.pools.multiply(cbm_vars.inventory["area"])
-        )
-        self._pools = _concat_timestep_results(
-            timestep, self._pools, timestep_pools, self._backend_type
+        results = _get_timestep_results(
+            cbm_vars,
+            self._density,
+            self._classifier_map,
+            self._disturbance_type_map,
         )
+        for name, timestep_result in results.items():
+            getattr(self, f"_{name}").append(timestep, timestep_result)
 
-        if cbm_vars.flux is not None and cbm_vars.flux.n_rows > 0:
-            timestep_flux = (
-                cbm_vars.flux.copy()
-                if self._density
-                else cbm_vars.flux.multiply(cbm_vars.inventory["area"])
-            )
-            self._flux = _concat_timestep_results(
-                timestep, self._flux, timestep_flux, self._backend_type
-            )
 
-        if self._disturbance_type_map:
-            timestep_state_data = {
-                c: cbm_vars.state[c].copy() for c in cbm_vars.state.columns
-            }
-            timestep_state_data["last_disturbance_type"] = timestep_state_data[
-                "last_disturbance_type"
-            ].map(self._disturbance_type_map)
-            timestep_state = dataframe.from_series_dict(
-                timestep_state_data,
-                cbm_vars.state.n_rows,
-                cbm_vars.state.backend_type,
-            )
+class CBMParquetOutput:
+    """
+    Streams CBM simulation results to parquet files rather than accumulating
+    them in memory.  The pools, flux, state, parameters, classifiers and area
+    results are each written to a separate parquet file in the specified
+    directory, with one row group per timestep.  The columns of each file
+    match the columns of the corresponding :py:class:`CBMOutput` property.
 
-            timestep_params_data = {
-                c: cbm_vars.parameters[c].copy()
-                for c in cbm_vars.parameters.columns
-            }
+    The pyarrow package is required, see
+    :py:class:`libcbm.storage.parquet_writer.ParquetResultWriter`.
 
-            timestep_params_data["disturbance_type"] = timestep_params_data[
-                "disturbance_type"
-            ].map(self._disturbance_type_map)
-            timestep_params = dataframe.from_series_dict(
-                timestep_params_data,
-                cbm_vars.parameters.n_rows,
-                cbm_vars.parameters.backend_type,
-            )
-        else:
-            timestep_state = cbm_vars.state.copy()
-            timestep_params = cbm_vars.parameters.copy()
+    Args:
+        output_dir (str): directory in which the parquet files are written
+        density (bool, optional): if set to true pool and flux indicators
+            will be computed as area densities (tonnes C/ha). By default,
+            pool and flux outputs are computed as mass (tonnes C) based on
+            the area of each stand. Defaults to False.
+        classifier_map (dict[int, str], optional): a classifier map for
+            subsituting the internal classifier id values with classifier
+            value names. If set to None the id values will be written.
+        disturbance_type_map (dict[int, str], optional): a disturbance
+            type map for subsituting the internally defined disturbance
+            type id with names or other ids in the parameters and state
+            tables.  If set to none no substitution will occur.
+    """
 
-        self._state = _concat_timestep_results(
-            timestep, self._state, timestep_state, self._backend_type
-        )
+    def __init__(
+        self,
+        output_dir: str,
+        density: bool = False,
+        classifier_map: dict[int, str] | None = None,
+        disturbance_type_map: dict[int, str] | None = None,
+    ):
+        self._writer = ParquetResultWriter(output_dir)
+        self._density = density
+        self._classifier_map = classifier_map
+        self._disturbance_type_map = disturbance_type_map
 
-        self._parameters = _concat_timestep_results(
-            timestep, self._parameters, timestep_params, self._backend_type
-        )
+    def get_path(self, name: str) -> str:
+        """get the path of the parquet file for the named result table, one
+        of: pools, flux, state, parameters, classifiers, area
+        """
+        return self._writer.get_path(name)
 
-        if self._classifier_map is None:
-            self._classifiers = _concat_timestep_results(
-                timestep,
-                self._classifiers,
-                cbm_vars.classifiers.copy(),
-                self._backend_type,
-            )
-        else:
-            timestep_classifiers = cbm_vars.classifiers.copy()
-            assert self.classifier_map is not None
-            timestep_classifiers = timestep_classifiers.map(
-                self.classifier_map
-            )
-            self._classifiers = _concat_timestep_results(
-                timestep,
-                self._classifiers,
-                timestep_classifiers,
-                self._backend_type,
-            )
-        self._area = _concat_timestep_results(
-            timestep,
-            self._area,
-            dataframe.from_series_list(
-                [cbm_vars.inventory["area"]],
-                nrows=cbm_vars.inventory.n_rows,
-                back_end=self._backend_type,
-            ),
-            self._backend_type,
+    def append_simulation_result(self, timestep: int, cbm_vars: CBMVariables):
+        """Write simulation results for a timestep
+
+        Args:
+            timestep (int): the timestep corresponding to the results
+            cbm_vars (CBMVariables): The cbm vars for the timestep
+        """
+        results = _get_timestep_results(
+            cbm_vars,
+            self._density,
+            self._classifier_map,
+            self._disturbance_type_map,
         )
+        for name, timestep_result in results.items():
+            self._writer.write(
+                name,
+                timestep_result,
+                _get_index_columns(timestep, timestep_result.n_rows),
+            )
+
+    def close(self) -> None:
+        """Finalize and close all parquet files"""
+        self._writer.close()
+
+    def __enter__(self) -> "CBMParquetOutput":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -2,16 +2,65 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-
+from __future__ import annotations
+import os
+from multiprocessing import util as multiprocessing_util
 from typing import Callable
+from typing import ContextManager
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.series import Series
 from libcbm.storage.dataframe import DataFrame
 from libcbm.model.cbm import cbm_variables
+from libcbm.model.cbm import cbm_stand_merge
 from libcbm.model.cbm.cbm_variables import CBMVariables
 from libcbm.model.cbm.cbm_model import CBM
 from libcbm.storage.backends import BackendType
 
 
+def _spinup(
+    cbm: CBM,
+    classifiers: DataFrame,
+    inventory: DataFrame,
+    spinup_params: DataFrame | None,
+    spinup_reporting_func: Callable[[int, CBMVariables], None] | None,
+) -> CBMVariables:
+    """initialize simulation variables for the specified inventory, run
+    spinup and return the variables ready for CBM stepping
+    """
+    cbm_vars = cbm_variables.initialize_simulation_variables(
+        classifiers,
+        inventory,
+        cbm.pool_codes,
+        cbm.flux_indicator_codes,
+        BackendType.numpy,
+    )
+    if spinup_params is not None:
+        spinup_params = dataframe.convert_dataframe_backend(
+            spinup_params, BackendType.numpy
+        )
+    spinup_vars = cbm_variables.initialize_spinup_variables(
+        cbm_vars,
+        BackendType.numpy,
+        spinup_params,
+        include_flux=spinup_reporting_func is not None,
+    )
+
+    cbm.spinup(spinup_vars, reporting_func=spinup_reporting_func)
+
+    if "mean_annual_temp" in spinup_vars.parameters.columns:
+        # since the mean_annual_temp appears in the spinup parameters, carry
+        # it forward to the simulation period so that we have consistent
+        # columns in the outputs
+        cbm_vars.parameters.add_column(
+            spinup_vars.parameters["mean_annual_temp"],
+            cbm_vars.parameters.n_cols,
+        )
+    return cbm.init(cbm_vars)
+
+
 def simulate(
     cbm: CBM,
     n_steps: int,
@@ -23,6 +72,8 @@ def simulate(
     ) = None,
     spinup_params: DataFrame | None = None,
     spinup_reporting_func: Callable[[int, CBMVariables], None] | None = None,
+    merge_stands: bool = False,
+    merge_reporting_func: Callable[[int, DataFrame], None] | None = None,
 ):
     """Runs the specified number of timesteps of the CBM model.  Model output
     is processed by the provided reporting_func. The provided
@@ -50,43 +101,373 @@ def simulate(
             function will result in a performance penalty as the per-iteration
             spinup results are computed and tracked. If unspecified spinup
             results are not tracked. Defaults to None.
+        merge_stands (bool, optional): if True, stands which have become
+            indistinguishable, for example stands split by rule based
+            disturbances, are merged at the start of each timestep, prior to
+            the pre_dynamics_func. See
+            :py:func:`libcbm.model.cbm.cbm_stand_merge.merge_stands`.
+            Defaults to False.
+        merge_reporting_func (function, optional): a function which accepts
+            the simulation timestep and the table of merged stands, which is
+            called on timesteps where stands are merged, so that stand
+            lineage can be traced. Defaults to None.
 
     """
 
-    cbm_vars = cbm_variables.initialize_simulation_variables(
-        classifiers,
-        inventory,
-        cbm.pool_codes,
-        cbm.flux_indicator_codes,
-        BackendType.numpy,
+    cbm_vars = _spinup(
+        cbm, classifiers, inventory, spinup_params, spinup_reporting_func
+    )
+    reporting_func(0, cbm_vars)
+
+    for time_step in range(1, int(n_steps) + 1):
+        if merge_stands:
+            cbm_vars, merged = cbm_stand_merge.merge_stands(cbm_vars)
+            if merged is not None and merge_reporting_func:
+                merge_reporting_func(time_step, merged)
+
+        if pre_dynamics_func:
+            cbm_vars = pre_dynamics_func(time_step, cbm_vars)
+
+        cbm_vars = cbm.step(cbm_vars)
+        reporting_func(time_step, cbm_vars)
+
+
+# the CBM instance owned by a worker process of simulate_sharded, the
+# context which created it, and the CBM variables of the shard of stands
+# which are resident in the worker. The context is exited by
+# _finalize_worker when the worker process exits.
+_worker_cbm_context: ContextManager[CBM] | None = None
+_worker_cbm: CBM | None = None
+_worker_cbm_vars: CBMVariables | None = None
+
+# the names of the tables of CBMVariables
+_table_names = [
+    "pools",
+    "flux",
+    "classifiers",
+    "state",
+    "inventory",
+    "parameters",
+]
+
+
+def _initialize_worker(cbm_factory: Callable[[], ContextManager[CBM]]):
+    global _worker_cbm_context
+    global _worker_cbm
+    _worker_cbm_context = cbm_factory()
+    _worker_cbm = _worker_cbm_context.__enter__()
+    # worker processes end with os._exit, which skips atexit handlers, so
+    # the cleanup is registered with the multiprocessing finalizers which
+    # are run as the worker process shuts down.
+    multiprocessing_util.Finalize(None, _finalize_worker, exitpriority=10)
+
+
+def _finalize_worker():
+    global _worker_cbm_context
+    global _worker_cbm
+    global _worker_cbm_vars
+    context = _worker_cbm_context
+    _worker_cbm_context = None
+    _worker_cbm = None
+    _worker_cbm_vars = None
+    if context is not None:
+        context.__exit__(None, None, None)
+
+
+def _spinup_shard(
+    classifiers: DataFrame,
+    inventory: DataFrame,
+    spinup_params: DataFrame | None,
+) -> CBMVariables:
+    global _worker_cbm_vars
+    assert _worker_cbm is not None
+    _worker_cbm_vars = _spinup(
+        _worker_cbm, classifiers, inventory, spinup_params, None
+    )
+    return _worker_cbm_vars
+
+
+def _step_shard(
+    changes: dict[str, tuple[Series, DataFrame]],
+    appended: CBMVariables | None,
+) -> tuple[DataFrame, DataFrame, DataFrame]:
+    """apply the changed and appended rows to the resident shard, step it
+    and return the pools, flux and state which are modified by CBM.step
+    """
+    global _worker_cbm_vars
+    assert _worker_cbm is not None
+    assert _worker_cbm_vars is not None
+    for table_name, (indices, values) in changes.items():
+        table: DataFrame = getattr(_worker_cbm_vars, table_name)
+        for col in values.columns:
+            table[col].assign(values[col], indices)
+    if appended is not None:
+        _worker_cbm_vars = _concat_cbm_vars([_worker_cbm_vars, appended])
+    _worker_cbm_vars = _worker_cbm.step(_worker_cbm_vars)
+    return (
+        _worker_cbm_vars.pools,
+        _worker_cbm_vars.flux,
+        _worker_cbm_vars.state,
     )
+
+
+def _get_shards(n_rows: int, n_shards: int) -> list[np.ndarray]:
+    """split the specified number of rows into at most n_shards contiguous,
+    non-empty ranges of row indices
+    """
+    return [
+        idx
+        for idx in np.array_split(np.arange(n_rows), n_shards)
+        if idx.shape[0] > 0
+    ]
+
+
+def _index_shards(
+    shard_rows: list[np.ndarray], n_rows: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """for each of the specified number of global rows, return the index of
+    the shard which owns it, and its row index within that shard
+    """
+    row_shard = np.empty(n_rows, dtype=int)
+    row_local = np.empty(n_rows, dtype=int)
+    for i, rows in enumerate(shard_rows):
+        row_shard[rows] = i
+        row_local[rows] = np.arange(rows.shape[0])
+    return row_shard, row_local
+
+
+def _copy_cbm_vars(cbm_vars: CBMVariables) -> CBMVariables:
+    return CBMVariables(
+        **{name: getattr(cbm_vars, name).copy() for name in _table_names}
+    )
+
+
+def _take_cbm_vars(cbm_vars: CBMVariables, indices: Series) -> CBMVariables:
+    return CBMVariables(
+        **{
+            name: dataframe.convert_dataframe_backend(
+                getattr(cbm_vars, name).take(indices), BackendType.numpy
+            )
+            for name in _table_names
+        }
+    )
+
+
+def _concat_cbm_vars(shards: list[CBMVariables]) -> CBMVariables:
+    return CBMVariables(
+        **{
+            name: dataframe.concat_data_frame(
+                [getattr(x, name) for x in shards]
+            )
+            for name in _table_names
+        }
+    )
+
+
+def _get_changed_rows(before: DataFrame, after: DataFrame) -> np.ndarray:
+    """return the indices of the rows of before whose values differ in
+    after. Rows appended to after are not included.
+    """
+    if after.columns != before.columns:
+        raise ValueError(
+            "pre_dynamics_func must not add, remove or re-order columns"
+        )
+    if after.n_rows < before.n_rows:
+        raise ValueError("pre_dynamics_func must not remove rows")
+    changed = np.zeros(before.n_rows, dtype=bool)
+    for col in before.columns:
+        old = before[col].to_numpy()
+        new = after[col].to_numpy()[: before.n_rows]
+        # NaN compares unequal to itself, and is not a change
+        changed |= (old != new) & ~((old != old) & (new != new))
+    return np.flatnonzero(changed)
+
+
+def _add_changed_rows(
+    table_name: str,
+    before: DataFrame,
+    after: DataFrame,
+    row_shard: np.ndarray,
+    row_local: np.ndarray,
+    changes: list[dict[str, tuple[Series, DataFrame]]],
+):
+    """add the shard local indices and values of the rows of the named
+    table which differ between before and after to the changes of each
+    shard
+    """
+    changed = _get_changed_rows(before, after)
+    for i in np.unique(row_shard[changed]):
+        rows = changed[row_shard[changed] == i]
+        changes[i][table_name] = (
+            series.from_numpy("", row_local[rows]),
+            dataframe.convert_dataframe_backend(
+                after.take(series.from_numpy("", rows)), BackendType.numpy
+            ),
+        )
+
+
+def simulate_sharded(
+    cbm_factory: Callable[[], ContextManager[CBM]],
+    n_steps: int,
+    classifiers: DataFrame,
+    inventory: DataFrame,
+    reporting_func: Callable[[int, CBMVariables], None],
+    pre_dynamics_func: (
+        Callable[[int, CBMVariables], CBMVariables] | None
+    ) = None,
+    spinup_params: DataFrame | None = None,
+    max_workers: int | None = None,
+):
+    """Runs the specified number of timesteps of the CBM model, in the same
+    manner as :py:func:`simulate`, but with the stands split into shards
+    which are processed in parallel by worker processes.
+
+    Each worker process creates its own instance of CBM using cbm_factory,
+    and owns one shard of stands whose CBM variables stay resident in the
+    worker for the whole simulation. Spinup and the CBM dynamics of each
+    timestep are computed by the workers. The pre_dynamics_func and
+    reporting_func are called in the calling process with the CBM
+    variables for all stands, so rule based processing which requires a
+    view of all stands, including processing which splits stands, is
+    unchanged, and results are identical to :py:func:`simulate`.
+
+    On each timestep only the rows which were changed by pre_dynamics_func
+    are sent to the workers, and stands appended by pre_dynamics_func, for
+    example by splitting, are distributed to the smallest shards. The
+    workers send back only the pools, flux and state, which are the tables
+    modified by the CBM dynamics, and these are gathered for the
+    reporting_func and the next pre_dynamics_func. The pre_dynamics_func
+    may modify values and append rows, but must not remove or re-order
+    rows, or change the columns of any of the CBM variables.
+
+    Args:
+        cbm_factory (Callable[[], ContextManager[CBM]]): a function which
+            returns a context manager yielding an initialized CBM instance,
+            for example a `functools.partial` of
+            :py:func:`libcbm.input.sit.sit_cbm_factory.initialize_cbm`.
+            It must be picklable, and every call must produce an identically
+            configured model.
+        n_steps (int): The number of CBM timesteps to run
+        classifiers (DataFrame): CBM classifiers for each of the rows
+            in the inventory
+        inventory (DataFrame): CBM inventory which defines the initial
+            state of the simulation
+        reporting_func (function): a function which accepts the simulation
+            timestep and all CBM variables for reporting results by timestep.
+        pre_dynamics_func (function, optional): A function which accepts the
+            simulation timestep and all CBM variables, and which is called
+            prior to computing C dynamics. The function returns all CBM
+            variables which will then be passed into the current CBM timestep.
+        spinup_params (object): Collection of spinup specific parameters.
+            If unspecified, CBM default values are used. See
+            :py:func:`libcbm.model.cbm.cbm_variables.initialize_spinup_parameters`
+            for object format
+        max_workers (int, optional): the number of worker processes. If
+            unspecified, the number of processors on the machine is used.
+            Defaults to None.
+
+    Raises:
+        ValueError: pre_dynamics_func removed rows, or changed the columns
+            of the CBM variables.
+    """
+    n_shards = max_workers if max_workers else os.cpu_count() or 1
     if spinup_params is not None:
         spinup_params = dataframe.convert_dataframe_backend(
             spinup_params, BackendType.numpy
         )
-    spinup_vars = cbm_variables.initialize_spinup_variables(
-        cbm_vars,
-        BackendType.numpy,
-        spinup_params,
-        include_flux=spinup_reporting_func is not None,
-    )
 
-    cbm.spinup(spinup_vars, reporting_func=spinup_reporting_func)
+    # the global row indices of the stands owned by each shard, in the
+    # order of the rows of the shard, and for each global row, the shard
+    # which owns it and its row index within that shard
+    shard_rows = _get_shards(inventory.n_rows, n_shards)
+    row_shard, row_local = _index_shards(shard_rows, inventory.n_rows)
 
-    if "mean_annual_temp" in spinup_vars.parameters.columns:
-        # since the mean_annual_temp appears in the spinup parameters, carry
-        # it forward to the simulation period so that we have consistent
-        # columns in the outputs
-        cbm_vars.parameters.add_column(
-            spinup_vars.parameters["mean_annual_temp"],
-            cbm_vars.parameters.n_cols,
+    # a single process executor per shard, so that each shard is always
+    # processed by the worker which holds its state
+    executors = [
+        ProcessPoolExecutor(
+            max_workers=1,
+            initializer=_initialize_worker,
+            initargs=(cbm_factory,),
         )
-    cbm_vars = cbm.init(cbm_vars)
-    reporting_func(0, cbm_vars)
+        for _ in shard_rows
+    ]
+    try:
+        futures = [
+            executor.submit(
+                _spinup_shard,
+                classifiers.take(series.from_numpy("", rows)),
+                inventory.take(series.from_numpy("", rows)),
+                (
+                    spinup_params.take(series.from_numpy("", rows))
+                    if spinup_params is not None
+                    else None
+                ),
+            )
+            for executor, rows in zip(executors, shard_rows)
+        ]
+        cbm_vars = _concat_cbm_vars([f.result() for f in futures])
+        reporting_func(0, cbm_vars)
 
-    for time_step in range(1, int(n_steps) + 1):
-        if pre_dynamics_func:
-            cbm_vars = pre_dynamics_func(time_step, cbm_vars)
+        for time_step in range(1, int(n_steps) + 1):
+            n_rows = cbm_vars.pools.n_rows
+            changes: list[dict[str, tuple[Series, DataFrame]]] = [
+                {} for _ in shard_rows
+            ]
+            appended: list[CBMVariables | None] = [None for _ in shard_rows]
+            if pre_dynamics_func:
+                before = _copy_cbm_vars(cbm_vars)
+                cbm_vars = pre_dynamics_func(time_step, cbm_vars)
+                for name in _table_names:
+                    _add_changed_rows(
+                        name,
+                        getattr(before, name),
+                        getattr(cbm_vars, name),
+                        row_shard,
+                        row_local,
+                        changes,
+                    )
+                new_rows = np.arange(n_rows, cbm_vars.pools.n_rows)
+                if new_rows.shape[0] > 0:
+                    smallest_first = np.argsort([len(x) for x in shard_rows])
+                    chunks = np.array_split(new_rows, len(shard_rows))
+                    for i, rows in zip(smallest_first, chunks):
+                        if rows.shape[0] == 0:
+                            continue
+                        appended[i] = _take_cbm_vars(
+                            cbm_vars, series.from_numpy("", rows)
+                        )
+                        shard_rows[i] = np.concatenate([shard_rows[i], rows])
+                    row_shard, row_local = _index_shards(
+                        shard_rows, cbm_vars.pools.n_rows
+                    )
 
-        cbm_vars = cbm.step(cbm_vars)
-        reporting_func(time_step, cbm_vars)
+            futures = [
+                executor.submit(_step_shard, changes[i], appended[i])
+                for i, executor in enumerate(executors)
+            ]
+            results = [f.result() for f in futures]
+
+            # the shard results are in shard order, re-order them to the
+            # global row order
+            global_order = series.from_numpy(
+                "", np.argsort(np.concatenate(shard_rows))
+            )
+            pools, flux, state = (
+                dataframe.concat_data_frame([r[i] for r in results]).take(
+                    global_order
+                )
+                for i in range(3)
+            )
+            cbm_vars = CBMVariables(
+                pools=pools,
+                flux=flux,
+                classifiers=cbm_vars.classifiers,
+                state=state,
+                inventory=cbm_vars.inventory,
+                parameters=cbm_vars.parameters,
+            )
+            reporting_func(time_step, cbm_vars)
+    finally:
+        for executor in executors:
+            executor.shutdown()
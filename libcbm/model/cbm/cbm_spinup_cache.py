@@ -0,0 +1,151 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+import os
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+import libcbm
+from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.storage import series
+from libcbm.storage.dataframe import DataFrame
+
+_CACHED_TABLES = ["pools", "state"]
+
+
+def get_model_key(dll_path: str, *configuration_strings: str) -> str:
+    """Compute a key identifying a CBM model build and configuration.
+
+    Args:
+        dll_path (str): path to the libcbm compiled library
+        configuration_strings (str): the json configuration strings used
+            to initialize the model, which define the model parameters,
+            growth curves and classifiers
+
+    Returns:
+        str: hexadecimal digest identifying the model
+    """
+    model_hash = hashlib.sha256()
+    model_hash.update(libcbm.__version__.encode("UTF-8"))
+    with open(dll_path, "rb") as dll_file:
+        model_hash.update(hashlib.sha256(dll_file.read()).digest())
+    for configuration_string in configuration_strings:
+        model_hash.update(configuration_string.encode("UTF-8"))
+    return model_hash.hexdigest()
+
+
+def _update_hash(
+    spinup_hash, name: str, data: DataFrame, exclude_columns: set[str]
+):
+    spinup_hash.update(name.encode("UTF-8"))
+    for col in data.columns:
+        if col in exclude_columns:
+            continue
+        values = data[col].to_numpy()
+        spinup_hash.update(f"{col}:{values.dtype.str}".encode("UTF-8"))
+        if values.dtype == object:
+            values = pd.util.hash_array(values)
+        spinup_hash.update(np.ascontiguousarray(values).tobytes())
+
+
+class SpinupCache:
+    """Stores the pools and state resulting from CBM spinup on disk, keyed
+    by a hash of the spinup inputs and the model, so that repeated runs on
+    an identical initial landscape can skip spinup.
+
+    Args:
+        cache_dir (str): directory in which cached results are stored. It
+            is created if it does not exist.
+        model_key (str): a key identifying the model build and
+            configuration. See :py:func:`get_model_key`
+    """
+
+    def __init__(self, cache_dir: str, model_key: str):
+        self._cache_dir = cache_dir
+        self._model_key = model_key
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def cache_dir(self) -> str:
+        """get the directory in which cached results are stored"""
+        return self._cache_dir
+
+    def get_key(
+        self,
+        cbm_vars: CBMVariables,
+        exclude_columns: list[str] | None = None,
+    ) -> str:
+        """Compute the key of the specified spinup variables.
+
+        Args:
+            cbm_vars (CBMVariables): spinup CBM variables, prior to spinup
+            exclude_columns (list[str], optional): names of columns which
+                have no effect on the result of spinup. Defaults to None.
+
+        Returns:
+            str: hexadecimal digest identifying the spinup inputs
+        """
+        exclude = set(exclude_columns) if exclude_columns else set()
+        spinup_hash = hashlib.sha256(self._model_key.encode("UTF-8"))
+        for name in [
+            "classifiers",
+            "inventory",
+            "parameters",
+            "pools",
+            "state",
+        ]:
+            _update_hash(spinup_hash, name, getattr(cbm_vars, name), exclude)
+        return spinup_hash.hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.npz")
+
+    def load(self, key: str, cbm_vars: CBMVariables) -> bool:
+        """Assign the cached pools and state for the specified key to
+        cbm_vars, if they exist.
+
+        Args:
+            key (str): the spinup key. See :py:meth:`get_key`
+            cbm_vars (CBMVariables): the spinup CBM variables to assign
+
+        Returns:
+            bool: True if a cached result was found and assigned
+        """
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            return False
+        with np.load(path, allow_pickle=False) as cached:
+            for name in _CACHED_TABLES:
+                dest: DataFrame = getattr(cbm_vars, name)
+                for col in dest.columns:
+                    dest[col].assign(
+                        series.from_numpy(col, cached[f"{name}/{col}"])
+                    )
+        return True
+
+    def save(self, key: str, cbm_vars: CBMVariables) -> None:
+        """Store the pools and state of the specified post-spinup variables
+
+        Args:
+            key (str): the spinup key, computed prior to spinup. See
+                :py:meth:`get_key`
+            cbm_vars (CBMVariables): the spinup CBM variables, after spinup
+        """
+        data = {
+            f"{name}/{col}": getattr(cbm_vars, name)[col].to_numpy()
+            for name in _CACHED_TABLES
+            for col in getattr(cbm_vars, name).columns
+        }
+        # write to a temporary file and then move it into place so that
+        # concurrent runs never read a partially written file
+        fd, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                np.savez(temp_file, **data)
+            os.replace(temp_path, self._get_path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
@@ -0,0 +1,136 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+import numpy as np
+from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.model.model_definition.spinup_engine import get_spinup_groups
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.series import Series
+from libcbm.storage.dataframe import DataFrame
+
+# inventory columns which identify, or which are accumulated over merged
+# stands, and so are not part of the merge signature
+MERGE_EXCLUDED_COLUMNS = ["inventory_id", "parent_inventory_id", "area"]
+
+
+def _quantize_pools(pools: DataFrame, pool_tolerance: float) -> DataFrame:
+    if pool_tolerance <= 0:
+        return pools
+    return dataframe.from_numpy(
+        {
+            col: np.round(pools[col].to_numpy() / pool_tolerance)
+            for col in pools.columns
+        }
+    )
+
+
+def _area_weighted_mean(
+    data: DataFrame,
+    group_index: np.ndarray,
+    area: np.ndarray,
+    group_area: np.ndarray,
+    representative_index: Series,
+) -> DataFrame:
+    """compute the area weighted mean of each column in data by group. The
+    values of the representative row are used for groups with no area.
+    """
+    merged = data.take(representative_index)
+    for col in data.columns:
+        totals = np.bincount(
+            group_index,
+            weights=data[col].to_numpy() * area,
+            minlength=group_area.shape[0],
+        )
+        values = merged[col].to_numpy().astype("float64")
+        np.divide(totals, group_area, out=values, where=group_area > 0)
+        merged[col].assign(series.from_numpy(col, values))
+    return merged
+
+
+def merge_stands(
+    cbm_vars: CBMVariables, pool_tolerance: float = 1e-6
+) -> tuple[CBMVariables, DataFrame | None]:
+    """Merge stands which are indistinguishable in the CBM simulation,
+    such as stands resulting from area splits which have since returned to
+    an identical state.
+
+    Stands are merged when they have identical classifiers, state,
+    parameters and inventory values, with the exception of the columns in
+    :py:data:`MERGE_EXCLUDED_COLUMNS`, and pools which are equal within
+    pool_tolerance. The area of a merged stand is the sum of the areas of
+    its members, and its pools and flux are the area weighted mean of its
+    members, so that total carbon is conserved. The first stand of each
+    group is retained, along with its inventory_id, and the order of
+    retained stands is unchanged.
+
+    Args:
+        cbm_vars (CBMVariables): the simulation variables
+        pool_tolerance (float, optional): the tolerance, in tonnes C/ha,
+            within which pool values are considered equal. If zero, pools
+            must be identical. Defaults to 1e-6.
+
+    Returns:
+        tuple[CBMVariables, DataFrame | None]: the merged simulation
+            variables and a table describing the merged stands, or the
+            unmodified cbm_vars and None if no stands were merged. The
+            table has a row for each stand which was merged into another
+            stand, with columns:
+
+                - inventory_id: the inventory_id of the merged stand
+                - merged_inventory_id: the inventory_id of the stand into
+                  which it was merged
+    """
+    groups = get_spinup_groups(
+        [
+            cbm_vars.classifiers,
+            cbm_vars.state,
+            cbm_vars.parameters,
+            cbm_vars.inventory,
+            _quantize_pools(cbm_vars.pools, pool_tolerance),
+        ],
+        exclude_columns=MERGE_EXCLUDED_COLUMNS,
+    )
+    if groups is None:
+        return cbm_vars, None
+    representative_index, group_index = groups
+    group_idx = group_index.to_numpy()
+
+    area = cbm_vars.inventory["area"].to_numpy()
+    group_area = np.bincount(
+        group_idx, weights=area, minlength=representative_index.length
+    )
+    pools = _area_weighted_mean(
+        cbm_vars.pools, group_idx, area, group_area, representative_index
+    )
+    flux = (
+        _area_weighted_mean(
+            cbm_vars.flux, group_idx, area, group_area, representative_index
+        )
+        if cbm_vars.flux is not None
+        else None
+    )
+    inventory = cbm_vars.inventory.take(representative_index)
+    inventory["area"].assign(series.from_numpy("area", group_area))
+
+    merged_cbm_vars = CBMVariables(
+        pools=pools,
+        flux=flux,
+        classifiers=cbm_vars.classifiers.take(representative_index),
+        state=cbm_vars.state.take(representative_index),
+        inventory=inventory,
+        parameters=cbm_vars.parameters.take(representative_index),
+    )
+
+    target_index = representative_index.to_numpy()[group_idx]
+    merged_index = np.nonzero(target_index != np.arange(group_idx.shape[0]))[0]
+    inventory_id = cbm_vars.inventory["inventory_id"].to_numpy()
+    lineage = dataframe.from_numpy(
+        {
+            "inventory_id": inventory_id[merged_index],
+            "merged_inventory_id": inventory_id[target_index[merged_index]],
+        }
+    )
+    return merged_cbm_vars, lineage
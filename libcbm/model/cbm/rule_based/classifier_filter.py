@@ -3,7 +3,11 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import annotations
+import numpy as np
 from libcbm.input.sit import sit_classifier_parser
+from libcbm.storage import series
+from libcbm.storage import dataframe
+from libcbm.storage.series import Series
 from libcbm.storage.dataframe import DataFrame
 from libcbm.model.cbm.rule_based.rule_filter import RuleFilter
 from libcbm.model.cbm.rule_based import rule_filter
@@ -74,6 +78,51 @@ class ClassifierFilter:
             if x["classifier_id"] == classifier_id
         }
 
+    def get_classifier_value_ids(
+        self, classifier_name: str, classifier_set_value: str
+    ) -> list[int] | None:
+        """Get the classifier value ids matched by a classifier set value
+
+        Args:
+            classifier_name (str): the name of the classifier
+            classifier_set_value (str): a defined classifier value, a
+                classifier aggregate, or a wildcard "?"
+
+        Raises:
+            ValueError: the classifier set value is not defined
+
+        Returns:
+            list[int] | None: the matched classifier value ids, or None for
+                the wildcard, which matches all values
+        """
+        classifier_id_by_name = self.classifier_value_lookup[classifier_name]
+        aggregates = self.aggregate_value_lookup[classifier_name]
+        if classifier_set_value in classifier_id_by_name:
+            return [classifier_id_by_name[classifier_set_value]]
+        elif classifier_set_value in aggregates:
+            return aggregates[classifier_set_value]
+        elif classifier_set_value != self.wildcard_keyword:
+            raise ValueError(
+                f"undefined classifier set value {classifier_set_value}"
+            )
+        return None
+
+    def create_classifier_index(
+        self, classifier_values: DataFrame
+    ) -> ClassifierIndex:
+        """Create an index of the specified classifier values for
+        evaluating many classifier sets. See :py:class:`ClassifierIndex`
+
+        Args:
+            classifier_values (DataFrame): dataframe of classifier
+                value ids by stand (row), by classifier (columns).  Column
+                labels are the classifier names.
+
+        Returns:
+            ClassifierIndex: the classifier index
+        """
+        return ClassifierIndex(self, classifier_values)
+
     def create_classifiers_filter(
         self, classifier_set: list[str], classifier_values: DataFrame
     ) -> RuleFilter:
@@ -169,3 +218,128 @@ class ClassifierFilter:
             data=classifier_values,
         )
         return result
+
+
+class ClassifierIndex:
+    """An inverted index from classifier values to the set of stands having
+    those values, for evaluating the classifier sets of many events on
+    classifier values which do not change, such as the events of a single
+    timestep.
+
+    The stands matched by each classifier set value, including wildcards
+    and aggregates, are stored as a bitset, and a classifier set is
+    evaluated as the intersection of the bitsets of its values. Bitsets
+    and classifier set results are computed on first use and cached.
+
+    Args:
+        classifier_filter (ClassifierFilter): the classifier filter which
+            defines classifier values and aggregates
+        classifier_values (DataFrame): dataframe of classifier
+            value ids by stand (row), by classifier (columns).  Column
+            labels are the classifier names. The values must not be
+            modified while the index is in use.
+    """
+
+    def __init__(
+        self,
+        classifier_filter: ClassifierFilter,
+        classifier_values: DataFrame,
+    ):
+        if classifier_filter.n_classifiers != classifier_values.n_cols:
+            raise ValueError(
+                "mismatch in number of classifiers: "
+                f"classifiers_config: {classifier_filter.n_classifiers}, "
+                f"classifier value columns {classifier_values.n_cols}"
+            )
+        self._classifier_filter = classifier_filter
+        self._n_rows = classifier_values.n_rows
+        self._backend_type = classifier_values.backend_type
+        self._classifier_names = [
+            x["name"]
+            for x in classifier_filter.classifiers_config["classifiers"]
+        ]
+        # for each classifier, the row indices sorted by value id, and the
+        # sorted value ids, so that the rows having any value id are a
+        # contiguous range
+        self._sorted_rows: dict[str, np.ndarray] = {}
+        self._sorted_values: dict[str, np.ndarray] = {}
+        for name in self._classifier_names:
+            values = classifier_values[name].to_numpy()
+            order = np.argsort(values, kind="stable")
+            self._sorted_rows[name] = order
+            self._sorted_values[name] = values[order]
+        self._bitsets: dict[tuple[str, str], np.ndarray | None] = {}
+        self._results: dict[tuple[str, ...], Series | None] = {}
+
+    @property
+    def n_rows(self) -> int:
+        """get the number of indexed stands"""
+        return self._n_rows
+
+    def _get_bitset(
+        self, classifier_name: str, classifier_set_value: str
+    ) -> np.ndarray | None:
+        key = (classifier_name, classifier_set_value)
+        if key not in self._bitsets:
+            value_ids = self._classifier_filter.get_classifier_value_ids(
+                classifier_name, classifier_set_value
+            )
+            if value_ids is None:
+                self._bitsets[key] = None
+            else:
+                sorted_values = self._sorted_values[classifier_name]
+                sorted_rows = self._sorted_rows[classifier_name]
+                lower = np.searchsorted(sorted_values, value_ids, "left")
+                upper = np.searchsorted(sorted_values, value_ids, "right")
+                mask = np.zeros(self._n_rows, dtype=bool)
+                for start, stop in zip(lower, upper):
+                    mask[sorted_rows[start:stop]] = True
+                self._bitsets[key] = np.packbits(mask)
+        return self._bitsets[key]
+
+    def evaluate(self, classifier_set: list[str]) -> Series | None:
+        """Evaluate the specified classifier set on the indexed stands
+
+        Args:
+            classifier_set (list): a list of strings, these may be any of:
+
+                - a defined classifier value
+                - a classifier aggregate
+                - or a wildcard "?"
+
+        Raises:
+            ValueError: mismatch in the number of classifiers
+            ValueError: a classifier value in the specified classifier
+                set is not defined
+
+        Returns:
+            Series | None: boolean series which is True for stands matching
+                the classifier set, or None if the classifier set is all
+                wildcards
+        """
+        if len(classifier_set) != len(self._classifier_names):
+            raise ValueError(
+                "mismatch in number of classifiers: "
+                f"classifier_set {len(classifier_set)}, "
+                f"classifiers_config: {len(self._classifier_names)}"
+            )
+        key = tuple(classifier_set)
+        if key not in self._results:
+            result_bitset = None
+            for name, value in zip(self._classifier_names, classifier_set):
+                bitset = self._get_bitset(name, value)
+                if bitset is None:
+                    continue
+                if result_bitset is None:
+                    result_bitset = bitset
+                else:
+                    result_bitset = np.bitwise_and(result_bitset, bitset)
+            if result_bitset is None:
+                self._results[key] = None
+            else:
+                mask = np.unpackbits(result_bitset, count=self._n_rows)
+                self._results[key] = dataframe.convert_series_backend(
+                    series.from_numpy("", mask.astype(bool)),
+                    self._backend_type,
+                )
+        return self._results[key]
@@ -0,0 +1,427 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+from typing import Any
+from typing import Union
+import numpy as np
+import pandas as pd
+import numexpr
+from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.storage import series
+from libcbm.storage.series import Series
+from libcbm.storage.dataframe import DataFrame
+from libcbm.storage import dataframe
+from libcbm.storage.backends import BackendType
+
+
+def _reserve(buffer: np.ndarray, n_rows: int) -> np.ndarray:
+    """Return the specified buffer if it can hold n_rows, and otherwise a
+    copy of it with at least double the capacity, so that appending rows
+    one batch at a time has amortized constant cost per row.
+    """
+    if buffer.shape[0] >= n_rows:
+        return buffer
+    grown = np.empty(max(n_rows, 2 * buffer.shape[0]), dtype=buffer.dtype)
+    grown[: buffer.shape[0]] = buffer
+    return grown
+
+
+class _SplitLog:
+    """The split log of the records of a set of simulation variables. For
+    each record, the log holds the index of the original record it was
+    split from, or its own index if it is an original record.
+
+    Args:
+        table (DataFrame): one of the tables of the simulation variables
+            prior to any splits, which defines the number of original
+            records
+    """
+
+    def __init__(self, table: DataFrame):
+        self._table = table
+        self._n_split_rows = 0
+        # allocated on the first split, with capacity for further splits
+        self._origin: np.ndarray | None = None
+
+    @property
+    def has_splits(self) -> bool:
+        return self._n_split_rows > 0
+
+    @property
+    def n_original_rows(self) -> int:
+        return self._table.n_rows
+
+    @property
+    def n_rows(self) -> int:
+        return self.n_original_rows + self._n_split_rows
+
+    @property
+    def origin(self) -> np.ndarray:
+        if self._origin is None:
+            return np.arange(self.n_rows)
+        return self._origin[: self.n_rows]
+
+    def append(self, split_index: np.ndarray) -> None:
+        n_rows = self.n_rows
+        if self._origin is None:
+            self._origin = np.arange(n_rows)
+        self._origin = _reserve(self._origin, n_rows + split_index.shape[0])
+        self._origin[n_rows : n_rows + split_index.shape[0]] = self._origin[
+            split_index
+        ]
+        self._n_split_rows += split_index.shape[0]
+
+
+class _ColumnLookup:
+    """numexpr local_dict for evaluating expressions on a
+    :py:class:`_DeferredSplitDataFrame`
+    """
+
+    def __init__(self, df: "_DeferredSplitDataFrame"):
+        self._df = df
+
+    def __getitem__(self, col_name: str) -> np.ndarray:
+        if col_name not in self._df.columns:
+            raise KeyError(col_name)
+        return self._df.get_values(col_name)
+
+
+class _DeferredSplitDataFrame(DataFrame):
+    """Read only view of a table of simulation variables which includes the
+    records split from it since the view was created.
+
+    The base table is not modified. Values of the split records are
+    gathered from the base table through the split log when they are read,
+    and only for the columns which are read. Columns assigned with
+    :py:meth:`assign` are stored for all records in buffers which grow
+    with the split log.
+
+    Args:
+        base (DataFrame): the table prior to any splits
+        split_log (_SplitLog): the split log shared by all tables of the
+            simulation variables
+    """
+
+    def __init__(self, base: DataFrame, split_log: _SplitLog):
+        self._base = base
+        self._split_log = split_log
+        # the values of the assigned columns, for all current records
+        self._assigned: dict[str, np.ndarray] = {}
+        # the base columns gathered to the current records
+        self._gathered: dict[str, np.ndarray] = {}
+
+    @property
+    def is_modified(self) -> bool:
+        """True if records were split, or values were assigned"""
+        return self._split_log.has_splits or len(self._assigned) > 0
+
+    def get_values(self, col_name: str) -> np.ndarray:
+        """Get the values of the specified column for all current records.
+        The returned array must not be modified.
+        """
+        if col_name in self._assigned:
+            return self._assigned[col_name][: self._split_log.n_rows]
+        if not self._split_log.has_splits:
+            return self._base[col_name].to_numpy()
+        if col_name not in self._gathered:
+            self._gathered[col_name] = self._base[col_name].to_numpy()[
+                self._split_log.origin
+            ]
+        return self._gathered[col_name]
+
+    def append_splits(self, split_index: np.ndarray, n_rows: int) -> None:
+        """Copy the assigned values of the specified records to the records
+        appended to the split log after the first n_rows records.
+        """
+        self._gathered.clear()
+        for col_name in list(self._assigned.keys()):
+            values = _reserve(self._assigned[col_name], self._split_log.n_rows)
+            values[n_rows : self._split_log.n_rows] = values[split_index]
+            self._assigned[col_name] = values
+
+    def assign(
+        self,
+        col_name: str,
+        value: Union[Series, np.ndarray, Any],
+        indices: Series,
+    ) -> None:
+        """Assign a value, or a value for each of the specified indices, to
+        the specified column.
+        """
+        if col_name not in self._assigned:
+            self._assigned[col_name] = self.get_values(col_name).copy()
+        if isinstance(value, Series):
+            value = value.to_numpy()
+        self._assigned[col_name][indices.to_numpy()] = value
+
+    def materialize(self) -> DataFrame:
+        """Create a table of all current records"""
+        if not self._split_log.has_splits:
+            result = self._base.copy()
+        else:
+            split_origin = series.from_numpy(
+                "origin",
+                self._split_log.origin[self._split_log.n_original_rows :],
+            )
+            result = dataframe.concat_data_frame(
+                [self._base, self._base.take(split_origin)]
+            )
+        for col_name in self._assigned:
+            result[col_name].assign(
+                series.from_numpy(col_name, self.get_values(col_name))
+            )
+        return result
+
+    def _get_origin(self, idx: np.ndarray) -> np.ndarray:
+        if not self._split_log.has_splits:
+            return idx
+        return self._split_log.origin[idx]
+
+    def _to_series(self, name: str, values: np.ndarray) -> Series:
+        return dataframe.convert_series_backend(
+            series.from_numpy(name, values), self.backend_type
+        )
+
+    def __getitem__(self, col_name: str) -> Series:
+        if not self.is_modified:
+            return self._base[col_name]
+        return self._to_series(col_name, self.get_values(col_name))
+
+    def filter(self, arg: Series) -> DataFrame:
+        return self.take(dataframe.indices_nonzero(arg))
+
+    def take(self, indices: Series) -> DataFrame:
+        if not self.is_modified:
+            return self._base.take(indices)
+        idx = indices.to_numpy()
+        result = self._base.take(
+            series.from_numpy("origin", self._get_origin(idx))
+        )
+        for col_name, values in self._assigned.items():
+            result[col_name].assign(series.from_numpy(col_name, values[idx]))
+        return result
+
+    def at(self, index: int) -> dict:
+        row = self._base.at(int(self._get_origin(np.array(index))))
+        for col_name, values in self._assigned.items():
+            row[col_name] = values[index]
+        return row
+
+    @property
+    def n_rows(self) -> int:
+        return self._split_log.n_rows
+
+    @property
+    def n_cols(self) -> int:
+        return self._base.n_cols
+
+    @property
+    def columns(self) -> list[str]:
+        return self._base.columns
+
+    @property
+    def backend_type(self) -> BackendType:
+        return self._base.backend_type
+
+    def copy(self) -> DataFrame:
+        return self.materialize()
+
+    def multiply(self, series: Series) -> DataFrame:
+        return self.materialize().multiply(series)
+
+    def add_column(self, series: Series, index: int) -> None:
+        raise NotImplementedError("deferred split dataframes are read only")
+
+    def to_numpy(self, make_c_contiguous=True) -> np.ndarray:
+        return self.materialize().to_numpy(make_c_contiguous)
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self.materialize().to_pandas()
+
+    def zero(self):
+        raise NotImplementedError("deferred split dataframes are read only")
+
+    def map(self, arg: dict) -> DataFrame:
+        return self.materialize().map(arg)
+
+    def evaluate_filter(self, expression: str) -> Series:
+        if not self.is_modified:
+            return self._base.evaluate_filter(expression)
+        # only the columns referenced by the expression are gathered
+        return self._to_series(
+            "", numexpr.evaluate(expression, _ColumnLookup(self))
+        )
+
+    def sort_values(self, by: str, ascending: bool = True) -> DataFrame:
+        return self.materialize().sort_values(by, ascending)
+
+    def is_matrix(self) -> bool:
+        return self._base.is_matrix()
+
+
+class DeferredSplitCBMVariables:
+    """The CBM variables of a sequence of rule based events, where the
+    area splits of all tables are recorded in a split log rather than
+    copied for each event.
+
+    Each table is presented as a read only view which includes the split
+    records, or as the original table until it is modified. Events modify
+    values with :py:meth:`assign`, and split records with
+    :py:meth:`split`. Once all events are processed
+    :py:meth:`apply_splits` creates the resulting CBM variables, copying
+    each modified table once.
+
+    Args:
+        cbm_vars (CBMVariables): the simulation variables prior to
+            processing events. Its tables are not modified.
+    """
+
+    table_names = [
+        "pools",
+        "flux",
+        "classifiers",
+        "state",
+        "inventory",
+        "parameters",
+    ]
+
+    def __init__(self, cbm_vars: CBMVariables):
+        self._cbm_vars = cbm_vars
+        self._split_log = _SplitLog(cbm_vars.pools)
+        self._tables: dict[str, _DeferredSplitDataFrame] = {}
+        for name in self.table_names:
+            table: DataFrame | None = getattr(cbm_vars, name, None)
+            if table is not None:
+                self._tables[name] = _DeferredSplitDataFrame(
+                    table, self._split_log
+                )
+
+    def split(self, split_index: Series) -> Series:
+        """Append a copy of each of the specified records.
+
+        Args:
+            split_index (Series): the indices of the records to split
+
+        Returns:
+            Series: the indices of the appended records, corresponding to
+                the specified indices
+        """
+        split_index_values = split_index.to_numpy()
+        n_rows = self._split_log.n_rows
+        self._split_log.append(split_index_values)
+        for table in self._tables.values():
+            table.append_splits(split_index_values, n_rows)
+        return series.from_numpy(
+            "split_index", np.arange(n_rows, self._split_log.n_rows)
+        )
+
+    def assign(
+        self,
+        table_name: str,
+        col_name: str,
+        value: Union[Series, np.ndarray, Any],
+        indices: Series,
+    ) -> None:
+        """Assign a value, or a value for each of the specified indices, to
+        a column of one of the tables.
+
+        Args:
+            table_name (str): the table name, for example "inventory"
+            col_name (str): the column name
+            value (Union[Series, np.ndarray, Any]): a single value, or a
+                value for each index
+            indices (Series): the indices of the records to assign
+        """
+        self._tables[table_name].assign(col_name, value, indices)
+
+    def expand(self, values: Series) -> Series:
+        """Expand a series of values for each of the original records to
+        include the records since split from them.
+
+        Args:
+            values (Series): a series with a value for each of the records
+                of the simulation variables prior to processing events
+
+        Returns:
+            Series: a series with a value for each of the current records
+        """
+        if not self._split_log.has_splits:
+            return values
+        return values.take(series.from_numpy("origin", self.origin))
+
+    @property
+    def origin(self) -> np.ndarray:
+        """For each of the current records, the index of the original record
+        it was split from, or its own index if it is an original record.
+        """
+        return self._split_log.origin
+
+    def _get_table(self, name: str) -> DataFrame:
+        table = self._tables[name]
+        if not table.is_modified:
+            # the original table is used directly until it is modified
+            return getattr(self._cbm_vars, name)
+        return table
+
+    @property
+    def pools(self) -> DataFrame:
+        """Get a read only view of the CBM pools"""
+        return self._get_table("pools")
+
+    @property
+    def flux(self) -> DataFrame | None:
+        """Get a read only view of the CBM flux indicators"""
+        if "flux" not in self._tables:
+            return None
+        return self._get_table("flux")
+
+    @property
+    def classifiers(self) -> DataFrame:
+        """Get a read only view of the CBM classifiers"""
+        return self._get_table("classifiers")
+
+    @property
+    def state(self) -> DataFrame:
+        """Get a read only view of the CBM state"""
+        return self._get_table("state")
+
+    @property
+    def inventory(self) -> DataFrame:
+        """Get a read only view of the CBM inventory"""
+        return self._get_table("inventory")
+
+    @property
+    def parameters(self) -> DataFrame:
+        """Get a read only view of the CBM parameters"""
+        return self._get_table("parameters")
+
+    def apply_splits(self) -> CBMVariables:
+        """Create the simulation variables resulting from the recorded
+        splits and assignments, in a single pass over each modified table.
+
+        Returns:
+            CBMVariables: the resulting simulation variables, or the
+                original simulation variables if no records were split or
+                assigned. Unmodified tables are those of the original
+                simulation variables.
+        """
+        if not any(table.is_modified for table in self._tables.values()):
+            return self._cbm_vars
+        result = {
+            name: (
+                table.materialize()
+                if table.is_modified
+                else getattr(self._cbm_vars, name)
+            )
+            for name, table in self._tables.items()
+        }
+        return CBMVariables(
+            pools=result["pools"],
+            flux=result.get("flux"),
+            classifiers=result["classifiers"],
+            state=result["state"],
+            inventory=result["inventory"],
+            parameters=result["parameters"],
+        )
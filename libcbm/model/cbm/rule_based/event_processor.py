@@ -9,6 +9,9 @@ from libcbm.model.cbm.rule_based import rule_filter
 from libcbm.model.cbm.rule_based.rule_filter import RuleFilter
 from libcbm.model.cbm.rule_based.rule_target import RuleTargetResult
 from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.model.cbm.rule_based.deferred_splits import (
+    DeferredSplitCBMVariables,
+)
 from libcbm.storage import series
 from libcbm.storage.series import Series
 from libcbm.storage.dataframe import DataFrame
@@ -94,9 +97,9 @@ def process_event(
 def apply_rule_based_event(
     target: DataFrame,
     disturbance_type_id: int,
-    cbm_vars: CBMVariables,
+    cbm_vars: CBMVariables | DeferredSplitCBMVariables,
     disturbance_event_id: int | None = None,
-) -> CBMVariables:
+) -> CBMVariables | DeferredSplitCBMVariables:
     """Apply the specified target to the CBM simulation variables,
     splitting them if necessary.
 
@@ -105,16 +108,25 @@ def apply_rule_based_event(
             records to disturb and area split proportions.
         disturbance_type_id (int): the id for the disturbance event being
             applied.
-        cbm_vars (CBMVariables): an object containing dataframes that store cbm
-            simulation state and variables
+        cbm_vars (CBMVariables, DeferredSplitCBMVariables): an object
+            containing dataframes that store cbm simulation state and
+            variables
         disturbance_event_id (int, optional): an identifier for the disturbance
             event being processed.
 
     Returns:
-        CBMVariables: updated and expanded cbm_vars
+        CBMVariables: updated and expanded cbm_vars. If the specified
+            cbm_vars is an instance of :py:class:`DeferredSplitCBMVariables`
+            it is updated in place and returned.
 
     """
 
+    if isinstance(cbm_vars, DeferredSplitCBMVariables):
+        _apply_deferred_rule_based_event(
+            target, disturbance_type_id, cbm_vars, disturbance_event_id
+        )
+        return cbm_vars
+
     target_index = target["disturbed_index"]
     target_area_proportions = target["area_proportions"]
 
@@ -203,3 +215,78 @@ def apply_rule_based_event(
             np.int32(disturbance_event_id), target_index
         )
     return cbm_vars
+
+
+def _apply_deferred_rule_based_event(
+    target: DataFrame,
+    disturbance_type_id: int,
+    cbm_vars: DeferredSplitCBMVariables,
+    disturbance_event_id: int | None,
+) -> None:
+    """The equivalent of :py:func:`apply_rule_based_event` for deferred
+    split CBM variables, which records splits in the split log rather than
+    copying each table.
+    """
+    target_index = target["disturbed_index"]
+    target_area_proportions = target["area_proportions"]
+
+    splits = target_area_proportions < 1.0
+    split_index = target_index.filter(splits)
+
+    if split_index.length > 0:
+        split_proportions = target_area_proportions.filter(splits)
+        split_inventory = cbm_vars.inventory.take(split_index)
+        next_id = int(cbm_vars.inventory["inventory_id"].max() + 1)
+        appended_index = cbm_vars.split(split_index)
+
+        # reduce the area of the disturbed inventory by the disturbance area
+        # proportion, and set the split records as the remaining undisturbed
+        # area
+        cbm_vars.assign(
+            "inventory",
+            "area",
+            split_inventory["area"] * split_proportions,
+            split_index,
+        )
+        cbm_vars.assign(
+            "inventory",
+            "area",
+            split_inventory["area"] * (1.0 - split_proportions),
+            appended_index,
+        )
+
+        # track inventory succession by assigning the parent_inventory_id,
+        # and generating new inventory_ids for the split records
+        cbm_vars.assign(
+            "inventory",
+            "parent_inventory_id",
+            split_inventory["inventory_id"],
+            appended_index,
+        )
+        cbm_vars.assign(
+            "inventory",
+            "inventory_id",
+            np.arange(next_id, next_id + split_index.length),
+            appended_index,
+        )
+
+    cbm_vars.assign(
+        "parameters",
+        "disturbance_type",
+        np.int32(disturbance_type_id),
+        target_index,
+    )
+    cbm_vars.assign(
+        "state",
+        "last_disturbance_type",
+        np.int32(disturbance_type_id),
+        target_index,
+    )
+    cbm_vars.assign("state", "time_since_last_disturbance", 0, target_index)
+    if disturbance_event_id:
+        cbm_vars.assign(
+            "state",
+            "last_disturbance_event",
+            np.int32(disturbance_event_id),
+            target_index,
+        )
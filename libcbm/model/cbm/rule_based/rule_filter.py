@@ -8,9 +8,15 @@ from libcbm.storage.dataframe import DataFrame
 
 
 class RuleFilter:
-    def __init__(self, expression: str, data: DataFrame | None):
+    def __init__(
+        self,
+        expression: str,
+        data: DataFrame | None,
+        result: Series | None = None,
+    ):
         self._expression = expression
         self._data = data
+        self._result = result
 
     @property
     def expression(self) -> str:
@@ -27,6 +33,14 @@ class RuleFilter:
         """
         return self._data
 
+    @property
+    def result(self) -> Series | None:
+        """
+        the precomputed result of the filter on the rows of self.data, if
+        available, in which case the expression is not evaluated.
+        """
+        return self._result
+
 
 def create_filter(expression: str, data: DataFrame | None):
     """Creates a filter object for filtering a pandas dataframe using an
@@ -71,10 +85,14 @@ def evaluate_filters(*filter_objs: RuleFilter) -> Series | None:
             elif out_series_length != filter_obj.data.n_rows:
                 raise ValueError("data length mismatch")
 
-        if not filter_obj or not filter_obj.expression or not filter_obj.data:
+        if filter_obj and filter_obj.data and filter_obj.result is not None:
+            result = filter_obj.result
+        elif (
+            not filter_obj or not filter_obj.expression or not filter_obj.data
+        ):
             continue
-
-        result = filter_obj.data.evaluate_filter(filter_obj.expression)
+        else:
+            result = filter_obj.data.evaluate_filter(filter_obj.expression)
 
         if output is None:
             output = result
@@ -2,21 +2,203 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 from typing import Callable
 from typing import Union
-from typing import Iterator
 from typing import Tuple
 from libcbm.model.cbm.rule_based import event_processor
 from libcbm.model.cbm.rule_based import rule_filter
+from libcbm.model.cbm.rule_based.deferred_splits import (
+    DeferredSplitCBMVariables,
+)
 from libcbm.model.cbm.rule_based.classifier_filter import ClassifierFilter
+from libcbm.model.cbm.rule_based.classifier_filter import ClassifierIndex
 from libcbm.model.cbm.rule_based.sit import sit_stand_filter
 from libcbm.model.cbm.rule_based.sit import sit_stand_target
 from libcbm.model.cbm.cbm_model import CBM
 from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.dataframe import DataFrame
 from libcbm.storage.series import Series
 
 
+class _DisturbanceProductionCache:
+    """Caches the disturbance production density of the records of the
+    simulation variables at the start of a timestep, by disturbance type.
+    Events do not modify pools, and split records have the pools of the
+    record they were split from, so the cached values are valid for all of
+    the timestep's events.  Production is computed only for the eligible
+    records which are not yet cached.
+
+    Args:
+        cbm (CBM): the CBM model
+        cbm_vars (CBMVariables): the simulation variables at the start of
+            the timestep, prior to any splits
+    """
+
+    production_cols = [
+        "DisturbanceSoftProduction",
+        "DisturbanceHardProduction",
+        "DisturbanceDOMProduction",
+        "Total",
+    ]
+
+    def __init__(self, cbm: CBM, cbm_vars: CBMVariables):
+        self._cbm = cbm
+        self._cbm_vars = cbm_vars
+        self._computed: dict[int, np.ndarray] = {}
+        self._production: dict[int, dict[str, np.ndarray]] = {}
+
+    def compute_disturbance_production(
+        self,
+        cbm_vars: DeferredSplitCBMVariables,
+        disturbance_type_id: Union[int, Series],
+        eligible: Series,
+    ) -> DataFrame:
+        """Get the disturbance production density of the eligible current
+        records of cbm_vars. Ineligible records have 0 production.
+        """
+        if isinstance(disturbance_type_id, Series):
+            return self._cbm.compute_disturbance_production(
+                cbm_vars=cbm_vars,
+                disturbance_type=disturbance_type_id,
+                eligible=eligible,
+            )
+        key = int(disturbance_type_id)
+        n_rows = self._cbm_vars.pools.n_rows
+        backend_type = self._cbm_vars.inventory.backend_type
+        if key not in self._computed:
+            self._computed[key] = np.zeros(n_rows, dtype=bool)
+            self._production[key] = {
+                col: np.zeros(n_rows, dtype="float64")
+                for col in self.production_cols
+            }
+        computed = self._computed[key]
+        production = self._production[key]
+
+        origin = cbm_vars.origin
+        eligible_mask = eligible.to_numpy().astype(bool)
+        missing = np.zeros(n_rows, dtype=bool)
+        missing[origin[eligible_mask]] = True
+        missing &= ~computed
+        if missing.any():
+            result = self._cbm.compute_disturbance_production(
+                cbm_vars=self._cbm_vars,
+                disturbance_type=key,
+                eligible=dataframe.convert_series_backend(
+                    series.from_numpy("eligible", missing),
+                    backend_type,
+                ),
+            )
+            for col in self.production_cols:
+                production[col][missing] = result[col].to_numpy()[missing]
+            computed |= missing
+
+        return dataframe.convert_dataframe_backend(
+            dataframe.from_numpy(
+                {
+                    col: np.where(eligible_mask, production[col][origin], 0.0)
+                    for col in self.production_cols
+                }
+            ),
+            backend_type,
+        )
+
+
+class SITEventFilterPlan:
+    """The eligibility filter expressions of a single SIT event, which are
+    built on first use and then evaluated on each timestep the event
+    occurs.
+
+    The expressions are only built if they are used, since events which
+    reference SIT eligibilities do not have the columns they are built
+    from.
+
+    Args:
+        event_index (int): the index of the event in the SIT events table
+        sit_event (dict): the SIT event row
+        disturbance_type_map (dict[str, int]): map of SIT defined
+            disturbance type ids to internally (strictly numeric)
+            disturbance type ids.
+    """
+
+    def __init__(
+        self,
+        event_index: int,
+        sit_event: dict,
+        disturbance_type_map: dict[str, int],
+    ):
+        self._event_index = event_index
+        self._sit_event = sit_event
+        self._disturbance_type_map = disturbance_type_map
+        self._pool_filter_expression: str | None = None
+        self._state_filter_expression: str | None = None
+        self._last_disturbance_type_filter_expression: str | None = None
+        self._classifier_sets: dict[tuple[str, ...], list[str]] = {}
+
+    @property
+    def event_index(self) -> int:
+        """the index of the event in the SIT events table"""
+        return self._event_index
+
+    @property
+    def sit_event(self) -> dict:
+        """the SIT event row"""
+        return self._sit_event
+
+    @property
+    def pool_filter_expression(self) -> str:
+        """the filter expression against pool values"""
+        if self._pool_filter_expression is None:
+            self._pool_filter_expression = (
+                sit_stand_filter.create_pool_filter_expression(
+                    self._sit_event
+                )
+            )
+        return self._pool_filter_expression
+
+    @property
+    def state_filter_expression(self) -> str:
+        """the filter expression against state variables"""
+        if self._state_filter_expression is None:
+            self._state_filter_expression = (
+                sit_stand_filter.create_state_filter_expression(
+                    self._sit_event, False
+                )
+            )
+        return self._state_filter_expression
+
+    @property
+    def last_disturbance_type_filter_expression(self) -> str:
+        """the filter expression against the last disturbance type"""
+        if self._last_disturbance_type_filter_expression is None:
+            self._last_disturbance_type_filter_expression = (
+                sit_stand_filter.create_last_disturbance_type_filter(
+                    self._sit_event, self._disturbance_type_map
+                )
+            )
+        return self._last_disturbance_type_filter_expression
+
+    def get_classifier_set(self, classifiers: list[str]) -> list[str]:
+        """Get the event's classifier set for the specified classifier
+        names.
+
+        Args:
+            classifiers (list): list of classifier names
+
+        Returns:
+            list: the classifier set
+        """
+        key = tuple(classifiers)
+        if key not in self._classifier_sets:
+            self._classifier_sets[key] = sit_stand_filter.get_classifier_set(
+                self._sit_event, classifiers
+            )
+        return self._classifier_sets[key]
+
+
 class SITEventProcessor:
     """SITEventProcessor processes standard import tool format events.
 
@@ -30,6 +212,12 @@ class SITEventProcessor:
             random numbers in the returned sequence.
         disturbance_type_map (dict[str, int]): map of SIT defined disturbance
             type ids to internally (strictly numeric) disturbance type ids.
+        sit_events (pandas.DataFrame, optional): table of SIT formatted
+            events. If specified the event filters are compiled on
+            construction, otherwise they are compiled on the first call to
+            :py:meth:`process_events`.
+        sit_eligibilities (pandas.DataFrame, optional): table of eligibility
+            expressions, compiled along with sit_events.
     """
 
     def __init__(
@@ -38,47 +226,90 @@ class SITEventProcessor:
         classifier_filter_builder: ClassifierFilter,
         random_generator: Callable[[int], Series],
         disturbance_type_map: dict[str, int],
+        sit_events: pd.DataFrame | None = None,
+        sit_eligibilities: pd.DataFrame | None = None,
     ):
         self._cbm = cbm
         self._classifier_filter_builder = classifier_filter_builder
         self._random_generator = random_generator
         self._disturbance_type_map = disturbance_type_map
+        self._compiled_events: pd.DataFrame | None = None
+        self._event_plans: dict[int, list[SITEventFilterPlan]] = {}
+        self._compiled_eligibilities: pd.DataFrame | None = None
+        self._eligibility_expressions: dict[int, pd.Series] | None = None
+        if sit_events is not None:
+            self._compile_events(sit_events)
+        if sit_eligibilities is not None:
+            self._compile_eligibilities(sit_eligibilities)
 
-    def _get_compute_disturbance_production(
-        self, cbm: CBM, eligible: Series
-    ) -> Callable[[CBMVariables, Union[int, Series]]]:
-        def compute_disturbance_production(
-            cbm_vars: CBMVariables, disturbance_type_id: Union[int, Series]
-        ):
-            return cbm.compute_disturbance_production(
-                cbm_vars=cbm_vars,
-                disturbance_type=disturbance_type_id,
-                eligible=eligible,
+    def _compile_events(self, sit_events: pd.DataFrame) -> None:
+        # events are sorted once by the stable mergesort, so the per
+        # timestep groups retain the "sort_field" order
+        self._event_plans = {}
+        sorted_events = sit_events.sort_values(
+            by="sort_field", kind="mergesort"
+        )
+        for event_index, sorted_event in sorted_events.iterrows():
+            sit_event = dict(sorted_event)
+            plan = SITEventFilterPlan(
+                event_index=int(event_index),  # type: ignore
+                sit_event=sit_event,
+                disturbance_type_map=self._disturbance_type_map,
             )
+            self._event_plans.setdefault(
+                int(sit_event["time_step"]), []
+            ).append(plan)
+        self._compiled_events = sit_events
 
-        return compute_disturbance_production
+    def _compile_eligibilities(self, sit_eligibilities: pd.DataFrame) -> None:
+        self._eligibility_expressions = {
+            int(row["eligibility_id"]): row
+            for _, row in sit_eligibilities.iterrows()
+        }
+        self._compiled_eligibilities = sit_eligibilities
+
+    def recompile(
+        self,
+        sit_events: pd.DataFrame,
+        sit_eligibilities: pd.DataFrame | None = None,
+    ) -> None:
+        """Compile the event filters of the specified tables. This is
+        required if a table passed to :py:meth:`process_events` was
+        modified in place, since tables are only compiled again when a
+        different table object is specified.
+
+        Args:
+            sit_events (pandas.DataFrame): table of SIT formatted events
+            sit_eligibilities (pandas.DataFrame, optional): table of
+                eligibility expressions
+        """
+        self._compile_events(sit_events)
+        if sit_eligibilities is not None:
+            self._compile_eligibilities(sit_eligibilities)
 
     def _process_event(
         self,
         eligible: Series,
-        sit_event: dict,
-        cbm_vars: CBMVariables,
+        plan: SITEventFilterPlan,
+        cbm_vars: DeferredSplitCBMVariables,
+        classifier_index: ClassifierIndex,
+        production_cache: _DisturbanceProductionCache,
         sit_eligibility: pd.Series | None = None,
     ) -> event_processor.ProcessEventResult:
-        compute_disturbance_production = (
-            self._get_compute_disturbance_production(
-                cbm=self._cbm, eligible=eligible
-            )
-        )
+        sit_event = plan.sit_event
 
         target_factory = sit_stand_target.create_sit_event_target_factory(
             sit_event_row=sit_event,
-            disturbance_production_func=compute_disturbance_production,
+            disturbance_production_func=(
+                production_cache.compute_disturbance_production
+            ),
             random_generator=self._random_generator,
         )
 
         if sit_eligibility is None:
-            event_filters = self._create_sit_event_filters(sit_event, cbm_vars)
+            event_filters = self._create_sit_event_filters(
+                plan, cbm_vars, classifier_index
+            )
         else:
             event_filters = [
                 rule_filter.create_filter(
@@ -89,11 +320,8 @@ class SITEventProcessor:
                     expression=sit_eligibility["state_filter_expression"],
                     data=cbm_vars.state,
                 ),
-                self._classifier_filter_builder.create_classifiers_filter(
-                    sit_stand_filter.get_classifier_set(
-                        sit_event, cbm_vars.classifiers.columns
-                    ),
-                    cbm_vars.classifiers,
+                self._create_classifiers_filter(
+                    plan, cbm_vars, classifier_index
                 ),
             ]
 
@@ -112,49 +340,50 @@ class SITEventProcessor:
 
         return process_event_result
 
-    def _create_sit_event_filters(
-        self, sit_event: dict, cbm_vars: CBMVariables
-    ) -> list[rule_filter.RuleFilter]:
-        pool_filter_expression = (
-            sit_stand_filter.create_pool_filter_expression(sit_event)
+    def _create_classifiers_filter(
+        self,
+        plan: SITEventFilterPlan,
+        cbm_vars: DeferredSplitCBMVariables,
+        classifier_index: ClassifierIndex,
+    ) -> rule_filter.RuleFilter:
+        # the classifier index is built on the records prior to any splits
+        # in this timestep, and since split records have the classifiers of
+        # the record they were split from, the result is expanded to the
+        # current records
+        result = classifier_index.evaluate(
+            plan.get_classifier_set(cbm_vars.classifiers.columns)
         )
-        state_filter_expression = (
-            sit_stand_filter.create_state_filter_expression(sit_event, False)
-        )
-        dist_type_filter_expression = (
-            sit_stand_filter.create_last_disturbance_type_filter(
-                sit_event, self._disturbance_type_map
-            )
+        if result is None:
+            # the classifier set is all wildcards
+            return rule_filter.RuleFilter(expression="", data=None)
+        return rule_filter.RuleFilter(
+            expression="",
+            data=cbm_vars.classifiers,
+            result=cbm_vars.expand(result),
         )
 
+    def _create_sit_event_filters(
+        self,
+        plan: SITEventFilterPlan,
+        cbm_vars: DeferredSplitCBMVariables,
+        classifier_index: ClassifierIndex,
+    ) -> list[rule_filter.RuleFilter]:
         return [
             rule_filter.create_filter(
-                expression=pool_filter_expression, data=cbm_vars.pools
+                expression=plan.pool_filter_expression, data=cbm_vars.pools
             ),
             rule_filter.create_filter(
-                expression=state_filter_expression, data=cbm_vars.state
+                expression=plan.state_filter_expression, data=cbm_vars.state
             ),
-            self._classifier_filter_builder.create_classifiers_filter(
-                sit_stand_filter.get_classifier_set(
-                    sit_event, cbm_vars.classifiers.columns
-                ),
-                cbm_vars.classifiers,
+            self._create_classifiers_filter(
+                plan, cbm_vars, classifier_index
             ),
             rule_filter.create_filter(
-                expression=dist_type_filter_expression, data=cbm_vars.state
+                expression=plan.last_disturbance_type_filter_expression,
+                data=cbm_vars.state,
             ),
         ]
 
-    def _event_iterator(
-        self, sit_events: pd.DataFrame
-    ) -> Iterator[Tuple[int, dict]]:
-        sorted_events = sit_events.sort_values(
-            by="sort_field", kind="mergesort"
-        )
-        # mergesort is a stable sort, and the default "quicksort" is not
-        for event_index, sorted_event in sorted_events.iterrows():
-            yield int(event_index), dict(sorted_event)  # type: ignore
-
     def process_events(
         self,
         time_step: int,
@@ -171,6 +400,11 @@ class SITEventProcessor:
         sizes due to area splitting, however the total inventory area will
         remain constant.
 
+        The event filters are compiled once, and re-used for as long as
+        the same sit_events and sit_eligibilities objects are specified.
+        A different table object is compiled again. Tables modified in
+        place must be compiled again with :py:meth:`recompile`.
+
         Args:
             time_step (int): the simulation time step for which to compute the
                 events.  Used to filter the specified sit_events DataFrame by
@@ -190,32 +424,59 @@ class SITEventProcessor:
 
         if sit_events is None:
             return cbm_vars, None
-        time_step_events = sit_events[
-            sit_events["time_step"] == time_step
-        ].copy()
+        if sit_events is not self._compiled_events:
+            self._compile_events(sit_events)
+        if (
+            sit_eligibilities is not None
+            and sit_eligibilities is not self._compiled_eligibilities
+        ):
+            self._compile_eligibilities(sit_eligibilities)
+        eligibilty_expressions = (
+            self._eligibility_expressions
+            if sit_eligibilities is not None
+            else None
+        )
 
+        time_step_plans = self._event_plans.get(time_step, [])
         stats_rows = []
-        eligibilty_expressions = None
-        if sit_eligibilities is not None:
-            eligibilty_expressions = {
-                int(row["eligibility_id"]): row
-                for _, row in sit_eligibilities.iterrows()
-            }
 
-        for event_index, sit_event in self._event_iterator(time_step_events):
+        if not time_step_plans:
+            return cbm_vars, None
+
+        # classifiers are not modified by events, so a single index
+        # serves all of the timestep's events
+        classifier_index = (
+            self._classifier_filter_builder.create_classifier_index(
+                cbm_vars.classifiers
+            )
+        )
+
+        # production is cached for the timestep, since events do not
+        # modify pools
+        production_cache = _DisturbanceProductionCache(self._cbm, cbm_vars)
+
+        # area splits are recorded in a split log and applied once all of
+        # the timestep's events are processed
+        cbm_vars = DeferredSplitCBMVariables(cbm_vars)
+        for plan in time_step_plans:
             eligible = cbm_vars.parameters["disturbance_type"] <= 0
             expression = None
             if eligibilty_expressions:
                 expression = eligibilty_expressions[
-                    int(sit_event["eligibility_id"])
+                    int(plan.sit_event["eligibility_id"])
                 ]
             process_event_result = self._process_event(
-                eligible, sit_event, cbm_vars, expression
+                eligible,
+                plan,
+                cbm_vars,
+                classifier_index,
+                production_cache,
+                expression,
             )
             cbm_vars = process_event_result.cbm_vars
             stats = process_event_result.rule_target_result.statistics
             if stats is not None:
-                stats["sit_event_index"] = event_index
+                stats["sit_event_index"] = plan.event_index
                 stats_rows.append(stats)
         stats_df = None
         if stats_rows:
@@ -231,4 +492,4 @@ class SITEventProcessor:
                     "num_eligible": "int64",
                 }
             )
-        return cbm_vars, stats_df
+        return cbm_vars.apply_splits(), stats_df
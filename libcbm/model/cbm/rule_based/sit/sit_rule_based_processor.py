@@ -131,6 +131,8 @@ def sit_rule_based_processor_factory(
         classifier_filter_builder=classifier_filter,
         random_generator=random_func,
         disturbance_type_map=disturbance_type_map,
+        sit_events=sit_events,
+        sit_eligibilities=sit_eligibilities,
     )
 
     return SITRuleBasedProcessor(
@@ -16,7 +16,7 @@ from libcbm.storage.dataframe import DataFrame
 def create_sit_event_target_factory(
     sit_event_row: dict,
     disturbance_production_func: Callable[
-        [CBMVariables, Union[int, Series]], DataFrame
+        [CBMVariables, Union[int, Series], Series], DataFrame
     ],
     random_generator: Callable[[int], Series],
 ) -> Callable[[CBMVariables, Series], RuleTargetResult]:
@@ -36,7 +36,7 @@ def create_sit_event_target(
     sit_event_row: dict,
     cbm_vars: CBMVariables,
     disturbance_production_func: Callable[
-        [CBMVariables, Union[int, Series]], DataFrame
+        [CBMVariables, Union[int, Series], Series], DataFrame
     ],
     eligible: Series,
     random_generator: Callable[[int], Series],
@@ -52,7 +52,7 @@ def create_sit_event_target(
 
     if sit_rule_based_sort.is_production_based(sit_event_row):
         production = disturbance_production_func(
-            cbm_vars, sit_event_row["disturbance_type_id"]
+            cbm_vars, sit_event_row["disturbance_type_id"], eligible
         )
     else:
         production = None
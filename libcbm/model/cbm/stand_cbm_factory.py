@@ -342,6 +342,7 @@ class StandCBMFactory:
         self,
         dll_config_factory: Callable[[], dict] | None = None,
         cbm_parameters_factory: Callable[[], dict] | None = None,
+        spinup_cache_dir: str | None = None,
     ) -> Iterator[CBM]:
         """Context manager to create an instance of CBM for multi stand
         simulation.
@@ -358,6 +359,9 @@ class StandCBMFactory:
                 which draws parameters from the `cbm_defaults` database is
                 used. See: :py:func:`cbm_defaults.get_cbm_parameters_factory`
                 Defaults to None.
+            spinup_cache_dir (str, optional): if specified, spinup results
+                are cached in this directory and reused by subsequent runs
+                with identical inputs. Defaults to None.
 
         Yields:
             Iterator[CBM]: _description_
@@ -378,5 +382,6 @@ class StandCBMFactory:
             ),
             merch_volume_to_biomass_factory=self.merch_volumes_factory,
             classifiers_factory=self.classifiers_factory,
+            spinup_cache_dir=spinup_cache_dir,
         ) as cbm:
             yield cbm
@@ -17,7 +17,7 @@ def net_growth(
     """
     matrices = {}
     if "age" in growth_info:
-        matrices["[row_idx]"] = growth_info["row_idx"]
+        matrices["[state.growth_curve_id]"] = growth_info["growth_curve_id"]
         matrices["[state.age]"] = growth_info["age"]
     matrices.update(
         {
@@ -46,7 +46,7 @@ def overmature_decline(
     """
     matrices = {}
     if "age" in growth_info:
-        matrices["[row_idx]"] = growth_info["row_idx"]
+        matrices["[state.growth_curve_id]"] = growth_info["growth_curve_id"]
         matrices["[state.age]"] = growth_info["age"]
     matrices.update(
         {
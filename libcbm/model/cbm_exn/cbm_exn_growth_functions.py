@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 import numba as nb
 from libcbm.model.model_definition.model_variables import ModelVariables
+from libcbm.model.model_definition import spinup_engine
+from libcbm.storage import dataframe
 
 
 def _total_root_bio_hw(
@@ -99,48 +101,105 @@ def _overmature_decline_compute(
     fine_root_to_ag_vfast_prop: np.ndarray,
     fine_root_to_bg_vfast_prop: np.ndarray,
 ):
+    # the pool and increment arrays are shaped (n_stands, n_ages), the
+    # split arrays are shaped (n_stands,)
     tolerance = -0.0001
-    size = merch.shape[0]
-    for i in range(size):
-        overmature = (
-            merch_inc[i]
-            + foliage_inc[i]
-            + other_inc[i]
-            + fine_root_inc[i]
-            + coarse_root_inc[i]
-        ) < tolerance
-        if overmature and merch_inc[i] < 0:
-            merch_to_stem_snag_prop[i] = -merch_inc[i] / merch[i]
-        if overmature and other_inc[i] < 0:
-            other_to_branch_snag_prop[i] = (
-                -other_inc[i] * other_to_branch_snag_split[i] / other[i]
-            )
-            other_to_ag_fast_prop[i] = (
-                -other_inc[i] * (1 - other_to_branch_snag_split[i]) / other[i]
-            )
-        if overmature and foliage_inc[i] < 0:
-            foliage_to_ag_fast_prop[i] = -foliage_inc[i] / foliage[i]
-        if overmature and coarse_root_inc[i] < 0:
-            coarse_root_to_ag_fast_prop[i] = (
-                -coarse_root_inc[i] * coarse_root_ag_split[i] / coarse_root[i]
-            )
-            coarse_root_to_bg_fast_prop[i] = (
-                -coarse_root_inc[i]
-                * (1 - coarse_root_ag_split[i])
-                / coarse_root[i]
-            )
-        if overmature and fine_root_inc[i] < 0:
-            fine_root_to_ag_vfast_prop[i] = (
-                -fine_root_inc[i] * fine_root_ag_split[i] / fine_root[i]
-            )
-            fine_root_to_bg_vfast_prop[i] = (
-                -fine_root_inc[i] * (1 - fine_root_ag_split[i]) / fine_root[i]
-            )
+    n_rows, n_cols = merch.shape
+    for i in range(n_rows):
+        for j in range(n_cols):
+            overmature = (
+                merch_inc[i, j]
+                + foliage_inc[i, j]
+                + other_inc[i, j]
+                + fine_root_inc[i, j]
+                + coarse_root_inc[i, j]
+            ) < tolerance
+            if not overmature:
+                continue
+            if merch_inc[i, j] < 0:
+                merch_to_stem_snag_prop[i, j] = -merch_inc[i, j] / merch[i, j]
+            if other_inc[i, j] < 0:
+                other_to_branch_snag_prop[i, j] = (
+                    -other_inc[i, j]
+                    * other_to_branch_snag_split[i]
+                    / other[i, j]
+                )
+                other_to_ag_fast_prop[i, j] = (
+                    -other_inc[i, j]
+                    * (1 - other_to_branch_snag_split[i])
+                    / other[i, j]
+                )
+            if foliage_inc[i, j] < 0:
+                foliage_to_ag_fast_prop[i, j] = (
+                    -foliage_inc[i, j] / foliage[i, j]
+                )
+            if coarse_root_inc[i, j] < 0:
+                coarse_root_to_ag_fast_prop[i, j] = (
+                    -coarse_root_inc[i, j]
+                    * coarse_root_ag_split[i]
+                    / coarse_root[i, j]
+                )
+                coarse_root_to_bg_fast_prop[i, j] = (
+                    -coarse_root_inc[i, j]
+                    * (1 - coarse_root_ag_split[i])
+                    / coarse_root[i, j]
+                )
+            if fine_root_inc[i, j] < 0:
+                fine_root_to_ag_vfast_prop[i, j] = (
+                    -fine_root_inc[i, j]
+                    * fine_root_ag_split[i]
+                    / fine_root[i, j]
+                )
+                fine_root_to_bg_vfast_prop[i, j] = (
+                    -fine_root_inc[i, j]
+                    * (1 - fine_root_ag_split[i])
+                    / fine_root[i, j]
+                )
+
+
+def _get_turnover_splits(
+    spatial_unit_id: np.ndarray,
+    sw_hw: np.ndarray,
+    turnover_parameters: pd.DataFrame,
+) -> dict[str, np.ndarray]:
+    """
+    Join the overmature decline turnover splits to each stand, by spatial
+    unit id and sw_hw
+    """
+    turnover_parameters_merged = pd.DataFrame(
+        {"spatial_unit_id": spatial_unit_id, "sw_hw": sw_hw}
+    ).merge(
+        turnover_parameters[
+            [
+                "spatial_unit_id",
+                "sw_hw",
+                "OtherToBranchSnagSplit",
+                "CoarseRootAGSplit",
+                "FineRootAGSplit",
+            ]
+        ],
+        how="left",
+        on=["spatial_unit_id", "sw_hw"],
+        validate="many_to_one",
+    )
+    if turnover_parameters_merged["OtherToBranchSnagSplit"].isna().any():
+        raise ValueError()
+
+    return {
+        "other_to_branch_snag_split": turnover_parameters_merged[
+            "OtherToBranchSnagSplit"
+        ].to_numpy(),
+        "coarse_root_ag_split": turnover_parameters_merged[
+            "CoarseRootAGSplit"
+        ].to_numpy(),
+        "fine_root_ag_split": turnover_parameters_merged[
+            "FineRootAGSplit"
+        ].to_numpy(),
+    }
 
 
 def _compute_overmature_decline(
-    spatial_unit_id: np.ndarray,
-    sw_hw: np.ndarray,
+    turnover_splits: dict[str, np.ndarray],
     merch: np.ndarray,
     foliage: np.ndarray,
     other: np.ndarray,
@@ -151,79 +210,121 @@ def _compute_overmature_decline(
     other_inc: np.ndarray,
     coarse_root_inc: np.ndarray,
     fine_root_inc: np.ndarray,
-    turnover_parameters: pd.DataFrame,
 ) -> dict[str, np.ndarray]:
     """
     Compute the C flows for CBM-CFS3 overmature decline
     IE. when the net C incremenet is negative.
+
+    The pool and increment arrays are either of shape (n_stands,) or
+    (n_stands, n_ages), and the turnover splits are of shape (n_stands,)
+    as returned by :py:func:`_get_turnover_splits`
     """
-    turnover_parameters_merged = turnover_parameters[
-        [
-            "spatial_unit_id",
-            "sw_hw",
-            "OtherToBranchSnagSplit",
-            "CoarseRootAGSplit",
-            "FineRootAGSplit",
+    shape = merch.shape
+    n_rows = shape[0]
+
+    def as_2d(a: np.ndarray) -> np.ndarray:
+        return a.reshape(n_rows, -1)
+
+    result = {
+        k: np.zeros(shape)
+        for k in [
+            "merch_to_stem_snag_prop",
+            "other_to_branch_snag_prop",
+            "other_to_ag_fast_prop",
+            "foliage_to_ag_fast_prop",
+            "coarse_root_to_ag_fast_prop",
+            "coarse_root_to_bg_fast_prop",
+            "fine_root_to_ag_vfast_prop",
+            "fine_root_to_bg_vfast_prop",
         ]
-    ].merge(
-        pd.DataFrame({"spatial_unit_id": spatial_unit_id, "sw_hw": sw_hw}),
-        left_on=["spatial_unit_id", "sw_hw"],
-        right_on=["spatial_unit_id", "sw_hw"],
+    }
+    _overmature_decline_compute(
+        as_2d(merch),
+        as_2d(foliage),
+        as_2d(other),
+        as_2d(coarse_root),
+        as_2d(fine_root),
+        as_2d(merch_inc),
+        as_2d(foliage_inc),
+        as_2d(other_inc),
+        as_2d(coarse_root_inc),
+        as_2d(fine_root_inc),
+        turnover_splits["other_to_branch_snag_split"],
+        turnover_splits["coarse_root_ag_split"],
+        turnover_splits["fine_root_ag_split"],
+        *[as_2d(v) for v in result.values()],
     )
+    return result
 
-    if len(turnover_parameters_merged.index) != spatial_unit_id.shape[0]:
-        raise ValueError()
 
-    other_to_branch_snag_split = turnover_parameters_merged[
-        "OtherToBranchSnagSplit"
-    ].to_numpy()
-    coarse_root_ag_split = turnover_parameters_merged[
-        "CoarseRootAGSplit"
-    ].to_numpy()
-    fine_root_ag_split = turnover_parameters_merged[
-        "FineRootAGSplit"
-    ].to_numpy()
-    merch_to_stem_snag_prop = np.zeros(spatial_unit_id.shape)
-    other_to_branch_snag_prop = np.zeros(spatial_unit_id.shape)
-    other_to_ag_fast_prop = np.zeros(spatial_unit_id.shape)
-    foliage_to_ag_fast_prop = np.zeros(spatial_unit_id.shape)
-    coarse_root_to_ag_fast_prop = np.zeros(spatial_unit_id.shape)
-    coarse_root_to_bg_fast_prop = np.zeros(spatial_unit_id.shape)
-    fine_root_to_ag_vfast_prop = np.zeros(spatial_unit_id.shape)
-    fine_root_to_bg_vfast_pro = np.zeros(spatial_unit_id.shape)
-    _overmature_decline_compute(
-        merch,
-        foliage,
-        other,
-        coarse_root,
-        fine_root,
-        merch_inc,
-        foliage_inc,
-        other_inc,
-        coarse_root_inc,
-        fine_root_inc,
-        other_to_branch_snag_split,
-        coarse_root_ag_split,
-        fine_root_ag_split,
-        merch_to_stem_snag_prop,
-        other_to_branch_snag_prop,
-        other_to_ag_fast_prop,
-        foliage_to_ag_fast_prop,
-        coarse_root_to_ag_fast_prop,
-        coarse_root_to_bg_fast_prop,
-        fine_root_to_ag_vfast_prop,
-        fine_root_to_bg_vfast_pro,
+def _get_growth_curves(
+    increments: pd.DataFrame,
+    n_stands: int,
+    sw_hw: np.ndarray,
+    turnover_splits: dict[str, np.ndarray],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Group the stands with identical increments, sw_hw and turnover splits
+    into growth curves, working on the long format increments, sorted by
+    row_idx and age, so that no dense per-stand table of increments by age
+    is built.
+
+    Each stand's sequence of increment rows, ordered by age, is reduced to
+    a hash which is grouped with the other per-stand values. Hash
+    collisions are detected by comparing every stand's rows with those of
+    the representative stand of its curve, in which case every stand is
+    given its own curve.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the index of the representative
+            stand of each curve, in ascending order, and the curve id of
+            each stand
+    """
+    row_idx = increments["row_idx"].to_numpy()
+    if row_idx.shape[0] == 0 or row_idx.min() < 0 or row_idx.max() >= n_stands:
+        raise ValueError("expected increments for each spinup parameter row")
+    n_ages = np.bincount(row_idx, minlength=n_stands)
+    if (n_ages == 0).any():
+        raise ValueError("expected increments for each spinup parameter row")
+    start = np.concatenate([[0], np.cumsum(n_ages)[:-1]])
+    position = np.arange(row_idx.shape[0]) - np.repeat(start, n_ages)
+
+    # the code of each distinct (age, increments) row
+    row_code = (
+        increments.groupby(
+            ["age", "merch_inc", "foliage_inc", "other_inc"],
+            sort=False,
+            dropna=False,
+        )
+        .ngroup()
+        .to_numpy()
+        .astype("uint64")
     )
-    return {
-        "merch_to_stem_snag_prop": merch_to_stem_snag_prop,
-        "other_to_branch_snag_prop": other_to_branch_snag_prop,
-        "other_to_ag_fast_prop": other_to_ag_fast_prop,
-        "foliage_to_ag_fast_prop": foliage_to_ag_fast_prop,
-        "coarse_root_to_ag_fast_prop": coarse_root_to_ag_fast_prop,
-        "coarse_root_to_bg_fast_prop": coarse_root_to_bg_fast_prop,
-        "fine_root_to_ag_vfast_prop": fine_root_to_ag_vfast_prop,
-        "fine_root_to_bg_vfast_prop": fine_root_to_bg_vfast_pro,
-    }
+    # polynomial hash of each stand's sequence of row codes, computed with
+    # wrapping unsigned 64 bit arithmetic
+    with np.errstate(over="ignore"):
+        weight = np.power(
+            np.uint64(1000003), position.astype("uint64"), dtype="uint64"
+        )
+        stand_hash = np.add.reduceat((row_code + np.uint64(1)) * weight, start)
+
+    signature = {"sw_hw": sw_hw, "n_ages": n_ages, "hash": stand_hash}
+    signature.update(turnover_splits)
+    growth_curves = spinup_engine.get_spinup_groups(
+        [dataframe.from_numpy(signature)]
+    )
+    unique_curves = (
+        np.arange(n_stands, dtype="int64"),
+        np.arange(n_stands, dtype="int64"),
+    )
+    if growth_curves is None:
+        return unique_curves
+    curve_index = growth_curves[0].to_numpy()
+    growth_curve_id = growth_curves[1].to_numpy()
+    representative = curve_index[growth_curve_id][row_idx]
+    if not (row_code == row_code[start[representative] + position]).all():
+        return unique_curves
+    return curve_index, growth_curve_id
 
 
 def prepare_spinup_growth_info(
@@ -233,6 +334,12 @@ def prepare_spinup_growth_info(
 ) -> dict[str, np.ndarray]:
     """Pre-compute all growth C flow operations for spinup.
 
+    Stands with identical increments, sw_hw and turnover parameters share a
+    single growth curve, so the C flows are computed and stored once per
+    unique curve rather than once per stand. The spinup variables are not
+    modified: the curve of each stand is returned in the
+    "stand_growth_curve_id" entry of the result.
+
     Args:
         spinup_vars (ModelVariables): collection of CBM parameters, simulation
             and state variables
@@ -243,42 +350,59 @@ def prepare_spinup_growth_info(
         ValueError: specified increment table was not formatted correctly.
 
     Returns:
-        dict[str, np.ndarray]: a dictionary of labelled pool C flows
+        dict[str, np.ndarray]: a dictionary of labelled pool C flows, for
+            each growth_curve_id and age, and the growth_curve_id of each
+            stand as "stand_growth_curve_id"
     """
 
     sw_hw = spinup_vars["parameters"]["sw_hw"].to_numpy()
 
     spatial_unit_id = spinup_vars["parameters"]["spatial_unit_id"].to_numpy()
-    spinup_incremements = spinup_vars["increments"].to_pandas()
+    spinup_incremements = (
+        spinup_vars["increments"]
+        .to_pandas()
+        .fillna({"merch_inc": 0, "foliage_inc": 0, "other_inc": 0})
+        .sort_values(["row_idx", "age"], kind="stable")
+    )
     unique_ages = spinup_incremements["age"].drop_duplicates().sort_values()
     if not unique_ages.diff().iloc[1:].eq(1).all():
         raise ValueError("expected a sequential set of ages")
     if unique_ages.iloc[0] != 1:
         raise ValueError("expected a minimum age of 1")
 
-    merch_inc = (
-        spinup_incremements.pivot(
-            index="row_idx", columns="age", values="merch_inc"
-        )
-        .fillna(0)
-        .to_numpy()
+    turnover_splits = _get_turnover_splits(
+        spatial_unit_id, sw_hw, turnover_parameters
     )
-
-    foliage_inc = (
-        spinup_incremements.pivot(
-            index="row_idx", columns="age", values="foliage_inc"
-        )
-        .fillna(0)
-        .to_numpy()
+    curve_index, stand_growth_curve_id = _get_growth_curves(
+        spinup_incremements, sw_hw.shape[0], sw_hw, turnover_splits
     )
-    other_inc = (
-        spinup_incremements.pivot(
-            index="row_idx", columns="age", values="other_inc"
-        )
-        .fillna(0)
-        .to_numpy()
+    sw_hw = sw_hw[curve_index]
+    turnover_splits = {k: v[curve_index] for k, v in turnover_splits.items()}
+
+    # pivot the increments of the representative stand of each curve only
+    is_representative = np.zeros(stand_growth_curve_id.shape[0], dtype=bool)
+    is_representative[curve_index] = True
+    row_idx = spinup_incremements["row_idx"].to_numpy()
+    curve_increments = spinup_incremements[is_representative[row_idx]].assign(
+        growth_curve_id=lambda df: stand_growth_curve_id[
+            df["row_idx"].to_numpy()
+        ]
     )
 
+    def pivot(name: str) -> np.ndarray:
+        return (
+            curve_increments.pivot(
+                index="growth_curve_id", columns="age", values=name
+            )
+            .reindex(columns=unique_ages)
+            .fillna(0)
+            .to_numpy()
+        )
+
+    merch_inc = pivot("merch_inc")
+    foliage_inc = pivot("foliage_inc")
+    other_inc = pivot("other_inc")
+
     # add one additional column for each for the "null" increments,
     # used when the simulation age exceed the max age in the data
     merch_inc = np.column_stack([merch_inc, np.zeros(merch_inc.shape[0])])
@@ -303,9 +427,8 @@ def prepare_spinup_growth_info(
     coarse_root_inc = np.zeros_like(merch_inc)
     fine_root = np.zeros_like(merch)
     fine_root_inc = np.zeros_like(merch_inc)
-    overmature_decline = {}
-
-    for col_idx, age in enumerate(unique_ages):
+    # the root increments depend on the root pools of the previous age
+    for col_idx in range(len(unique_ages)):
         root_inc = _compute_root_inc(
             sw_hw,
             merch[:, col_idx],
@@ -320,27 +443,6 @@ def prepare_spinup_growth_info(
         )
         coarse_root_inc[:, col_idx] = root_inc["coarse_root_inc"]
         fine_root_inc[:, col_idx] = root_inc["fine_root_inc"]
-        col_overmature_decline = _compute_overmature_decline(
-            spatial_unit_id,
-            sw_hw,
-            merch[:, col_idx],
-            foliage[:, col_idx],
-            other[:, col_idx],
-            coarse_root[:, col_idx],
-            fine_root[:, col_idx],
-            merch_inc[:, col_idx],
-            foliage_inc[:, col_idx],
-            other_inc[:, col_idx],
-            coarse_root_inc[:, col_idx],
-            fine_root_inc[:, col_idx],
-            turnover_parameters,
-        )
-        if not overmature_decline:
-            for k, v in col_overmature_decline.items():
-                overmature_decline[k] = np.zeros_like(merch_inc)
-
-        for k, v in col_overmature_decline.items():
-            overmature_decline[k][:, col_idx] = col_overmature_decline[k]
         coarse_root[:, col_idx + 1] = (
             coarse_root[:, col_idx] + root_inc["coarse_root_inc"]
         )
@@ -348,14 +450,27 @@ def prepare_spinup_growth_info(
             fine_root[:, col_idx] + root_inc["fine_root_inc"]
         )
 
+    overmature_decline = _compute_overmature_decline(
+        turnover_splits,
+        merch[:, :-1],
+        foliage[:, :-1],
+        other[:, :-1],
+        coarse_root[:, :-1],
+        fine_root[:, :-1],
+        merch_inc,
+        foliage_inc,
+        other_inc,
+        coarse_root_inc,
+        fine_root_inc,
+    )
+
     n_rows = merch_inc.shape[0]
     n_cols = merch_inc.shape[1]
     data = {
-        "row_idx": np.tile(
-            np.arange(0, n_rows, dtype="int64").reshape(n_rows, 1),
-            [1, n_cols],
-        ).flatten(),
-        "age": np.tile(np.arange(0, n_cols), [1, n_rows]).flatten(),
+        "growth_curve_id": np.repeat(
+            np.arange(0, n_rows, dtype="int64"), n_cols
+        ),
+        "age": np.tile(np.arange(0, n_cols), n_rows),
         "merch_inc": merch_inc.flatten(),
         "other_inc": other_inc.flatten(),
         "foliage_inc": foliage_inc.flatten(),
@@ -368,6 +483,7 @@ def prepare_spinup_growth_info(
         }
     )
     data.update({k: v.flatten() for k, v in overmature_decline.items()})
+    data["stand_growth_curve_id"] = stand_growth_curve_id
 
     return data
 
@@ -421,8 +537,7 @@ def prepare_growth_info(
         root_parameters,
     )
     overmature_decline = _compute_overmature_decline(
-        spatial_unit_id,
-        sw_hw,
+        _get_turnover_splits(spatial_unit_id, sw_hw, turnover_parameters),
         merch,
         foliage,
         other,
@@ -433,7 +548,6 @@ def prepare_growth_info(
         other_inc,
         root_inc["coarse_root_inc"],
         root_inc["fine_root_inc"],
-        turnover_parameters,
     )
 
     data = {
@@ -5,6 +5,7 @@ import copy
 import os
 import json
 import pandas as pd
+from libcbm.model.cbm_exn import cbm_exn_disturbance_dynamics
 
 
 CBMEXN_PARAMETERS_DATA = {
@@ -41,6 +42,9 @@ class CBMEXNParameters:
     _decay_param_dict: dict[str, dict[str, float]] = field(
         init=False, repr=False
     )
+    _disturbance_op_data: dict[bool, pd.DataFrame] = field(
+        init=False, repr=False, default_factory=dict
+    )
 
     def __post_init__(self):
 
@@ -195,6 +199,34 @@ class CBMEXNParameters:
         """
         return self.disturbance_matrix_association
 
+    def get_disturbance_op_data(self, spinup_format: bool) -> pd.DataFrame:
+        """
+        Gets the formatted disturbance matrix operation table (see
+        :py:func:`libcbm.model.cbm_exn.cbm_exn_disturbance_dynamics.disturbance`)
+        for these parameters.  Since the disturbance matrices do not vary
+        over the course of a simulation the table is built once per format
+        and cached.  The returned dataframe is shared and must not be
+        modified.
+
+        Args:
+            spinup_format (bool): set to true if the result is being used
+                for spinup and false for stepping.
+
+        Returns:
+            pd.DataFrame: formatted dataframe containing indexed disturbance
+                matrices on each row
+        """
+        if spinup_format not in self._disturbance_op_data:
+            self._disturbance_op_data[spinup_format] = (
+                cbm_exn_disturbance_dynamics.disturbance(
+                    self.pool_configuration(),
+                    self.get_disturbance_matrices(),
+                    self.get_disturbance_matrix_associations(),
+                    spinup_format,
+                )
+            )
+        return self._disturbance_op_data[spinup_format]
+
 
 def _load_data_item(dir: str, item_name: str) -> Union[pd.DataFrame, list]:
     item_type = CBMEXN_PARAMETERS_DATA[item_name]["type"]
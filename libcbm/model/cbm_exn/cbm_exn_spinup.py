@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Callable
 from typing import TYPE_CHECKING
 from typing import Union
+import numpy as np
 
 if TYPE_CHECKING:
     from libcbm.model.cbm_exn.cbm_exn_model import CBMEXNModel
@@ -10,8 +11,11 @@ from libcbm.model.model_definition.model_variables import ModelVariables
 from libcbm.model.cbm_exn import cbm_exn_variables
 from libcbm.model.cbm_exn import cbm_exn_land_state
 from libcbm.model.cbm_exn import cbm_exn_annual_process_dynamics
-from libcbm.model.cbm_exn import cbm_exn_disturbance_dynamics
 from libcbm.model.cbm_exn import cbm_exn_growth_functions
+from libcbm.model.model_definition import spinup_engine
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.storage.series import Series
 from libcbm.storage.backends import BackendType
 
 
@@ -60,6 +64,23 @@ def prepare_spinup_vars(
     return ModelVariables(data)
 
 
+def _set_growth_curve_id(
+    spinup_vars: ModelVariables, growth_curve_id: np.ndarray
+) -> None:
+    """store the growth curve of each stand in the spinup state, which
+    indexes the spinup growth and overmature decline matrices
+    """
+    state = spinup_vars["state"]
+    growth_curve_id_series = dataframe.convert_series_backend(
+        series.from_numpy("growth_curve_id", growth_curve_id),
+        state.backend_type,
+    )
+    if "growth_curve_id" in state.columns:
+        state["growth_curve_id"].assign(growth_curve_id_series)
+    else:
+        state.add_column(growth_curve_id_series, len(state.columns))
+
+
 def get_default_ops(
     parameters: CBMEXNParameters, spinup_vars: ModelVariables
 ) -> list[dict]:
@@ -68,6 +89,7 @@ def get_default_ops(
         parameters.get_turnover_parameters(),
         parameters.get_root_parameters(),
     )
+    _set_growth_curve_id(spinup_vars, growth_info["stand_growth_curve_id"])
     net_growth = cbm_exn_annual_process_dynamics.net_growth(
         growth_info,
     )
@@ -125,12 +147,7 @@ def get_default_ops(
         {
             "name": "disturbance",
             "op_process_name": "Disturbance",
-            "op_data": cbm_exn_disturbance_dynamics.disturbance(
-                parameters.pool_configuration(),
-                parameters.get_disturbance_matrices(),
-                parameters.get_disturbance_matrix_associations(),
-                True,
-            ),
+            "op_data": parameters.get_disturbance_op_data(True),
             "requires_reindexing": True,
         },
         {
@@ -174,6 +191,11 @@ def spinup(
 ) -> ModelVariables:
     """Run the CBM spinup routine.
 
+    If neither reporting_func nor ops are specified, spinup is run once for
+    each group of rows with identical parameters, initial state and growth
+    increments, and the resulting pools and state are assigned to every
+    member of the group.
+
     Args:
         model (CBMEXNModel): Initialized cbm_exn model.
         spinup_vars (ModelVariables): Spinup vars, as returned by
@@ -191,6 +213,36 @@ def spinup(
     """
 
     spinup_vars = spinup_vars.convert_backend(BackendType.numpy)
+    spinup_groups = None
+    if reporting_func is None and ops is None:
+        spinup_groups = _get_spinup_groups(spinup_vars)
+    if spinup_groups is None:
+        spinup_vars = _run_spinup(
+            model, spinup_vars, reporting_func, ops, op_sequence
+        )
+    else:
+        representative_index, group_index = spinup_groups
+        representative_vars = _run_spinup(
+            model,
+            _take_spinup_vars(spinup_vars, representative_index),
+            None,
+            None,
+            op_sequence,
+        )
+        for name, data in representative_vars.get_collection().items():
+            if name not in ["parameters", "increments"]:
+                spinup_vars[name] = data.take(group_index)
+
+    return cbm_exn_land_state.init_cbm_vars(model, spinup_vars)
+
+
+def _run_spinup(
+    model: "CBMEXNModel",
+    spinup_vars: ModelVariables,
+    reporting_func: Union[Callable[[int, ModelVariables], None], None],
+    ops: Union[list[dict], None],
+    op_sequence: Union[list[str], None],
+) -> ModelVariables:
     if ops is None:
         ops = get_default_ops(model.parameters, spinup_vars)
     for op_def in ops:
@@ -214,4 +266,63 @@ def spinup(
             reporting_func(t, spinup_vars)
         t += 1
 
-    return cbm_exn_land_state.init_cbm_vars(model, spinup_vars)
+    return spinup_vars
+
+
+def _get_spinup_groups(
+    spinup_vars: ModelVariables,
+) -> Union[tuple[Series, Series], None]:
+    """Group the rows of the spinup variables which have identical
+    parameters, initial state and growth increments.
+    """
+    n_rows = spinup_vars["parameters"].n_rows
+    increments = (
+        spinup_vars["increments"]
+        .to_pandas()
+        .pivot(
+            index="row_idx",
+            columns="age",
+            values=["merch_inc", "foliage_inc", "other_inc"],
+        )
+    )
+    if not np.array_equal(increments.index.to_numpy(), np.arange(n_rows)):
+        return None
+    increment_signature = dataframe.from_numpy(
+        {
+            f"{inc}_{age}": increments[(inc, age)].to_numpy()
+            for inc, age in increments.columns
+        }
+    )
+    return spinup_engine.get_spinup_groups(
+        [
+            spinup_vars["parameters"],
+            spinup_vars["state"],
+            spinup_vars["pools"],
+            increment_signature,
+        ],
+        exclude_columns=["area"],
+    )
+
+
+def _take_spinup_vars(
+    spinup_vars: ModelVariables, indices: Series
+) -> ModelVariables:
+    """gather the rows at the specified indices of the spinup variables,
+    including the associated growth increments, into a new instance
+    """
+    data = {
+        name: value.take(indices)
+        for name, value in spinup_vars.get_collection().items()
+        if name != "increments"
+    }
+    increments = spinup_vars["increments"].to_pandas()
+    row_idx_map = np.full(spinup_vars["parameters"].n_rows, -1)
+    row_idx_map[indices.to_numpy()] = np.arange(indices.length)
+    new_row_idx = row_idx_map[increments["row_idx"].to_numpy()]
+    increments = increments[new_row_idx >= 0].reset_index(drop=True)
+    increments["row_idx"] = new_row_idx[new_row_idx >= 0]
+    data["increments"] = dataframe.convert_dataframe_backend(
+        dataframe.from_pandas(increments),
+        spinup_vars["increments"].backend_type,
+    )
+    return ModelVariables(data)
@@ -7,7 +7,6 @@ from libcbm.model.cbm_exn.cbm_exn_parameters import CBMEXNParameters
 from libcbm.model.model_definition.model_variables import ModelVariables
 from libcbm.model.cbm_exn import cbm_exn_land_state
 from libcbm.model.cbm_exn import cbm_exn_annual_process_dynamics
-from libcbm.model.cbm_exn import cbm_exn_disturbance_dynamics
 from libcbm.model.cbm_exn import cbm_exn_growth_functions
 from libcbm.storage.backends import BackendType
 
@@ -25,12 +24,7 @@ def get_default_ops(
             {
                 "name": "disturbance",
                 "op_process_name": "Disturbance",
-                "op_data": cbm_exn_disturbance_dynamics.disturbance(
-                    parameters.pool_configuration(),
-                    parameters.get_disturbance_matrices(),
-                    parameters.get_disturbance_matrix_associations(),
-                    False,
-                ),
+                "op_data": parameters.get_disturbance_op_data(False),
                 "requires_reindexing": True,
             }
         )
@@ -1,93 +1,130 @@
-from typing import Callable
 from typing import Union
 import numpy as np
 import numba
-import numba.typed
 from libcbm.model.model_definition.model_variables import ModelVariables
 
-
-@numba.njit(inline="always")
-def k1(i, m):
-    return (m[0][i],)
-
-
-@numba.njit(inline="always")
-def k2(i, m):
-    return (m[0][i], m[1][i])
-
-
-@numba.njit(inline="always")
-def k3(i, m):
-    return (m[0][i], m[1][i], m[2][i])
-
-
-@numba.njit(inline="always")
-def k4(i, m):
-    return (m[0][i], m[1][i], m[2][i], m[3][i])
-
-
-@numba.njit(inline="always")
-def k5(i, m):
-    return (m[0][i], m[1][i], m[2][i], m[3][i], m[4][i])
+_HASH_SEED = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_EMPTY_SLOT = -1
 
 
 @numba.njit(inline="always")
-def k6(i, m):
-    return (m[0][i], m[1][i], m[2][i], m[3][i], m[4][i], m[5][i])
+def _hash_row(keys: np.ndarray, i: int) -> np.uint64:
+    """combine the values in row i of the 2d key array into a single 64 bit
+    hash (splitmix64 finalized boost-style hash combine)"""
+    h = _HASH_SEED
+    for j in range(keys.shape[1]):
+        v = np.uint64(keys[i, j])
+        h ^= v + _HASH_SEED + (h << np.uint64(6)) + (h >> np.uint64(2))
+    h ^= h >> np.uint64(30)
+    h *= _MIX_1
+    h ^= h >> np.uint64(27)
+    h *= _MIX_2
+    h ^= h >> np.uint64(31)
+    return h
 
 
 @numba.njit(inline="always")
-def k7(i, m):
-    return (m[0][i], m[1][i], m[2][i], m[3][i], m[4][i], m[5][i], m[6][i])
+def _rows_equal(a: np.ndarray, i: int, b: np.ndarray, j: int) -> bool:
+    for k in range(a.shape[1]):
+        if a[i, k] != b[j, k]:
+            return False
+    return True
 
 
-@numba.njit(inline="always")
-def k8(i, m):
-    return (
-        m[0][i],
-        m[1][i],
-        m[2][i],
-        m[3][i],
-        m[4][i],
-        m[5][i],
-        m[6][i],
-        m[7][i],
-    )
-
-
-KEY_FUNC_MAP = {1: k1, 2: k2, 3: k3, 4: k4, 5: k5, 6: k6, 7: k7, 8: k8}
-
-
-def get_key_func(size: int) -> Callable:
-    return KEY_FUNC_MAP[size]
+@numba.njit()
+def _build_table(keys: np.ndarray, capacity: int) -> np.ndarray:
+    """Build an open addressing hash table of row indices into the 2d keys
+    array.  capacity must be a power of 2 larger than the number of rows.
+    Where keys are duplicated, the last row index is stored.
+    """
+    mask = np.uint64(capacity - 1)
+    slots = np.full(capacity, _EMPTY_SLOT, dtype=np.int64)
+    for i in range(keys.shape[0]):
+        pos = np.int64(_hash_row(keys, i) & mask)
+        while True:
+            slot = slots[pos]
+            if slot == _EMPTY_SLOT or _rows_equal(keys, slot, keys, i):
+                slots[pos] = i
+                break
+            pos = (pos + 1) & (capacity - 1)
+    return slots
 
 
 @numba.njit()
-def merge(
-    k_func,
-    out,
-    merge_dict: numba.typed.Dict,  # type: ignore
-    len_merge_arrays: int,
+def _lookup(
+    keys: np.ndarray,
+    slots: np.ndarray,
+    merge_keys: np.ndarray,
+    out: np.ndarray,
     fill: int,
     error_on_missing: bool,
-    *merge_arrays,
-):
-    for i in range(len_merge_arrays):
-        k = k_func(i, merge_arrays)
-        if k in merge_dict:
-            out[i] = merge_dict[k]
-        else:
+) -> int:
+    """Find the row index of each row of merge_keys within the hash table,
+    assigning the result to out.  Returns the first row index of merge_keys
+    not found if error_on_missing is True, otherwise -1.
+    """
+    capacity = slots.shape[0]
+    mask = np.uint64(capacity - 1)
+    for i in range(merge_keys.shape[0]):
+        pos = np.int64(_hash_row(merge_keys, i) & mask)
+        found = _EMPTY_SLOT
+        while True:
+            slot = slots[pos]
+            if slot == _EMPTY_SLOT:
+                break
+            if _rows_equal(keys, slot, merge_keys, i):
+                found = slot
+                break
+            pos = (pos + 1) & (capacity - 1)
+        if found == _EMPTY_SLOT:
             if error_on_missing:
                 return i
             out[i] = fill
+        else:
+            out[i] = found
     return -1
 
 
+def _to_int64_keys(name: str, values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind in "iub":
+        return values.astype("int64", copy=False)
+    try:
+        with np.errstate(invalid="ignore"):
+            converted = values.astype("int64")
+    except (ValueError, TypeError):
+        converted = None
+    if converted is not None:
+        mismatch = converted != values
+        if not mismatch.any():
+            return converted
+        invalid_value = values[np.argmax(mismatch)]
+    else:
+        invalid_value = values[0]
+    raise ValueError(
+        f"only integer keys supported. Found: {invalid_value} in {name} series"
+    )
+
+
+def _pack_keys(names: list[str], data: dict[str, np.ndarray]) -> np.ndarray:
+    """pack the named columns of integer key data into a C-contiguous
+    (rows, keys) int64 array"""
+    return np.ascontiguousarray(
+        np.column_stack([_to_int64_keys(k, data[k]) for k in names]),
+        dtype="int64",
+    )
+
+
 class MatrixMergeIndex:
     """
     Creates and stores an index for indexed matrices. This is used to
     efficiently merge the matrix information to each simulation area during
     runtime.
+
+    The integer key columns are packed into a single 2d array and indexed by
+    a compiled open addressing hash table keyed on a combined 64 bit hash of
+    each row, so any number of key columns is supported.
     """
 
     def __init__(
@@ -96,6 +133,7 @@ class MatrixMergeIndex:
         """Intialize a MatrixMergeIndex
 
         Args:
+            nrows (int): the number of indexed matrices
             key_data (dict[str, np.ndarray]): the key data for each matrix
 
         Raises:
@@ -105,36 +143,23 @@ class MatrixMergeIndex:
         if key_data:
             self._merge_keys = list(key_data.keys())
             self._key_data = key_data
-            # assumption here is that all members of key_data are of equal
-            # length
-            for i_v, v in enumerate(key_data.values()):
+            for v in key_data.values():
                 if v.ndim > 1:
                     raise ValueError("expected single dimensional key values")
 
                 if self._len_key_data != v.shape[0]:
                     raise ValueError("lengths of key data array non-uniform")
 
-            key_index_type = numba.types.UniTuple(
-                numba.types.int64, len(self._merge_keys)
-            )
-            self._merge_dict = numba.typed.Dict.empty(
-                key_type=key_index_type, value_type=numba.types.types.uint64
+            self._keys = _pack_keys(self._merge_keys, key_data)
+            capacity = 1 << max(
+                int(2 * self._len_key_data - 1).bit_length(), 1
             )
-            for i in range(self._len_key_data):
-                tuple_values = []
-                for k in self._merge_keys:
-                    key_val = int(key_data[k][i])
-                    if key_val != key_data[k][i]:
-                        raise ValueError(
-                            "only integer keys supported. Found: "
-                            f"{key_data[k][i]} in {k} series"
-                        )
-                    tuple_values.append(key_val)
-                self._merge_dict[tuple(tuple_values)] = np.uint64(i)
+            self._slots = _build_table(self._keys, capacity)
         else:
             self._merge_keys = []
             self._key_data = {}
-            self._merge_dict = {}
+            self._keys = np.empty((0, 0), dtype="int64")
+            self._slots = np.empty(0, dtype="int64")
 
     @property
     def has_keys(self) -> bool:
@@ -169,17 +194,72 @@ class MatrixMergeIndex:
                     "of length 1."
                 )
         else:
-            merge_data = {}
-            for idx_name in self.merge_keys:
-                if idx_name == "row_idx":
-                    merge_data["row_idx"] = np.arange(0, n_rows, dtype="int64")
-                else:
-                    s = idx_name.split(".")
-                    merge_data[idx_name] = (
-                        model_variables[s[0]][s[1]].to_numpy().astype("int64")
-                    )
-
-            return self.merge(merge_data, default_matrix_index)
+            return self.merge(
+                self.get_merge_data(model_variables), default_matrix_index
+            )
+
+    def get_merge_data(
+        self, model_variables: ModelVariables
+    ) -> dict[str, np.ndarray]:
+        """Get a copy of the current values of the merge key columns in the
+        specified model variables.
+
+        Args:
+            model_variables (ModelVariables): the current model state
+
+        Returns:
+            dict[str, np.ndarray]: int64 key values for each merge key
+        """
+        n_rows = model_variables["pools"].n_rows
+        merge_data = {}
+        for idx_name in self._merge_keys:
+            if idx_name == "row_idx":
+                merge_data["row_idx"] = np.arange(0, n_rows, dtype="int64")
+            else:
+                s = idx_name.split(".")
+                merge_data[idx_name] = (
+                    model_variables[s[0]][s[1]].to_numpy().astype("int64")
+                )
+        return merge_data
+
+    def update_merge(
+        self,
+        merge_data: dict[str, np.ndarray],
+        previous_merge_data: dict[str, np.ndarray],
+        previous_result: np.ndarray,
+        fill_value: Union[int, None] = None,
+    ) -> Union[np.ndarray, None]:
+        """Merge only the rows of merge_data whose keys differ from
+        previous_merge_data, starting from the previous result of
+        :py:meth:`merge`.
+
+        Args:
+            merge_data (dict[str, np.ndarray]): the current merge data
+            previous_merge_data (dict[str, np.ndarray]): the merge data
+                that produced previous_result. Must be of the same length
+                as merge_data.
+            previous_result (np.ndarray): the result of merging
+                previous_merge_data. It is not modified.
+            fill_value (Union[int, None], optional): See :py:meth:`merge`.
+                Defaults to None.
+
+        Returns:
+            Union[np.ndarray, None]: the index of each matched key for each
+                element in merge_data, or None if no key has changed, in
+                which case previous_result is still valid.
+        """
+        changed = None
+        for k, v in merge_data.items():
+            key_changed = v != previous_merge_data[k]
+            changed = key_changed if changed is None else changed | key_changed
+        changed_idx = np.flatnonzero(changed)
+        if changed_idx.shape[0] == 0:
+            return None
+        result = previous_result.copy()
+        result[changed_idx] = self.merge(
+            {k: v[changed_idx] for k, v in merge_data.items()}, fill_value
+        )
+        return result
 
     def merge(
         self,
@@ -214,16 +294,20 @@ class MatrixMergeIndex:
                     f"key indexes (0,{self._len_key_data-1}). "
                     f"got: {fill_value}"
                 )
-        len_merge_arrays = len((next(iter(merge_data.values()))))
-        out = np.empty(len_merge_arrays, dtype="int64")
-        err_idx = merge(
-            get_key_func(len(self._merge_keys)),
+        if len(merge_data) != len(self._merge_keys):
+            raise ValueError(
+                f"expected {len(self._merge_keys)} merge arrays, got "
+                f"{len(merge_data)}"
+            )
+        merge_keys = _pack_keys(list(merge_data.keys()), merge_data)
+        out = np.empty(merge_keys.shape[0], dtype="int64")
+        err_idx = _lookup(
+            self._keys,
+            self._slots,
+            merge_keys,
             out,
-            self._merge_dict,
-            len_merge_arrays,
             fill_value if fill_value is not None else -1,
             fill_value is None,
-            *list(merge_data.values()),
         )
         if err_idx >= 0:
             values_not_found = {k: v[err_idx] for k, v in merge_data.items()}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import json
 import numpy as np
+import pandas as pd
 from typing import Iterator
 from contextlib import contextmanager
 from libcbm.wrapper import libcbm_operation
@@ -70,7 +71,7 @@ class ModelHandle:
 
     def create_operation(
         self,
-        matrices: list,
+        matrices: list | pd.DataFrame,
         fmt: str,
         process_id: int,
         matrix_index: np.ndarray,
@@ -116,9 +117,14 @@ class ModelHandle:
                     ...
                 ]
 
+            The `matrix_list` matrices may alternatively be specified as a
+            single long form pd.DataFrame with columns `matrix_idx`,
+            `source`, `sink` and `value`, where `matrix_idx` is the 0 based
+            index of the matrix to which each row belongs.
+
         Args:
-            matrices (list): a list of matrix values.  The required format is
-                dependant on the `fmt` parameter.
+            matrices (list | pd.DataFrame): a list of matrix values.  The
+                required format is dependant on the `fmt` parameter.
             fmt (str): matrix value format.  Can be either of:
                 "repeating_coordinates" or "matrix_list"
             process_id (int): flux tracking category id.  Fluxes associated
@@ -138,29 +144,123 @@ class ModelHandle:
             libcbm_operation.Operation: initialized Operation object
         """
         if fmt == "repeating_coordinates":
-            pool_id_mat = [
-                [self.pools[row[0]], self.pools[row[1]], row[2]]
-                for row in matrices
-            ]
             return self._matrix_rc(
-                pool_id_mat, process_id, matrix_index, init_value
+                self._get_pool_id_matrices(matrices, fmt),
+                process_id,
+                matrix_index,
+                init_value,
             )
         elif fmt == "matrix_list":
-            mat_list = []
-            for mat in matrices:
-                mat_len = len(mat)
-                np_mat = np.zeros(shape=(mat_len, 3))
-                for i_entry, entry in enumerate(mat):
-                    np_mat[i_entry, 0] = self.pools[entry[0]]
-                    np_mat[i_entry, 1] = self.pools[entry[1]]
-                    np_mat[i_entry, 2] = entry[2]
-                mat_list.append(np_mat)
             return self._matrix_list(
-                mat_list, process_id, matrix_index, init_value
+                self._get_pool_id_matrices(matrices, fmt),
+                process_id,
+                matrix_index,
+                init_value,
             )
         else:
             raise ValueError("unknown format")
 
+    def _get_pool_id_matrices(
+        self, matrices: list | pd.DataFrame, fmt: str
+    ) -> list:
+        """convert the pool names in the specified matrices to pool ids"""
+        if fmt == "repeating_coordinates":
+            return [
+                [self.pools[row[0]], self.pools[row[1]], row[2]]
+                for row in matrices
+            ]
+        if isinstance(matrices, pd.DataFrame):
+            return self._get_matrix_list(matrices)
+        long_form = pd.DataFrame(
+            [entry for mat in matrices for entry in mat],
+            columns=["source", "sink", "value"],
+        )
+        long_form.insert(
+            0,
+            "matrix_idx",
+            np.repeat(
+                np.arange(len(matrices), dtype="int64"),
+                [len(mat) for mat in matrices],
+            ),
+        )
+        return self._get_matrix_list(long_form, len(matrices))
+
+    def _get_pool_ids(self, pool_names: np.ndarray) -> np.ndarray:
+        pool_index = pd.Index(list(self.pools.keys()))
+        positions = pool_index.get_indexer(pool_names)
+        if (positions < 0).any():
+            raise KeyError(pool_names[np.argmax(positions < 0)])
+        return np.array(list(self.pools.values()))[positions]
+
+    def _get_matrix_list(
+        self, long_form: pd.DataFrame, n_matrices: int | None = None
+    ) -> list[np.ndarray]:
+        """build the coordinate format matrices from a long form dataframe
+        into a single buffer, returning a view of the rows of each matrix
+        """
+        matrix_idx = long_form["matrix_idx"].to_numpy().astype("int64")
+        if n_matrices is None:
+            n_matrices = int(matrix_idx.max()) + 1 if len(matrix_idx) else 0
+        order = None
+        if (matrix_idx[1:] < matrix_idx[:-1]).any():
+            order = np.argsort(matrix_idx, kind="stable")
+
+        def ordered(col: str) -> np.ndarray:
+            values = long_form[col].to_numpy()
+            return values if order is None else values[order]
+
+        buffer = np.empty(shape=(len(matrix_idx), 3))
+        buffer[:, 0] = self._get_pool_ids(ordered("source"))
+        buffer[:, 1] = self._get_pool_ids(ordered("sink"))
+        buffer[:, 2] = ordered("value")
+        offsets = np.zeros(n_matrices + 1, dtype="int64")
+        np.cumsum(
+            np.bincount(matrix_idx, minlength=n_matrices), out=offsets[1:]
+        )
+        return [
+            buffer[offsets[i] : offsets[i + 1]] for i in range(n_matrices)
+        ]
+
+    def update_operation(
+        self,
+        operation: libcbm_operation.Operation,
+        matrices: list | pd.DataFrame,
+        fmt: str,
+        matrix_index: np.ndarray,
+    ) -> None:
+        """Assign new matrices and a new matrix index to an Operation
+        previously returned by :py:meth:`create_operation`. See
+        :py:meth:`libcbm.wrapper.libcbm_operation.Operation.update`
+
+        Args:
+            operation (libcbm_operation.Operation): the operation to update
+            matrices (list): a list of matrix values. See
+                :py:meth:`create_operation`
+            fmt (str): matrix value format. Must match the format the
+                operation was created with.
+            matrix_index (np.ndarray): the index of the matrix applied to
+                each stand
+
+        Raises:
+            ValueError: an unknown value for `fmt` was specified, or it does
+                not match the format of the operation
+        """
+        expected_format = {
+            "repeating_coordinates": (
+                libcbm_operation.OperationFormat.RepeatingCoordinates
+            ),
+            "matrix_list": libcbm_operation.OperationFormat.MatrixList,
+        }.get(fmt)
+        if expected_format is None:
+            raise ValueError("unknown format")
+        if operation.format != expected_format:
+            raise ValueError(
+                f"format '{fmt}' does not match the operation format"
+            )
+        operation.update(
+            self._get_pool_id_matrices(matrices, fmt), matrix_index
+        )
+
     def compute(
         self,
         pools: DataFrame,
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from typing import Union
 from libcbm.model.model_definition.model_handle import ModelHandle
@@ -116,9 +117,12 @@ class OperationWrapper:
         self._name = name
         self._model_handle = model_handle
         self._op_process_id = op_process_id
+        self._source_data = operation_data
         self._operation_data = prepare_operation_dataframe(
             operation_data, pool_names
         )
+        # the pool source sink columns of the operation data
+        self._value_columns = list(self._operation_data.columns)
         self._index_len = len(self._operation_data.index)
         self._non_indexed = False
         self._op_index = init_index(self._operation_data)
@@ -126,51 +130,169 @@ class OperationWrapper:
         self._init_value = init_value
         self._default_matrix_index = default_matrix_index
         self._op: Union[Operation, None] = None
+        self._op_n_rows: Union[int, None] = None
+        self._values_updated = False
+        # the merge key values and resulting matrix index of the last
+        # indexing, for incremental reindexing of keyed operations
+        self._merge_data: Union[dict[str, np.ndarray], None] = None
+        self._matrix_index: Union[np.ndarray, None] = None
+
+    def is_equivalent(
+        self,
+        op_process_id: int,
+        operation_data: pd.DataFrame,
+        requires_reindexing: bool,
+        init_value: int,
+        default_matrix_index: Union[int, None],
+    ) -> bool:
+        """returns True if this instance was constructed with the specified
+        operation_data object, and equal values for the other arguments,
+        meaning it can be re-used rather than reconstructed.
+        """
+        return (
+            operation_data is self._source_data
+            and op_process_id == self._op_process_id
+            and requires_reindexing == self._requires_reindexing
+            and init_value == self._init_value
+            and default_matrix_index == self._default_matrix_index
+        )
+
+    def update(
+        self,
+        op_process_id: int,
+        operation_data: pd.DataFrame,
+        requires_reindexing: bool,
+        init_value: int,
+        default_matrix_index: Union[int, None],
+    ) -> bool:
+        """Replace the matrix values of this instance with those in
+        operation_data, if it has the same columns and index key values as
+        the data this instance was constructed with, and equal values for
+        the other arguments. In this case the validation and index
+        preparation is skipped, and the existing operation is assigned the
+        new values on the next call to :py:meth:`get_operation`. The libcbm
+        operation itself is re-created with the new values, see
+        :py:meth:`libcbm.wrapper.libcbm_operation.Operation.update`.
+
+        Returns:
+            bool: True if this instance was updated, and False if it is
+                incompatible with the specified arguments, in which case it
+                is unmodified.
+        """
+        if (
+            op_process_id != self._op_process_id
+            or requires_reindexing != self._requires_reindexing
+            or init_value != self._init_value
+            or default_matrix_index != self._default_matrix_index
+            or len(operation_data.index) != self._index_len
+            or list(operation_data.columns) != list(self._source_data.columns)
+        ):
+            return False
+        index_cols = [
+            c for c in operation_data.columns if c.strip().startswith("[")
+        ]
+        for idx_col in index_cols:
+            if not np.array_equal(
+                operation_data[idx_col].to_numpy(),
+                self._source_data[idx_col].to_numpy(),
+            ):
+                return False
+        self._source_data = operation_data
+        # the value columns are read by name, so the index columns of the
+        # unprepared data do not need to be dropped
+        self._operation_data = operation_data
+        self._values_updated = True
+        return True
 
     def dispose(self):
         if self._op:
             self._op.dispose()
+            self._op = None
+        self._merge_data = None
+        self._matrix_index = None
+
+    def _compute_matrix_index(
+        self, model_variables: ModelVariables
+    ) -> Union[np.ndarray, None]:
+        """compute the matrix index for the current model state. If the
+        operation is keyed, only the rows whose keys changed since the last
+        call are merged, and None is returned if no keys changed.
+        """
+        if not self._op_index.has_keys:
+            self._matrix_index = self._op_index.compute_matrix_index(
+                model_variables, self._default_matrix_index
+            )
+            return self._matrix_index
+        merge_data = self._op_index.get_merge_data(model_variables)
+        if self._merge_data is None or self._matrix_index is None:
+            matrix_index = self._op_index.merge(
+                merge_data, self._default_matrix_index
+            )
+        else:
+            matrix_index = self._op_index.update_merge(
+                merge_data,
+                self._merge_data,
+                self._matrix_index,
+                self._default_matrix_index,
+            )
+            if matrix_index is None:
+                return None
+        self._merge_data = merge_data
+        self._matrix_index = matrix_index
+        return matrix_index
 
     def get_operation(self, model_variables: ModelVariables) -> Operation:
+        n_rows = model_variables["pools"].n_rows
+        if self._op is not None and self._op_n_rows != n_rows:
+            # the operation was allocated for a different number of rows
+            self.dispose()
+        if self._op is not None and self._values_updated:
+            self._compute_matrix_index(model_variables)
+            self._model_handle.update_operation(
+                self._op,
+                self._get_matrices(),
+                "repeating_coordinates",
+                self._matrix_index,
+            )
+            self._values_updated = False
+            return self._op
         if self._op is not None:
-            n_rows = model_variables["pools"].n_rows
             curr_idx_len = self._index_len
             must_index = curr_idx_len != 1 or curr_idx_len != n_rows
             if self._requires_reindexing:
-                matrix_index = self._op_index.compute_matrix_index(
-                    model_variables, self._default_matrix_index
-                )
-                self._op.update_index(matrix_index)
+                matrix_index = self._compute_matrix_index(model_variables)
+                if matrix_index is not None:
+                    self._op.update_index(matrix_index)
                 return self._op
             elif not must_index:
                 return self._op
             else:
-                self._op.dispose()
-                self._op = None
-
-        op_cols = list(self._operation_data.columns)
-        pool_src_sink_tuples: list[tuple] = [
-            tuple(x.split(".")) for x in self._operation_data.columns
-        ]
+                self.dispose()
 
-        matrices = [
-            [p[0], p[1], self._operation_data[op_cols[i]].to_numpy()]
-            for i, p in enumerate(pool_src_sink_tuples)
-        ]
-
-        matrix_index = self._op_index.compute_matrix_index(
-            model_variables, self._default_matrix_index
-        )
+        self._merge_data = None
+        self._matrix_index = None
+        matrix_index = self._compute_matrix_index(model_variables)
         self._op = self._model_handle.create_operation(
-            matrices,
+            self._get_matrices(),
             "repeating_coordinates",
             self._op_process_id,
             matrix_index,
             init_value=self._init_value,
         )
-
+        self._op_n_rows = n_rows
+        self._values_updated = False
         return self._op
 
+    def _get_matrices(self) -> list[list]:
+        op_cols = self._value_columns
+        pool_src_sink_tuples: list[tuple] = [
+            tuple(x.split(".")) for x in op_cols
+        ]
+        return [
+            [p[0], p[1], self._operation_data[op_cols[i]].to_numpy()]
+            for i, p in enumerate(pool_src_sink_tuples)
+        ]
+
 
 class ModelMatrixOps:
     """
@@ -211,7 +333,15 @@ class ModelMatrixOps:
 
         Args:
             name (str): The operations unique name. If an existing operation
-                is stored in this instance it will be overwritten.
+                is stored in this instance it will be overwritten, unless it
+                was created with the same op_data object and equal values
+                for the remaining arguments, in which case it is re-used.
+                For this reason op_data must not be modified in place
+                between calls. If op_data is a different object with the
+                same columns and index column values as the existing
+                operation's data, and the remaining arguments are equal,
+                the existing operation's validated data and merge index are
+                re-used, and only its matrix values are replaced.
             op_process_name (str): The op process name used to categorize
                 resulting C fluxes
             op_data (pd.DataFrame): the formatted dataframe containing indexed
@@ -230,14 +360,33 @@ class ModelMatrixOps:
                 If this value is not specified, such missing values will
                 instead result in an error being raised. Defaults to None.
         """
+        op_process_id = self._op_process_ids[op_process_name]
         if name in self._op_wrappers:
+            if self._op_wrappers[name].is_equivalent(
+                op_process_id,
+                op_data,
+                requires_reindexing,
+                init_value,
+                default_matrix_index,
+            ):
+                # the same op_data object was previously used to create this
+                # operation, so the existing prepared operation is kept
+                return
+            if self._op_wrappers[name].update(
+                op_process_id,
+                op_data,
+                requires_reindexing,
+                init_value,
+                default_matrix_index,
+            ):
+                return
             self._op_wrappers[name].dispose()
             del self._op_wrappers[name]
         self._op_wrappers[name] = OperationWrapper(
             name,
             self._model_handle,
             self._pool_names,
-            self._op_process_ids[op_process_name],
+            op_process_id,
             op_data,
             requires_reindexing,
             init_value,
@@ -1,8 +1,10 @@
 from __future__ import annotations
+import numpy as np
 from libcbm.model.model_definition.model_variables import ModelVariables
 from libcbm.storage import series
 from libcbm.storage import dataframe
 from libcbm.storage.dataframe import DataFrame
+from libcbm.storage.parquet_writer import ParquetResultWriter
 
 
 class ModelOutputProcessor:
@@ -68,3 +70,54 @@ class ModelOutputProcessor:
             dict[str, DataFrame]: collection of dataframes holding results.
         """
         return ModelVariables(self._results)
+
+
+class ParquetOutputProcessor:
+    """
+    Streams results by timestep to parquet files, so that memory use does
+    not grow with the number of timesteps. Each named dataframe in the
+    appended results is written to `<output_dir>/<name>.parquet` with one
+    row group per timestep, and with the same identifier and timestep
+    columns added by :py:class:`ModelOutputProcessor`.
+
+    The pyarrow package is required, see
+    :py:class:`libcbm.storage.parquet_writer.ParquetResultWriter`.
+
+    Args:
+        output_dir (str): directory in which the parquet files are written
+    """
+
+    def __init__(self, output_dir: str):
+        self._writer = ParquetResultWriter(output_dir)
+
+    def get_path(self, name: str) -> str:
+        """get the path of the parquet file for the named result"""
+        return self._writer.get_path(name)
+
+    def append_results(self, t: int, results: ModelVariables):
+        """Write results for the specified timestep
+
+        Args:
+            t (int): the timestep
+            results (ModelVariables): collection of cbm variables and state for
+                the timestep.
+        """
+        for name, df in results.get_collection().items():
+            self._writer.write(
+                name,
+                df,
+                {
+                    "identifier": np.arange(1, df.n_rows + 1, dtype="int64"),
+                    "timestep": np.full(df.n_rows, t, dtype="int32"),
+                },
+            )
+
+    def close(self) -> None:
+        """Finalize and close all parquet files"""
+        self._writer.close()
+
+    def __enter__(self) -> "ParquetOutputProcessor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -1,6 +1,10 @@
+from __future__ import annotations
 from enum import IntEnum
 import numpy as np
+import pandas as pd
+from libcbm.storage import series
 from libcbm.storage.series import Series
+from libcbm.storage.dataframe import DataFrame
 
 import numba
 
@@ -16,6 +20,51 @@ class SpinupState(IntEnum):
     End = 6
 
 
+def get_spinup_groups(
+    tables: list[DataFrame], exclude_columns: list[str] | None = None
+) -> tuple[Series, Series] | None:
+    """Group the rows of the specified tables which have identical values
+    across all columns. Rows in the same group have an identical spinup
+    signature, so spinup needs only to be run on a single representative
+    row of each group, and the result can be assigned to all members.
+
+    Args:
+        tables (list[DataFrame]): tables with equal numbers of rows which
+            together define the spinup signature of each row.
+        exclude_columns (list[str], optional): names of columns which do not
+            affect the spinup result, and which are excluded from the
+            signature. Defaults to None.
+
+    Returns:
+        tuple[Series, Series] | None: None if every row is unique, otherwise
+            a pair of series: the index of the first row in each group,
+            in ascending order, and the group index of each row.
+    """
+    exclude = set(exclude_columns) if exclude_columns else set()
+    n_rows = tables[0].n_rows
+    group = np.zeros(n_rows, dtype="int64")
+    for table in tables:
+        for col in table.columns:
+            if col in exclude:
+                continue
+            codes, uniques = pd.factorize(
+                table[col].to_numpy(), use_na_sentinel=False
+            )
+            # combine the existing group with this column's codes. The
+            # product is bounded by n_rows squared.
+            group, group_values = pd.factorize(group * len(uniques) + codes)
+            if len(group_values) == n_rows:
+                return None
+
+    # factorize assigns codes in order of first appearance, so the first
+    # index of each code is ascending
+    _, first_index = np.unique(group, return_index=True)
+    return (
+        series.from_numpy("representative_index", first_index),
+        series.from_numpy("group_index", group.astype("int64")),
+    )
+
+
 @numba.njit()
 def _small_slow_diff(
     last_rotation_slow: np.ndarray, this_rotation_slow: np.ndarray
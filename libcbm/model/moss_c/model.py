@@ -432,8 +432,38 @@ def spinup(
 ) -> Union[None, SpinupDebug]:
     if enable_debugging:
         spinup_debug = SpinupDebug()
-    else:
-        spinup_debug = None
+        _spinup(model_context, spinup_debug)
+        return spinup_debug
+
+    spinup_groups = spinup_engine.get_spinup_groups(
+        [
+            model_context.inventory,
+            model_context.parameters,
+            model_context.pools,
+            model_context.state,
+        ],
+        exclude_columns=["area"],
+    )
+    if spinup_groups is None:
+        _spinup(model_context, None)
+        return None
+
+    # run spinup on one representative stand for each group of stands with
+    # identical inputs, and assign the results to all group members
+    representative_index, group_index = spinup_groups
+    representative_context = model_context.take(representative_index)
+    _spinup(representative_context, None)
+    for df_name in ["pools", "state"]:
+        src: DataFrame = getattr(representative_context, df_name)
+        dest: DataFrame = getattr(model_context, df_name)
+        for col in src.columns:
+            dest[col].assign(src[col].take(group_index))
+    return None
+
+
+def _spinup(
+    model_context: ModelContext, spinup_debug: Union[None, SpinupDebug]
+) -> None:
     n_rows = model_context.inventory.n_rows
     spinup_vars: DataFrame = dataframe.from_series_list(
         [
@@ -488,15 +518,12 @@ def spinup(
             disturbance_before_annual_process=False,
             include_flux=False,
         )
-        if enable_debugging:
-
+        if spinup_debug is not None:
             spinup_debug.append_spinup_debug_record(
                 iteration, model_context, spinup_vars
             )
         iteration += 1
 
-    return spinup_debug
-
 
 def step(
     model_context: ModelContext,
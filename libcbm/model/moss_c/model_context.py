@@ -1,3 +1,4 @@
+import copy
 import json
 
 
@@ -9,6 +10,7 @@ from libcbm.wrapper.libcbm_wrapper import LibCBMWrapper
 from libcbm.wrapper.libcbm_handle import LibCBMHandle
 from libcbm import resources
 from libcbm.storage.dataframe import DataFrame
+from libcbm.storage.series import Series
 from libcbm.storage import dataframe
 from libcbm.storage import series
 from libcbm.storage.backends import BackendType
@@ -76,6 +78,20 @@ class ModelContext:
     def disturbance_matrices(self) -> DMData:
         return self._disturbance_matrices
 
+    def take(self, indices: Series) -> "ModelContext":
+        """Create a model context containing the stands at the specified
+        indices of this context. The libcbm instance, merch volume lookup
+        and disturbance matrix data are shared with this context.
+        """
+        result = copy.copy(self)
+        result._n_stands = indices.length
+        result._inventory = self._inventory.take(indices)
+        result._parameters = self._parameters.take(indices)
+        result._pools = self._pools.take(indices)
+        result._flux = self._flux.take(indices)
+        result._state = self._state.take(indices)
+        return result
+
     def _initialize_libcbm(self) -> LibCBMWrapper:
         libcbm_config = {
             "pools": [
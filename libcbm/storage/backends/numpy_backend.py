@@ -24,15 +24,35 @@ class _numepxr_local_dict_wrap:
         return self._arr[:, self._col_idx[key]]
 
 
-def _map_1D_nb(a: np.ndarray, out: np.ndarray, d: dict) -> None:
-    for i in np.arange(a.shape[0]):
-        out[i] = d[a[i]]
+def _raise_missing_key(value: Any) -> None:
+    raise KeyError(
+        f"value {value} not found as a key in the specified dictionary"
+    )
+
+
+def _map_numeric(
+    a: np.ndarray, keys: np.ndarray, values: np.ndarray
+) -> np.ndarray:
+    """map the numeric array a using a sorted key lookup"""
+    sort_idx = np.argsort(keys, kind="mergesort")
+    sorted_keys = keys[sort_idx]
+    pos = np.searchsorted(sorted_keys, a)
+    np.clip(pos, 0, sorted_keys.shape[0] - 1, out=pos)
+    missing = sorted_keys[pos] != a
+    if missing.any():
+        _raise_missing_key(a[np.argmax(missing)])
+    return values[sort_idx[pos]]
 
 
-def _map_2D_nb(a: np.ndarray, out: np.ndarray, d: dict) -> None:
-    for i in np.arange(a.shape[0]):
-        for j in np.arange(a.shape[1]):
-            out[i, j] = d[a[i, j]]
+def _map_unique(a: np.ndarray, d: dict, out_dtype: Any) -> np.ndarray:
+    """map the array a by looking up each of its distinct values in d"""
+    codes, unique_values = pd.factorize(a, use_na_sentinel=False)
+    mapped = np.empty(len(unique_values), dtype=out_dtype)
+    for i, v in enumerate(unique_values):
+        if v not in d:
+            _raise_missing_key(v)
+        mapped[i] = d[v]
+    return mapped[codes]
 
 
 def _get_map_value_type(d: dict) -> Any:
@@ -51,15 +71,17 @@ def _map(a: np.ndarray, d: dict) -> np.ndarray:
     elif len(d) == 0:
         raise ValueError("empty dictionary provided")
 
-    out = np.empty_like(a, dtype=_get_map_value_type(d))
-
-    if a.ndim == 1:
-        _map_1D_nb(a, out, d)
-    elif a.ndim == 2:
-        _map_2D_nb(a, out, d)
-    else:
+    if a.ndim not in [1, 2]:
         raise ValueError("ndim=1 or ndim=2 supported")
-    return out
+    out_dtype = _get_map_value_type(d)
+    flat = a.reshape(-1)
+    keys = np.array(list(d.keys()))
+    if keys.ndim == 1 and keys.dtype.kind in "iufb" and a.dtype.kind in "iufb":
+        values = np.fromiter(d.values(), dtype=out_dtype, count=len(d))
+        out = _map_numeric(flat, keys, values)
+    else:
+        out = _map_unique(flat, d, out_dtype)
+    return out.reshape(a.shape)
 
 
 def get_numpy_pointer(
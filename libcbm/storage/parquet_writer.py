@@ -0,0 +1,104 @@
+from __future__ import annotations
+import os
+from typing import Any
+import numpy as np
+from libcbm.storage.dataframe import DataFrame
+
+
+def _import_pyarrow() -> tuple[Any, Any]:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "the pyarrow package is required for writing parquet output, "
+            "install it with: pip install libcbm[parquet]"
+        )
+    return pyarrow, pyarrow.parquet
+
+
+class ParquetResultWriter:
+    """Streams named tables of timestep results to parquet files.
+
+    Each distinct table name is written to its own file
+    `<output_dir>/<name>.parquet`, and each call to :py:meth:`write` is
+    stored as a single row group in that file, so that only one timestep's
+    worth of results is held in memory at any time.
+
+    A single file per table is written rather than a timestep partitioned
+    dataset, since a partitioned dataset drops the timestep column from
+    the data files, and reads back with the timestep as a trailing
+    categorical column and with the timesteps in lexicographic order.
+    Each row group holds a single timestep, so the row group statistics
+    allow readers to skip the other timesteps, for example with
+    `pyarrow.parquet.read_table(path, filters=[("timestep", "=", t)])`.
+
+    The pyarrow package is required, and is installed with the "parquet"
+    extra: `pip install libcbm[parquet]`.
+
+    Args:
+        output_dir (str): directory in which parquet files are created.
+            It is created if it does not exist.
+        compression (str, optional): the parquet compression codec.
+            Defaults to "snappy".
+    """
+
+    def __init__(self, output_dir: str, compression: str = "snappy"):
+        self._pa, self._pq = _import_pyarrow()
+        self._output_dir = output_dir
+        self._compression = compression
+        self._writers: dict[str, Any] = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    @property
+    def output_dir(self) -> str:
+        """get the directory in which parquet files are written"""
+        return self._output_dir
+
+    def get_path(self, name: str) -> str:
+        """get the path of the parquet file for the named table"""
+        return os.path.join(self._output_dir, f"{name}.parquet")
+
+    def write(
+        self,
+        name: str,
+        data: DataFrame,
+        index_columns: dict[str, np.ndarray] | None = None,
+    ) -> None:
+        """Write the specified data as a row group in the named table.
+
+        Args:
+            name (str): the table name
+            data (DataFrame): the data to write. The columns must match the
+                columns of any data previously written to the table.
+            index_columns (dict[str, np.ndarray], optional): additional
+                columns, such as row identifiers, written ahead of the
+                columns in data. Defaults to None.
+        """
+        columns = dict(index_columns) if index_columns else {}
+        for col in data.columns:
+            columns[col] = data[col].to_numpy()
+        table = self._pa.table(columns)
+        writer = self._writers.get(name)
+        if writer is None:
+            writer = self._pq.ParquetWriter(
+                self.get_path(name),
+                table.schema,
+                compression=self._compression,
+            )
+            self._writers[name] = writer
+        elif table.schema != writer.schema:
+            table = table.cast(writer.schema)
+        writer.write_table(table, row_group_size=max(table.num_rows, 1))
+
+    def close(self) -> None:
+        """Close all open parquet files"""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def __enter__(self) -> "ParquetResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
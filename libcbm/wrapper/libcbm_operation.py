@@ -138,6 +138,26 @@ class Operation:
                 self._init_value,
             )
 
+    def update(self, data: list, matrix_index: np.ndarray):
+        """Assign new matrix data and a new matrix index to this operation.
+
+        The data has the same format as the data passed to the constructor.
+        libcbm copies the matrix values when an operation is first set, and
+        does not refresh them if the operation is set again, so the
+        allocated libcbm operation is freed and a new one is initialized
+        with the specified data.
+
+        Args:
+            data (list): the matrix data
+            matrix_index (np.ndarray): the index of the matrix applied to
+                each stand
+        """
+        if self.format == OperationFormat.MatrixList:
+            self._init_matrix_list(data)
+        elif self.format == OperationFormat.RepeatingCoordinates:
+            self._init_repeating(data)
+        self._set_op(matrix_index)
+
     def update_index(self, matrix_index: np.ndarray):
         if not matrix_index.dtype == np.uintp:
             matrix_index = matrix_index.astype(np.uintp)
@@ -110,4 +110,5 @@ setup(
         + test_resources
     },
     install_requires=requirements,
+    extras_require={"parquet": ["pyarrow"]},
 )
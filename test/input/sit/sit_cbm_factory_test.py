@@ -1,6 +1,8 @@
 from types import SimpleNamespace
 import unittest
 import os
+import functools
+import numpy as np
 import pandas as pd
 import json
 from unittest.mock import Mock
@@ -10,6 +12,7 @@ from libcbm.input.sit import sit_cbm_factory
 from libcbm.input.sit.sit_cbm_factory import EventSort
 from libcbm.input.sit.sit_reader import load_table
 from libcbm.model.cbm import cbm_simulator
+from libcbm.storage import series
 from libcbm.model.cbm.cbm_output import CBMOutput
 from libcbm import resources
 
@@ -84,6 +87,53 @@ class SITCBMFactoryTest(unittest.TestCase):
                 len(rule_based_processor.sit_event_stats_by_timestep) > 0
             )
 
+    def test_integration_with_tutorial2_sharded(self):
+        """tests that a sharded, multi-process simulation with rule based
+        disturbances matches the single process simulation
+        """
+        config_path = os.path.join(
+            resources.get_test_resources_dir(),
+            "cbm3_tutorial2",
+            "sit_config.json",
+        )
+        sit = sit_cbm_factory.load_sit(config_path)
+        outputs = []
+        for sharded in [False, True]:
+            classifiers, inventory = sit_cbm_factory.initialize_inventory(sit)
+            with sit_cbm_factory.initialize_cbm(sit) as cbm:
+                output = CBMOutput()
+                rule_based_processor = (
+                    sit_cbm_factory.create_sit_rule_based_processor(
+                        sit,
+                        cbm,
+                        random_func=lambda n: series.from_numpy(
+                            "", np.full(n, 0.5)
+                        ),
+                    )
+                )
+                kwargs = dict(
+                    n_steps=3,
+                    classifiers=classifiers,
+                    inventory=inventory,
+                    pre_dynamics_func=rule_based_processor.pre_dynamics_func,
+                    reporting_func=output.append_simulation_result,
+                )
+                if sharded:
+                    cbm_simulator.simulate_sharded(
+                        functools.partial(sit_cbm_factory.initialize_cbm, sit),
+                        max_workers=2,
+                        **kwargs,
+                    )
+                else:
+                    cbm_simulator.simulate(cbm, **kwargs)
+                outputs.append(output)
+
+        for name in ["pools", "flux", "state"]:
+            pd.testing.assert_frame_equal(
+                getattr(outputs[0], name).to_pandas(),
+                getattr(outputs[1], name).to_pandas(),
+            )
+
     @patch("libcbm.input.sit.sit_cbm_factory.resources")
     @patch("libcbm.input.sit.sit_cbm_factory.SITCBMDefaults")
     @patch("libcbm.input.sit.sit_cbm_factory.SITMapping")
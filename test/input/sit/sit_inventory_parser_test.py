@@ -50,6 +50,57 @@ class SITInventoryParserTest(unittest.TestCase):
         self.assertTrue(result.area.sum() == 3)
         self.assertTrue(set(result.age) == {100, 4, 1, 2})
 
+    def test_expand_age_class_inventory_expected_rows(self):
+        """Checks the order, ages and areas of age class expanded rows"""
+        age_classes = pd.DataFrame(
+            data=[("0", 0, 0, 0), ("1", 2, 1, 2), ("2", 3, 3, 5)],
+            columns=["name", "class_size", "start_year", "end_year"],
+        )
+        inventory = pd.DataFrame(
+            {
+                "using_age_class": [True, False, True, True],
+                "age": ["2", 7, "0", "1"],
+                "area": [6.0, 1.0, 5.0, 4.0],
+            }
+        )
+        result = sit_inventory_parser.expand_age_class_inventory(
+            inventory, age_classes
+        )
+        self.assertTrue(list(result.age) == [7, 3, 4, 5, 0, 1, 2])
+        self.assertTrue(
+            list(result.area) == [1.0, 2.0, 2.0, 2.0, 5.0, 2.0, 2.0]
+        )
+
+    def test_parse_chunks_matches_parse(self):
+        """Checks that parsing an inventory in chunks gives the same result
+        as parsing the entire table, with categorical classifiers
+        """
+        inventory_table = pd.DataFrame(
+            data=[
+                ("b", "a", "TRUE", "1", 1, 0, 0),
+                ("a", "a", False, 100, 1, 0, 0),
+                ("a", "a", "-1", 4, 1, 0, 0),
+                ("b", "a", False, 7, 2, 0, 0),
+            ]
+        )
+        classifiers, classifier_values = self.get_mock_classifiers()
+        age_classes = self.get_mock_age_classes()
+        expected = sit_inventory_parser.parse(
+            inventory_table, classifiers, classifier_values, None, age_classes
+        )
+        result = sit_inventory_parser.parse_chunks(
+            [inventory_table.iloc[0:3], inventory_table.iloc[3:]],
+            classifiers,
+            classifier_values,
+            None,
+            age_classes,
+        )
+        for classifier_name in classifiers.name:
+            self.assertTrue(result[classifier_name].dtype == "category")
+        self.assertTrue(
+            result.astype(expected.dtypes.to_dict()).equals(expected)
+        )
+
     def test_exception_on_missing_age_class_id(self):
         """Checks the age class expansion feature "using_age_class" """
         inventory_table = pd.DataFrame(
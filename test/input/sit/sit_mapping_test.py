@@ -397,6 +397,58 @@ class SITMappingTest(unittest.TestCase):
         )
         self.assertTrue(list(result) == [1000, 2000])
 
+    def test_admin_eco_mapping_resolves_distinct_combinations(self):
+        """Checks that spatial units are looked up once per distinct
+        admin-eco combination in the inventory.
+        """
+        mapping = {
+            "spatial_units": {
+                "mapping_mode": "SeparateAdminEcoClassifiers",
+                "admin_classifier": "classifier1",
+                "eco_classifier": "classifier2",
+                "admin_mapping": [
+                    {
+                        "user_admin_boundary": "a",
+                        "default_admin_boundary": "British Columbia",
+                    },
+                    {
+                        "user_admin_boundary": "b",
+                        "default_admin_boundary": "Alberta",
+                    },
+                ],
+                "eco_mapping": [
+                    {
+                        "user_eco_boundary": "a",
+                        "default_eco_boundary": "Montane Cordillera",
+                    }
+                ],
+            }
+        }
+        ref = Mock(spec=SITCBMDefaults)
+        classifiers, classifier_values = self.get_mock_classifiers()
+        inventory = pd.DataFrame(
+            {
+                "classifier1": ["b", "a", "b", "a", "a"],
+                "classifier2": ["a", "a", "a", "a", "a"],
+            }
+        )
+
+        def mock_get_spatial_unit_id(admin, eco):
+            if admin == "British Columbia" and eco == "Montane Cordillera":
+                return 1000
+            elif admin == "Alberta" and eco == "Montane Cordillera":
+                return 2000
+            else:
+                raise ValueError
+
+        ref.get_spatial_unit_id.side_effect = mock_get_spatial_unit_id
+        sit_mapping = SITMapping(mapping, ref)
+        result = sit_mapping.get_spatial_unit(
+            inventory, classifiers, classifier_values
+        )
+        self.assertTrue(list(result) == [2000, 1000, 2000, 1000, 1000])
+        self.assertTrue(ref.get_spatial_unit_id.call_count == 2)
+
     def test_undefined_mapped_default_spatial_unit_error(self):
         """Checks that an error is raised when the default mapping of spatial
         unit does not match a defined value in the defaults reference in
@@ -0,0 +1,54 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from libcbm import resources
+from libcbm.model.cbm import cbm_defaults
+from libcbm.model.cbm.cbm_defaults_reference import CBMDefaultsReference
+
+
+class CBMDefaultsTest(unittest.TestCase):
+    def test_load_cbm_defaults_matches_individual_loaders(self):
+        db_path = resources.get_cbm_defaults_path()
+        result = cbm_defaults.load_cbm_defaults(db_path)
+        self.assertEqual(
+            result["pools"], cbm_defaults.load_cbm_pools(db_path)
+        )
+        self.assertEqual(
+            result["flux_indicators"],
+            cbm_defaults.load_cbm_flux_indicators(db_path),
+        )
+        parameters = cbm_defaults.load_cbm_parameters(db_path)
+        self.assertEqual(
+            list(result["parameters"].keys()), list(parameters.keys())
+        )
+        for name, table in parameters.items():
+            self.assertTrue(result["parameters"][name].equals(table))
+
+    def test_load_cbm_defaults_cache(self):
+        db_path = resources.get_cbm_defaults_path()
+        with TemporaryDirectory() as tempdir:
+            uncached = cbm_defaults.load_cbm_defaults(db_path)
+            first = cbm_defaults.load_cbm_defaults(db_path, tempdir)
+            self.assertEqual(len(os.listdir(tempdir)), 1)
+            second = cbm_defaults.load_cbm_defaults(db_path, tempdir)
+            for result in [first, second]:
+                self.assertEqual(result["pools"], uncached["pools"])
+                self.assertEqual(
+                    result["flux_indicators"], uncached["flux_indicators"]
+                )
+                for name, table in uncached["parameters"].items():
+                    self.assertTrue(result["parameters"][name].equals(table))
+
+    def test_cbm_defaults_reference_cache_is_keyed_by_locale(self):
+        db_path = resources.get_cbm_defaults_path()
+        with TemporaryDirectory() as tempdir:
+            ref = CBMDefaultsReference(db_path, "en-CA", tempdir)
+            cached = CBMDefaultsReference(db_path, "en-CA", tempdir)
+            self.assertEqual(ref.get_species(), cached.get_species())
+            self.assertEqual(ref.get_pools(), cached.get_pools())
+            CBMDefaultsReference(db_path, "fr-CA", tempdir)
+            self.assertEqual(len(os.listdir(tempdir)), 2)
+
+    def test_load_cbm_parameters_missing_path_error(self):
+        with self.assertRaises(ValueError):
+            cbm_defaults.load_cbm_parameters("missing_cbm_defaults.db")
@@ -0,0 +1,44 @@
+import unittest
+import json
+import pandas as pd
+from libcbm.model.cbm import cbm_factory
+
+
+class CBMFactoryTest(unittest.TestCase):
+    def test_cbm_config_to_json_matches_config_dictionary(self):
+        parameters = {
+            "a": pd.DataFrame({"x": [1, 2], "y": [0.1, 1e-17]}),
+            "b": pd.DataFrame({"z": [3]}),
+        }
+        merch_volume_to_biomass_config = {
+            "db_path": "cbm_defaults.db",
+            "merch_volume_curves": [
+                {
+                    "classifier_set": {"type": "name", "values": ["a1"]},
+                    "components": [
+                        {"species_id": 1, "age_volume_pairs": [[0, 0.0]]}
+                    ],
+                }
+            ],
+        }
+        classifiers_config = {
+            "classifiers": [{"id": 1, "name": "a"}],
+            "classifier_values": [
+                {"id": 1, "classifier_id": 1, "value": "a1"}
+            ],
+        }
+        expected = json.dumps(
+            {
+                "cbm_defaults": {
+                    k: cbm_factory._dataframe_to_json(v)
+                    for k, v in parameters.items()
+                },
+                "merch_volume_to_biomass": merch_volume_to_biomass_config,
+                "classifiers": classifiers_config["classifiers"],
+                "classifier_values": classifiers_config["classifier_values"],
+            }
+        )
+        result = cbm_factory._cbm_config_to_json(
+            parameters, merch_volume_to_biomass_config, classifiers_config
+        )
+        self.assertEqual(result, expected)
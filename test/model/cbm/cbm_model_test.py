@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import Mock
+from types import SimpleNamespace
+import pandas as pd
+from libcbm.storage import dataframe
+from libcbm.model.cbm import cbm_model
+
+
+def _mock_cbm_vars(n_stands: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        pools=dataframe.from_pandas(pd.DataFrame({"a": [1.0] * n_stands})),
+        flux=dataframe.from_pandas(pd.DataFrame({"f": [0.0] * n_stands})),
+        inventory=dataframe.from_pandas(pd.DataFrame({"age": [1] * n_stands})),
+        parameters=dataframe.from_pandas(
+            pd.DataFrame({"disturbance_type": [0] * n_stands})
+        ),
+    )
+
+
+class CBMModelTest(unittest.TestCase):
+    def test_ops_are_reused_until_stand_count_changes(self):
+        compute_functions = Mock()
+        compute_functions.allocate_op.side_effect = [1, 2]
+        model_functions = Mock()
+        cbm = cbm_model.CBM(compute_functions, model_functions, ["a"], ["f"])
+
+        for _ in range(3):
+            cbm.step_disturbance(_mock_cbm_vars(3))
+        compute_functions.allocate_op.assert_called_once_with(3)
+        compute_functions.free_op.assert_not_called()
+        self.assertEqual(
+            [
+                c.args[0]
+                for c in model_functions.get_disturbance_ops.mock_calls
+            ],
+            [1, 1, 1],
+        )
+
+        cbm.step_disturbance(_mock_cbm_vars(5))
+        compute_functions.free_op.assert_called_once_with(1)
+        compute_functions.allocate_op.assert_called_with(5)
+
+        cbm.free_ops()
+        compute_functions.free_op.assert_called_with(2)
+        self.assertEqual(compute_functions.free_op.call_count, 2)
@@ -1,8 +1,12 @@
+import os
+import tempfile
+import pytest
 import pandas as pd
 from pandas.testing import assert_frame_equal
 from unittest.mock import patch
 from libcbm.model.cbm.cbm_variables import CBMVariables
 from libcbm.model.cbm.cbm_output import CBMOutput
+from libcbm.model.cbm.cbm_output import CBMParquetOutput
 from libcbm.storage.backends import BackendType
 from libcbm.storage.dataframe import from_pandas
 
@@ -29,8 +33,7 @@ def _make_test_data() -> CBMVariables:
 
 
 @patch("libcbm.model.cbm.cbm_output.dataframe")
-@patch("libcbm.model.cbm.cbm_output.series")
-def test_construction(series, dataframe):
+def test_construction(dataframe):
     cbm_output = CBMOutput(
         density=True,
         classifier_map={1: "a"},
@@ -283,3 +286,100 @@ def test_append_simulation_result_with_mapping_multiple_append():
             }
         ),
     )
+
+
+def test_append_simulation_result_varying_row_counts():
+    for n_timesteps in [None, 2, 10]:
+        cbm_output = CBMOutput(
+            density=True,
+            backend_type=BackendType.numpy,
+            n_timesteps=n_timesteps,
+        )
+        expected_pools = []
+        for timestep in range(10):
+            n_rows = timestep % 4 + 1
+            cbm_vars = CBMVariables(
+                pools=from_pandas(
+                    pd.DataFrame({"p1": [float(timestep)] * n_rows})
+                ),
+                flux=from_pandas(pd.DataFrame({"f1": [1.0] * n_rows})),
+                classifiers=from_pandas(pd.DataFrame({"c1": [1] * n_rows})),
+                state=from_pandas(pd.DataFrame({"s1": [1] * n_rows})),
+                inventory=from_pandas(pd.DataFrame({"area": [1.0] * n_rows})),
+                parameters=from_pandas(pd.DataFrame({"p1": [1.5] * n_rows})),
+            )
+            cbm_output.append_simulation_result(timestep, cbm_vars)
+            expected_pools.append(
+                pd.DataFrame(
+                    {
+                        "identifier": pd.Series(
+                            range(1, n_rows + 1), dtype="int64"
+                        ),
+                        "timestep": pd.Series(
+                            [timestep] * n_rows, dtype="int"
+                        ),
+                        "p1": [float(timestep)] * n_rows,
+                    }
+                )
+            )
+            assert_frame_equal(
+                cbm_output.pools.to_pandas(),
+                pd.concat(expected_pools).reset_index(drop=True),
+            )
+        assert cbm_output.classifiers.n_rows == cbm_output.pools.n_rows
+        assert cbm_output.area.n_rows == cbm_output.pools.n_rows
+
+
+def test_append_simulation_result_promotes_dtypes():
+    cbm_output = CBMOutput(density=True, backend_type=BackendType.pandas)
+    cbm_vars = _make_test_data()
+    cbm_output.append_simulation_result(timestep=1, cbm_vars=cbm_vars)
+    cbm_vars.state = from_pandas(
+        pd.DataFrame(
+            {"s1": [1.5, 1.5, 1.5], "last_disturbance_type": [-1, 1, -1]}
+        )
+    )
+    cbm_output.append_simulation_result(timestep=2, cbm_vars=cbm_vars)
+    assert_frame_equal(
+        cbm_output.state.to_pandas(),
+        pd.DataFrame(
+            {
+                "identifier": pd.Series([1, 2, 3, 1, 2, 3], dtype="int64"),
+                "timestep": pd.Series([1, 1, 1, 2, 2, 2], dtype="int"),
+                "s1": [1.0, 1.0, 1.0, 1.5, 1.5, 1.5],
+                "last_disturbance_type": [-1, 1, -1, -1, 1, -1],
+            }
+        ),
+    )
+
+
+def test_parquet_output_matches_in_memory_output():
+    pytest.importorskip("pyarrow")
+    kwargs = dict(
+        density=False,
+        classifier_map={1: "c1", 2: "c2"},
+        disturbance_type_map={-1: "-1", 1: "d1", 2: "d2"},
+    )
+    cbm_output = CBMOutput(backend_type=BackendType.pandas, **kwargs)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with CBMParquetOutput(temp_dir, **kwargs) as parquet_output:
+            for timestep in range(3):
+                for output in [cbm_output, parquet_output]:
+                    output.append_simulation_result(
+                        timestep, _make_test_data()
+                    )
+        for name in [
+            "pools",
+            "flux",
+            "state",
+            "parameters",
+            "classifiers",
+            "area",
+        ]:
+            path = parquet_output.get_path(name)
+            assert os.path.exists(path)
+            assert_frame_equal(
+                pd.read_parquet(path),
+                getattr(cbm_output, name).to_pandas(),
+                check_dtype=False,
+            )
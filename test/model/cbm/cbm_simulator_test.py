@@ -0,0 +1,121 @@
+import pandas as pd
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.model.cbm import cbm_simulator
+from libcbm.model.cbm.cbm_output import CBMOutput
+from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.model.cbm.stand_cbm_factory import StandCBMFactory
+
+
+def _get_factory() -> StandCBMFactory:
+    return StandCBMFactory(
+        {"c1": ["c1_v1"]},
+        [
+            {
+                "classifier_set": ["c1_v1"],
+                "merch_volumes": [
+                    {
+                        "species": "Spruce",
+                        "age_volume_pairs": [[0, 0], [50, 100], [100, 150]],
+                    }
+                ],
+            }
+        ],
+    )
+
+
+def _get_inventory():
+    return dataframe.from_pandas(
+        pd.DataFrame(
+            {
+                "c1": "c1_v1",
+                "admin_boundary": "British Columbia",
+                "eco_boundary": "Pacific Maritime",
+                "age": [10, 50, 10, 80, 30, 120, 5],
+                "area": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
+                "delay": 0,
+                "land_class": "UNFCCC_FL_R_FL",
+                "afforestation_pre_type": "None",
+                "historic_disturbance_type": "Wildfire",
+                "last_pass_disturbance_type": "Wildfire",
+            }
+        )
+    )
+
+
+def _split(cbm_vars: CBMVariables, index: int) -> CBMVariables:
+    """split the specified stand in half, appending the new stand"""
+    idx = series.from_list("", [index])
+    area = cbm_vars.inventory["area"]
+    area.assign(area.at(index) / 2, idx)
+    tables = {
+        name: dataframe.concat_data_frame(
+            [getattr(cbm_vars, name), getattr(cbm_vars, name).take(idx)]
+        )
+        for name in [
+            "pools",
+            "flux",
+            "classifiers",
+            "state",
+            "inventory",
+            "parameters",
+        ]
+    }
+    return CBMVariables(**tables)
+
+
+def _pre_dynamics_func(t: int, cbm_vars: CBMVariables) -> CBMVariables:
+    disturbance_type = cbm_vars.parameters["disturbance_type"]
+    disturbance_type.assign(0)
+    if t == 2:
+        disturbance_type.assign(1, series.from_list("", [1, 4]))
+    if t == 3:
+        cbm_vars = _split(cbm_vars, 0)
+        cbm_vars = _split(cbm_vars, 5)
+        cbm_vars.parameters["disturbance_type"].assign(
+            1, series.from_list("", [0])
+        )
+    if t == 4:
+        cbm_vars = _split(cbm_vars, 7)
+        cbm_vars.parameters["disturbance_type"].assign(
+            1, series.from_list("", [8, 2])
+        )
+    return cbm_vars
+
+
+def test_simulate_sharded_matches_simulate():
+    cbm_factory = _get_factory()
+    outputs = []
+    for sharded in [False, True]:
+        csets, inv = cbm_factory.prepare_inventory(_get_inventory())
+        output = CBMOutput()
+        kwargs = dict(
+            n_steps=5,
+            classifiers=csets,
+            inventory=inv,
+            pre_dynamics_func=_pre_dynamics_func,
+            reporting_func=output.append_simulation_result,
+        )
+        if sharded:
+            cbm_simulator.simulate_sharded(
+                cbm_factory.initialize_cbm, max_workers=3, **kwargs
+            )
+        else:
+            with cbm_factory.initialize_cbm() as cbm:
+                cbm_simulator.simulate(cbm, **kwargs)
+        outputs.append(output)
+
+    # 3 stands are appended by splits over the simulation
+    assert outputs[1].pools.n_rows == 3 * 7 + 9 + 2 * 10
+    for name in [
+        "pools",
+        "flux",
+        "state",
+        "classifiers",
+        "parameters",
+        "area",
+    ]:
+        pd.testing.assert_frame_equal(
+            getattr(outputs[0], name).to_pandas(),
+            getattr(outputs[1], name).to_pandas(),
+        )
@@ -0,0 +1,82 @@
+import os
+import tempfile
+from unittest.mock import patch
+import pandas as pd
+from libcbm.storage import dataframe
+from libcbm.storage.backends import BackendType
+from libcbm.model.cbm import cbm_variables
+from libcbm.model.cbm.cbm_model import CBM
+from libcbm.model.cbm.stand_cbm_factory import StandCBMFactory
+
+
+def _get_factory() -> StandCBMFactory:
+    return StandCBMFactory(
+        {"c1": ["c1_v1"]},
+        [
+            {
+                "classifier_set": ["c1_v1"],
+                "merch_volumes": [
+                    {
+                        "species": "Spruce",
+                        "age_volume_pairs": [[0, 0], [50, 100], [100, 150]],
+                    }
+                ],
+            }
+        ],
+    )
+
+
+def _get_inventory(ages: list[int]):
+    return dataframe.from_pandas(
+        pd.DataFrame(
+            {
+                "c1": "c1_v1",
+                "admin_boundary": "British Columbia",
+                "eco_boundary": "Pacific Maritime",
+                "age": ages,
+                "area": 1.0,
+                "delay": 0,
+                "land_class": "UNFCCC_FL_R_FL",
+                "afforestation_pre_type": "None",
+                "historic_disturbance_type": "Wildfire",
+                "last_pass_disturbance_type": "Wildfire",
+            }
+        )
+    )
+
+
+def _spinup(cbm, csets, inv):
+    cbm_vars = cbm_variables.initialize_simulation_variables(
+        csets, inv, cbm.pool_codes, cbm.flux_indicator_codes, BackendType.numpy
+    )
+    spinup_vars = cbm_variables.initialize_spinup_variables(
+        cbm_vars, BackendType.numpy
+    )
+    cbm.spinup(spinup_vars)
+    return spinup_vars
+
+
+def test_spinup_cache():
+    cbm_factory = _get_factory()
+    csets, inv = cbm_factory.prepare_inventory(_get_inventory([10, 50, 90]))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with cbm_factory.initialize_cbm(spinup_cache_dir=temp_dir) as cbm:
+            expected = _spinup(cbm, csets, inv)
+            assert len(os.listdir(temp_dir)) == 1
+            with patch.object(CBM, "_spinup") as mock_spinup:
+                cached = _spinup(cbm, csets, inv)
+                mock_spinup.assert_not_called()
+
+                other_csets, other_inv = cbm_factory.prepare_inventory(
+                    _get_inventory([10, 50, 91])
+                )
+                _spinup(cbm, other_csets, other_inv)
+                mock_spinup.assert_called_once()
+
+    pd.testing.assert_frame_equal(
+        expected.pools.to_pandas(), cached.pools.to_pandas()
+    )
+    pd.testing.assert_frame_equal(
+        expected.state.to_pandas(), cached.state.to_pandas()
+    )
+    assert (expected.pools["SoftwoodMerch"].to_numpy() > 0).all()
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from libcbm.storage import dataframe
+from libcbm.storage import series
+from libcbm.model.cbm import cbm_simulator
+from libcbm.model.cbm import cbm_stand_merge
+from libcbm.model.cbm.cbm_output import CBMOutput
+from libcbm.model.cbm.stand_cbm_factory import StandCBMFactory
+
+
+def _get_factory() -> StandCBMFactory:
+    return StandCBMFactory(
+        {"c1": ["c1_v1"]},
+        [
+            {
+                "classifier_set": ["c1_v1"],
+                "merch_volumes": [
+                    {
+                        "species": "Spruce",
+                        "age_volume_pairs": [[0, 0], [50, 100], [100, 150]],
+                    }
+                ],
+            }
+        ],
+    )
+
+
+def _get_inventory():
+    return dataframe.from_pandas(
+        pd.DataFrame(
+            {
+                "c1": "c1_v1",
+                "admin_boundary": "British Columbia",
+                "eco_boundary": "Pacific Maritime",
+                "age": [10, 50, 10, 10],
+                "area": [1.0, 2.0, 3.0, 4.0],
+                "delay": 0,
+                "land_class": "UNFCCC_FL_R_FL",
+                "afforestation_pre_type": "None",
+                "historic_disturbance_type": "Wildfire",
+                "last_pass_disturbance_type": "Wildfire",
+            }
+        )
+    )
+
+
+def _total_carbon(output: CBMOutput) -> np.ndarray:
+    # pools are reported as tonnes C, rather than tonnes C/ha by default
+    pools = output.pools.to_pandas()
+    return (
+        pools.drop(columns=["identifier", "timestep"])
+        .groupby(pools["timestep"])
+        .sum()
+        .sum(axis=1)
+        .to_numpy()
+    )
+
+
+def test_merge_stands():
+    cbm_factory = _get_factory()
+    csets, inv = cbm_factory.prepare_inventory(_get_inventory())
+    outputs = []
+    merged = []
+    for merge_stands in [False, True]:
+        output = CBMOutput()
+        with cbm_factory.initialize_cbm() as cbm:
+            cbm_simulator.simulate(
+                cbm,
+                n_steps=2,
+                classifiers=csets,
+                inventory=inv,
+                reporting_func=output.append_simulation_result,
+                merge_stands=merge_stands,
+                merge_reporting_func=lambda t, lineage: merged.append(
+                    (t, lineage.to_pandas())
+                ),
+            )
+        outputs.append(output)
+
+    n_stands = outputs[1].pools.to_pandas().groupby("timestep").size()
+    assert list(n_stands) == [4, 2, 2]
+    assert len(merged) == 1
+    assert merged[0][0] == 1
+    assert merged[0][1].to_dict("list") == {
+        "inventory_id": [3, 4],
+        "merged_inventory_id": [1, 1],
+    }
+    assert np.allclose(_total_carbon(outputs[0]), _total_carbon(outputs[1]))
+
+
+def test_merge_stands_no_merge():
+    cbm_factory = _get_factory()
+    csets, inv = cbm_factory.prepare_inventory(_get_inventory())
+    unique_index = series.from_list("", [0, 1])
+    results = []
+    with cbm_factory.initialize_cbm() as cbm:
+        cbm_simulator.simulate(
+            cbm,
+            n_steps=0,
+            classifiers=csets.take(unique_index),
+            inventory=inv.take(unique_index),
+            reporting_func=lambda t, cbm_vars: results.append(cbm_vars),
+        )
+    cbm_vars, merged = cbm_stand_merge.merge_stands(results[0])
+    assert cbm_vars is results[0]
+    assert merged is None
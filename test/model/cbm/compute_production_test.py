@@ -1,6 +1,7 @@
 import unittest
 import pandas as pd
 from libcbm.storage import dataframe
+from libcbm.storage import series
 from types import SimpleNamespace
 from libcbm.model.cbm import cbm_model
 
@@ -78,3 +79,59 @@ class ComputeProductionTest(unittest.TestCase):
         for flux_code in flux_indicator_codes:
             self.assertTrue(result[flux_code].to_list() == [1, 1, 1])
         self.assertTrue(result["Total"].to_list() == [3, 3, 3])
+
+    def test_compute_disturbance_production_gathers_eligible(self):
+        mock_pools = dataframe.from_pandas(
+            pd.DataFrame({"a": [1, 2, 3], "b": [1, 2, 3]})
+        )
+        mock_inventory = dataframe.from_pandas(
+            pd.DataFrame({"age": [1, 1, 1], "area": [10, 20, 30]})
+        )
+        flux_indicator_codes = [
+            "DisturbanceSoftProduction",
+            "DisturbanceHardProduction",
+            "DisturbanceDOMProduction",
+        ]
+        mock_eligible = series.from_pandas(
+            pd.Series([True, False, True]), "eligible"
+        )
+
+        model_functions = SimpleNamespace()
+
+        def mock_get_disturbance_ops(op, inventory, parameters):
+            self.assertTrue(inventory.n_rows == 2)
+            self.assertTrue(inventory["area"].to_list() == [10, 30])
+            self.assertTrue((parameters["disturbance_type"] == 15).all())
+
+        model_functions.get_disturbance_ops = mock_get_disturbance_ops
+
+        compute_functions = SimpleNamespace()
+
+        def mock_allocate_op(n_stands):
+            # only the eligible stands are allocated
+            self.assertTrue(n_stands == 2)
+            return 999
+
+        compute_functions.allocate_op = mock_allocate_op
+
+        def mock_compute_flux(ops, op_processes, pools, flux, enabled):
+            self.assertTrue(pools["a"].to_list() == [1, 3])
+            self.assertTrue(enabled is None)
+            flux.to_pandas()[:] = 1
+
+        compute_functions.compute_flux = mock_compute_flux
+
+        cbm = cbm_model.CBM(
+            compute_functions,
+            model_functions,
+            list(mock_pools.columns),
+            flux_indicator_codes,
+        )
+        result = cbm.compute_disturbance_production(
+            SimpleNamespace(pools=mock_pools, inventory=mock_inventory),
+            15,
+            mock_eligible,
+        )
+        for flux_code in flux_indicator_codes:
+            self.assertTrue(result[flux_code].to_list() == [1, 0, 1])
+        self.assertTrue(result["Total"].to_list() == [3, 0, 3])
@@ -1,3 +1,4 @@
+import pytest
 import pandas as pd
 from libcbm.storage import dataframe
 from libcbm.storage import series
@@ -125,3 +126,85 @@ def test_integration():
             spinup_results.pools.n_rows
             == (n_rotations * return_interval) + age - 1
         )
+
+
+@pytest.mark.parametrize("n_unique", [40, 7])
+def test_spinup_compaction_matches_full_spinup(n_unique):
+    classifiers = {"c1": ["c1_v1"]}
+    merch_volumes = [
+        {
+            "classifier_set": ["c1_v1"],
+            "merch_volumes": [
+                {
+                    "species": "Spruce",
+                    "age_volume_pairs": [
+                        [0, 0],
+                        [50, 100],
+                        [100, 150],
+                        [150, 200],
+                    ],
+                }
+            ],
+        }
+    ]
+    cbm_factory = StandCBMFactory(classifiers, merch_volumes)
+    n_stands = 40
+    inventory = dataframe.from_pandas(
+        pd.DataFrame(
+            {
+                "c1": "c1_v1",
+                "admin_boundary": "British Columbia",
+                "eco_boundary": "Pacific Maritime",
+                "age": [(i % n_unique * 7) % 120 for i in range(n_stands)],
+                "area": [1.0 + i for i in range(n_stands)],
+                "delay": [i % n_unique % 3 for i in range(n_stands)],
+                "land_class": "UNFCCC_FL_R_FL",
+                "afforestation_pre_type": "None",
+                "historic_disturbance_type": "Wildfire",
+                "last_pass_disturbance_type": "Wildfire",
+            }
+        )
+    )
+    csets, inv = cbm_factory.prepare_inventory(inventory)
+
+    def run_spinup(cbm, reporting_func):
+        cbm_vars = cbm_variables.initialize_simulation_variables(
+            csets,
+            inv,
+            cbm.pool_codes,
+            cbm.flux_indicator_codes,
+            BackendType.numpy,
+        )
+        spinup_params = cbm_variables.initialize_spinup_parameters(
+            n_stands,
+            return_interval=series.from_list(
+                "return_interval",
+                [30 + (i % n_unique * 11) % 90 for i in range(n_stands)],
+            ).as_type("int32"),
+            min_rotations=series.from_list(
+                "min_rotations",
+                [1 + i % n_unique % 4 for i in range(n_stands)],
+            ).as_type("int32"),
+            max_rotations=series.from_list(
+                "max_rotations",
+                [1 + i % n_unique % 4 for i in range(n_stands)],
+            ).as_type("int32"),
+        )
+        spinup_vars = cbm_variables.initialize_spinup_variables(
+            cbm_vars, BackendType.numpy, spinup_params
+        )
+        cbm.spinup(spinup_vars, reporting_func=reporting_func)
+        return spinup_vars
+
+    with cbm_factory.initialize_cbm() as cbm:
+        # specifying a reporting function disables compaction of the
+        # working set of stands, and grouping of identical stands
+        full = run_spinup(cbm, lambda i, cbm_vars: None)
+        compacted = run_spinup(cbm, None)
+
+    pd.testing.assert_frame_equal(
+        full.pools.to_pandas(), compacted.pools.to_pandas()
+    )
+    pd.testing.assert_frame_equal(
+        full.state.to_pandas(), compacted.state.to_pandas()
+    )
@@ -1,6 +1,7 @@
 import unittest
 import pandas as pd
 from libcbm.storage import dataframe
+from libcbm.model.cbm.rule_based import rule_filter
 from libcbm.model.cbm.rule_based.classifier_filter import ClassifierFilter
 
 
@@ -223,3 +224,49 @@ class ClassifierFilterTest(unittest.TestCase):
                 ["undefined", "?", "agg1"],
                 dataframe.from_pandas(pd.DataFrame([[1, 3, 5]])),
             )
+
+    def test_classifier_index_matches_classifiers_filter(self):
+        classifiers_config = get_mock_classifiers_config()
+        classifier_aggregates = [
+            {
+                "classifier_id": 3,
+                "name": "agg1",
+                "description": "agg1",
+                "classifier_values": ["c3_v1", "c3_v3"],
+            }
+        ]
+        classifier_filter = ClassifierFilter(
+            classifiers_config, classifier_aggregates
+        )
+        classifier_values = dataframe.from_pandas(
+            pd.DataFrame(
+                {
+                    "c1": [1, 2, 1, 1, 1, 2],
+                    "c2": [3, 3, 4, 4, 4, 3],
+                    "c3": [7, 7, 7, 5, 6, 6],
+                }
+            )
+        )
+        classifier_index = classifier_filter.create_classifier_index(
+            classifier_values
+        )
+        for classifier_set in [
+            ["c1_v1", "?", "agg1"],
+            ["?", "c2_v1", "?"],
+            ["c1_v2", "c2_v1", "c3_v2"],
+            ["c1_v2", "c2_v2", "?"],
+            ["?", "?", "agg1"],
+        ]:
+            expected = rule_filter.evaluate_filters(
+                classifier_filter.create_classifiers_filter(
+                    classifier_set, classifier_values
+                )
+            )
+            result = classifier_index.evaluate(classifier_set)
+            self.assertTrue(result.to_list() == expected.to_list())
+
+        self.assertTrue(classifier_index.evaluate(["?", "?", "?"]) is None)
+        with self.assertRaises(ValueError):
+            classifier_index.evaluate(["undefined", "?", "agg1"])
+        with self.assertRaises(ValueError):
+            classifier_index.evaluate(["c1_v1", "?"])
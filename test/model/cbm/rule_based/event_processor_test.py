@@ -7,6 +7,11 @@ import numpy as np
 from libcbm.storage import dataframe
 from libcbm.storage import series
 from libcbm.model.cbm.rule_based import event_processor
+from libcbm.model.cbm.rule_based.deferred_splits import (
+    DeferredSplitCBMVariables,
+)
+from libcbm.model.cbm.cbm_variables import CBMVariables
+from libcbm.storage.backends import BackendType
 
 # used in patching (overriding) module imports in the module being tested
 PATCH_PATH = "libcbm.model.cbm.rule_based.event_processor"
@@ -326,6 +331,126 @@ class EventProcessorTest(unittest.TestCase):
             )
         )
 
+    def test_apply_rule_based_event_deferred_splits(self):
+        table_names = [
+            "pools",
+            "flux",
+            "classifiers",
+            "state",
+            "inventory",
+            "parameters",
+        ]
+
+        def get_cbm_vars(backend_type):
+            cbm_vars = CBMVariables(
+                pools=dataframe.from_pandas(
+                    pd.DataFrame({"p1": [1.0, 2.0, 3.0, 4.0]})
+                ),
+                flux=dataframe.from_pandas(
+                    pd.DataFrame({"f1": [5.0, 6.0, 7.0, 8.0]})
+                ),
+                classifiers=dataframe.from_pandas(
+                    pd.DataFrame({"classifier1": [1, 2, 3, 4]})
+                ),
+                state=dataframe.from_pandas(
+                    pd.DataFrame(
+                        {
+                            "last_disturbance_type": [1, 2, 3, 4],
+                            "time_since_last_disturbance": [5, 0, 5, 0],
+                        }
+                    )
+                ),
+                inventory=dataframe.from_pandas(
+                    pd.DataFrame(
+                        {
+                            "inventory_id": [2, 3, 4, 5],
+                            "parent_inventory_id": [-1, -1, -1, -1],
+                            "area": [1, 2, 3, 4],
+                        },
+                        dtype="float64",
+                    )
+                ),
+                parameters=dataframe.from_pandas(
+                    pd.DataFrame({"disturbance_type": [0, 0, 0, 0]})
+                ),
+            )
+            return CBMVariables(
+                *[
+                    dataframe.convert_dataframe_backend(
+                        getattr(cbm_vars, name), backend_type
+                    )
+                    for name in table_names
+                ]
+            )
+
+        targets = [
+            pd.DataFrame(
+                {"disturbed_index": [1, 2], "area_proportions": [0.5, 0.9]}
+            ),
+            # the second event disturbs a portion of the first split record
+            pd.DataFrame(
+                {"disturbed_index": [3, 4], "area_proportions": [1.0, 0.5]}
+            ),
+        ]
+        for backend_type in [BackendType.pandas, BackendType.numpy]:
+            expected = get_cbm_vars(backend_type)
+            original = get_cbm_vars(backend_type)
+            deferred = DeferredSplitCBMVariables(original)
+            for i_target, target in enumerate(targets):
+                target_df = dataframe.convert_dataframe_backend(
+                    dataframe.from_pandas(target), backend_type
+                )
+                expected = event_processor.apply_rule_based_event(
+                    target_df, i_target + 1, expected
+                )
+                result = event_processor.apply_rule_based_event(
+                    target_df, i_target + 1, deferred
+                )
+                self.assertIs(result, deferred)
+                for name in table_names:
+                    pd.testing.assert_frame_equal(
+                        getattr(expected, name).to_pandas(),
+                        getattr(deferred, name).to_pandas(),
+                    )
+                self.assertTrue(
+                    list(deferred.pools.evaluate_filter("p1 > 2").to_numpy())
+                    == list((expected.pools["p1"] > 2).to_numpy())
+                )
+                self.assertTrue(
+                    list(
+                        deferred.inventory.evaluate_filter(
+                            "area < 1"
+                        ).to_numpy()
+                    )
+                    == list((expected.inventory["area"] < 1).to_numpy())
+                )
+
+            # the tables of the original variables are not modified
+            for name in table_names:
+                pd.testing.assert_frame_equal(
+                    getattr(original, name).to_pandas(),
+                    getattr(get_cbm_vars(backend_type), name).to_pandas(),
+                )
+
+            self.assertTrue(
+                deferred.expand(
+                    series.from_list("", [10, 11, 12, 13])
+                ).to_list()
+                == [10, 11, 12, 13, 11, 12, 11]
+            )
+            result = deferred.apply_splits()
+            self.assertTrue(
+                result.pools["p1"].to_list() == [1, 2, 3, 4, 2, 3, 2]
+            )
+            for name in table_names:
+                self.assertTrue(
+                    getattr(result, name).backend_type == backend_type
+                )
+                pd.testing.assert_frame_equal(
+                    getattr(expected, name).to_pandas(),
+                    getattr(result, name).to_pandas(),
+                )
+
     def test_apply_rule_based_event_expected_result_no_target_rows(self):
         mock_cbm_vars = SimpleNamespace(
             classifiers=dataframe.from_pandas(
@@ -176,3 +176,50 @@ class SITEventProcessorTest(unittest.TestCase):
             self.assertTrue(
                 disturbance_id_order == expected_disturbance_id_order
             )
+
+            # the event filter expressions are built once for all of the
+            # events, and are not rebuilt on subsequent timesteps
+            sit_event_processor.process_events(
+                time_step=2,
+                sit_events=mock_sit_events,
+                cbm_vars=mock_cbm_vars,
+            )
+            self.assertEqual(
+                sit_stand_filter.create_pool_filter_expression.call_count,
+                mock_sit_events.shape[0],
+            )
+            self.assertEqual(disturbance_id_order, [6, 5, 4, 3, 2, 1])
+
+            # a different events table is compiled again
+            modified_sit_events = mock_sit_events.copy()
+            modified_sit_events["sort_field"] = [1, 2, 6, 5, 4, 3]
+            sit_event_processor.process_events(
+                time_step=2,
+                sit_events=modified_sit_events,
+                cbm_vars=mock_cbm_vars,
+            )
+            self.assertEqual(
+                sit_stand_filter.create_pool_filter_expression.call_count,
+                mock_sit_events.shape[0] + 4,
+            )
+            self.assertEqual(
+                disturbance_id_order, [6, 5, 4, 3, 2, 1, 1, 2, 3, 4]
+            )
+
+            # an events table modified in place is compiled again by
+            # recompile
+            modified_sit_events["sort_field"] = [1, 2, 3, 4, 5, 6]
+            sit_event_processor.recompile(modified_sit_events)
+            sit_event_processor.process_events(
+                time_step=2,
+                sit_events=modified_sit_events,
+                cbm_vars=mock_cbm_vars,
+            )
+            self.assertEqual(
+                sit_stand_filter.create_pool_filter_expression.call_count,
+                mock_sit_events.shape[0] + 8,
+            )
+            self.assertEqual(
+                disturbance_id_order,
+                [6, 5, 4, 3, 2, 1, 1, 2, 3, 4, 4, 3, 2, 1],
+            )
@@ -85,7 +85,9 @@ class SITStandTargetTest(unittest.TestCase):
             lambda *args: "production_sort_value"
         )
 
-        def mock_disturbance_production_func(cbm_vars, disturbance_type_id):
+        def mock_disturbance_production_func(
+            cbm_vars, disturbance_type_id, eligible
+        ):
             self.assertTrue(disturbance_type_id == 2)
             self.assertTrue(cbm_vars.inventory == "inventory")
             self.assertTrue(cbm_vars.pools == "pools")
@@ -176,7 +178,9 @@ class SITStandTargetTest(unittest.TestCase):
             lambda sort_type, cbm_vars, random_generator: "mock sort value"
         )
 
-        def mock_disturbance_production_func(cbm_vars, disturbance_type_id):
+        def mock_disturbance_production_func(
+            cbm_vars, disturbance_type_id, eligible
+        ):
             self.assertTrue(disturbance_type_id == 90)
             self.assertTrue(cbm_vars.inventory == "inventory")
             self.assertTrue(cbm_vars.pools == "pools")
@@ -222,7 +226,9 @@ class SITStandTargetTest(unittest.TestCase):
             lambda sort_type, cbm_vars, random_generator: "mock sort value"
         )
 
-        def mock_disturbance_production_func(cbm_vars, disturbance_type_id):
+        def mock_disturbance_production_func(
+            cbm_vars, disturbance_type_id, eligible
+        ):
             self.assertTrue(disturbance_type_id == 99)
             self.assertTrue(cbm_vars.inventory == "inventory")
             self.assertTrue(cbm_vars.pools == "pools")
@@ -0,0 +1,202 @@
+import unittest
+import numpy as np
+import pandas as pd
+from libcbm.model.cbm_exn import cbm_exn_growth_functions
+from libcbm.model.model_definition.model_variables import ModelVariables
+
+
+class CBMEXNGrowthFunctionsTest(unittest.TestCase):
+    def test_turnover_splits_follow_stand_order(self):
+        turnover_parameters = pd.DataFrame(
+            {
+                "spatial_unit_id": [1, 1, 2, 2],
+                "sw_hw": [0, 1, 0, 1],
+                "OtherToBranchSnagSplit": [0.1, 0.2, 0.3, 0.4],
+                "CoarseRootAGSplit": [0.5, 0.6, 0.7, 0.8],
+                "FineRootAGSplit": [0.9, 0.8, 0.7, 0.6],
+            }
+        )
+        splits = cbm_exn_growth_functions._get_turnover_splits(
+            np.array([2, 1, 2, 1]), np.array([1, 0, 0, 1]), turnover_parameters
+        )
+        self.assertTrue(
+            (
+                splits["other_to_branch_snag_split"]
+                == np.array([0.4, 0.1, 0.3, 0.2])
+            ).all()
+        )
+        with self.assertRaises(ValueError):
+            cbm_exn_growth_functions._get_turnover_splits(
+                np.array([3]), np.array([0]), turnover_parameters
+            )
+
+    def test_overmature_decline_all_ages_matches_per_age(self):
+        rng = np.random.default_rng(1)
+        n_rows, n_cols = 5, 7
+        pools = {
+            k: rng.uniform(1, 10, (n_rows, n_cols))
+            for k in [
+                "merch",
+                "foliage",
+                "other",
+                "coarse_root",
+                "fine_root",
+            ]
+        }
+        increments = {
+            k: rng.uniform(-2, 1, (n_rows, n_cols))
+            for k in [
+                "merch_inc",
+                "foliage_inc",
+                "other_inc",
+                "coarse_root_inc",
+                "fine_root_inc",
+            ]
+        }
+        splits = {
+            "other_to_branch_snag_split": rng.uniform(0, 1, n_rows),
+            "coarse_root_ag_split": rng.uniform(0, 1, n_rows),
+            "fine_root_ag_split": rng.uniform(0, 1, n_rows),
+        }
+        result = cbm_exn_growth_functions._compute_overmature_decline(
+            splits, **pools, **increments
+        )
+        for col_idx in range(n_cols):
+            col_result = cbm_exn_growth_functions._compute_overmature_decline(
+                splits,
+                **{k: v[:, col_idx] for k, v in pools.items()},
+                **{k: v[:, col_idx] for k, v in increments.items()},
+            )
+            for k, v in col_result.items():
+                self.assertEqual(v.shape, (n_rows,))
+                np.testing.assert_allclose(result[k][:, col_idx], v)
+        self.assertTrue((result["merch_to_stem_snag_prop"] > 0).any())
+
+    def test_spinup_growth_info_shares_growth_curves(self):
+        turnover_parameters = pd.DataFrame(
+            {
+                "spatial_unit_id": [1, 1, 2, 2],
+                "sw_hw": [0, 1, 0, 1],
+                "OtherToBranchSnagSplit": [0.25, 0.25, 0.25, 0.4],
+                "CoarseRootAGSplit": [0.5, 0.5, 0.5, 0.5],
+                "FineRootAGSplit": [0.5, 0.5, 0.5, 0.5],
+            }
+        )
+        root_parameters = {
+            "hw_a": 1.576,
+            "sw_a": 0.222,
+            "hw_b": 0.615,
+            "frp_a": 0.072,
+            "frp_b": 0.354,
+            "frp_c": -0.06021,
+            "biomass_to_carbon_rate": 0.5,
+        }
+        n_ages = 4
+        # stands 0 and 2 share increments and turnover parameters, stand 1
+        # differs by increments and stand 3 by turnover parameters
+        spinup_vars = ModelVariables.from_pandas(
+            {
+                "parameters": pd.DataFrame(
+                    {
+                        "spatial_unit_id": [1, 1, 2, 2],
+                        "sw_hw": [0, 0, 0, 1],
+                    }
+                ),
+                "increments": pd.DataFrame(
+                    {
+                        "row_idx": np.repeat(np.arange(4), n_ages),
+                        "age": np.tile(np.arange(1, n_ages + 1), 4),
+                        "merch_inc": [1.0, 2.0, 0.5, -0.5] * 4,
+                        "foliage_inc": [0.1] * n_ages * 4,
+                        "other_inc": [0.2] * n_ages
+                        + [0.3] * n_ages
+                        + [0.2] * n_ages * 2,
+                    }
+                ),
+            }
+        )
+        growth_info = cbm_exn_growth_functions.prepare_spinup_growth_info(
+            spinup_vars, turnover_parameters, root_parameters
+        )
+        # the caller's spinup variables are not modified
+        self.assertEqual(
+            spinup_vars["parameters"].columns, ["spatial_unit_id", "sw_hw"]
+        )
+        self.assertEqual(
+            list(growth_info.pop("stand_growth_curve_id")), [0, 1, 0, 2]
+        )
+        for v in growth_info.values():
+            self.assertEqual(v.shape, (3 * (n_ages + 1),))
+        self.assertEqual(
+            list(growth_info["growth_curve_id"]),
+            [0] * (n_ages + 1) + [1] * (n_ages + 1) + [2] * (n_ages + 1),
+        )
+        self.assertEqual(list(growth_info["age"]), list(range(n_ages + 1)) * 3)
+        self.assertEqual(
+            list(growth_info["merch_inc"][: n_ages + 1]),
+            [1.0, 2.0, 0.5, -0.5, 0.0],
+        )
+
+    def test_spinup_growth_curves_match_stand_increments(self):
+        turnover_parameters = pd.DataFrame(
+            {
+                "spatial_unit_id": [1, 1],
+                "sw_hw": [0, 1],
+                "OtherToBranchSnagSplit": [0.25, 0.25],
+                "CoarseRootAGSplit": [0.5, 0.5],
+                "FineRootAGSplit": [0.5, 0.5],
+            }
+        )
+        root_parameters = {
+            "hw_a": 1.576,
+            "sw_a": 0.222,
+            "hw_b": 0.615,
+            "frp_a": 0.072,
+            "frp_b": 0.354,
+            "frp_c": -0.06021,
+            "biomass_to_carbon_rate": 0.5,
+        }
+        rng = np.random.default_rng(2)
+        n_stands, n_ages = 50, 6
+        curves = rng.uniform(0, 1, (3, n_ages))
+        stand_curve = rng.integers(0, 3, n_stands)
+        increments = pd.DataFrame(
+            {
+                "row_idx": np.repeat(np.arange(n_stands), n_ages),
+                "age": np.tile(np.arange(1, n_ages + 1), n_stands),
+                "merch_inc": curves[stand_curve].flatten(),
+                "foliage_inc": 0.1,
+                "other_inc": 0.2,
+            }
+        )
+        # stand 0 has no increments at the final age
+        increments = increments.iloc[n_ages - 1 :]
+        increments = increments.sample(frac=1, random_state=3)
+        spinup_vars = ModelVariables.from_pandas(
+            {
+                "parameters": pd.DataFrame(
+                    {
+                        "spatial_unit_id": 1,
+                        "sw_hw": rng.integers(0, 2, n_stands),
+                    }
+                ),
+                "increments": increments,
+            }
+        )
+        growth_info = cbm_exn_growth_functions.prepare_spinup_growth_info(
+            spinup_vars, turnover_parameters, root_parameters
+        )
+        stand_growth_curve_id = growth_info["stand_growth_curve_id"]
+        n_curves = growth_info["growth_curve_id"].max() + 1
+        self.assertLess(n_curves, n_stands)
+        merch_inc = growth_info["merch_inc"].reshape(n_curves, n_ages + 1)
+        expected = (
+            increments.pivot(
+                index="row_idx", columns="age", values="merch_inc"
+            )
+            .fillna(0)
+            .to_numpy()
+        )
+        np.testing.assert_array_equal(
+            merch_inc[stand_growth_curve_id, :n_ages], expected
+        )
@@ -1,8 +1,11 @@
 import tempfile
 import pandas as pd
 from libcbm.model.cbm_exn import cbm_exn_model
+from libcbm.model.cbm_exn import cbm_exn_step
+from libcbm.model.cbm_exn import cbm_exn_spinup
 from libcbm.model.cbm_exn.parameters import parameter_extraction
 from libcbm.model.model_definition.model_variables import ModelVariables
+from libcbm.storage.backends import BackendType
 from libcbm import resources
 
 
@@ -45,3 +48,111 @@ def test_cbm_exn_integration():
         ) as model:
             cbm_vars = model.spinup(spinup_input)
             cbm_vars = model.step(cbm_vars)
+
+
+def test_cbm_exn_cached_ops_match_rebuilt_ops():
+    n_stands = 4
+    spinup_input = {
+        "parameters": pd.DataFrame(
+            {
+                "age": [10, 20, 30, 40],
+                "area": [1] * n_stands,
+                "delay": [0] * n_stands,
+                "return_interval": [150] * n_stands,
+                "min_rotations": [10] * n_stands,
+                "max_rotations": [30] * n_stands,
+                "spatial_unit_id": [1, 1, 3, 3],
+                "species": [1, 1, 1, 1],
+                "mean_annual_temperature": [-1.0] * n_stands,
+                "historical_disturbance_type": [1] * n_stands,
+                "last_pass_disturbance_type": [1] * n_stands,
+            }
+        ),
+        "increments": pd.DataFrame(
+            {
+                "row_idx": [i for i in range(n_stands) for _ in range(200)],
+                "age": list(range(1, 201)) * n_stands,
+                "merch_inc": [0.1] * 200 * n_stands,
+                "other_inc": [0.1] * 200 * n_stands,
+                "foliage_inc": [0.1] * 200 * n_stands,
+            }
+        ),
+    }
+    results = []
+    for rebuild_ops in [False, True]:
+        with cbm_exn_model.initialize() as model:
+            cbm_vars = model.spinup(
+                {k: v.copy() for k, v in spinup_input.items()}
+            )
+            for t in range(5):
+                cbm_vars["parameters"]["disturbance_type"] = [t % 2, 0, 1, 0]
+                cbm_vars["parameters"]["mean_annual_temperature"] = -1.0
+                for inc in ["merch_inc", "foliage_inc", "other_inc"]:
+                    cbm_vars["parameters"][inc] = 0.1
+                if rebuild_ops:
+                    ops = [
+                        dict(op, op_data=op["op_data"].copy())
+                        for op in cbm_exn_step.get_default_ops(
+                            model.parameters,
+                            ModelVariables.from_pandas(cbm_vars),
+                        )
+                    ]
+                else:
+                    ops = None
+                cbm_vars = model.step(cbm_vars, ops=ops)
+            results.append(cbm_vars)
+            assert model.parameters.get_disturbance_op_data(
+                False
+            ) is model.parameters.get_disturbance_op_data(False)
+    pd.testing.assert_frame_equal(results[0]["pools"], results[1]["pools"])
+    pd.testing.assert_frame_equal(results[0]["flux"], results[1]["flux"])
+    assert (results[0]["flux"]["DisturbanceCO2Production"] > 0).any()
+
+
+def test_cbm_exn_grouped_spinup_matches_full_spinup():
+    # stands 0, 2 and 4 and stands 1 and 3 share a spinup signature
+    n_stands = 5
+    spinup_input = ModelVariables.from_pandas(
+        {
+            "parameters": pd.DataFrame(
+                {
+                    "age": [10, 30, 10, 30, 10],
+                    "area": [1.0, 2.0, 3.0, 4.0, 5.0],
+                    "delay": [0] * n_stands,
+                    "return_interval": [150] * n_stands,
+                    "min_rotations": [10] * n_stands,
+                    "max_rotations": [30] * n_stands,
+                    "spatial_unit_id": [1, 3, 1, 3, 1],
+                    "species": [1] * n_stands,
+                    "mean_annual_temperature": [-1.0] * n_stands,
+                    "historical_disturbance_type": [1] * n_stands,
+                    "last_pass_disturbance_type": [1] * n_stands,
+                }
+            ),
+            "increments": pd.DataFrame(
+                {
+                    "row_idx": [i for i in range(n_stands) for _ in range(50)],
+                    "age": list(range(1, 51)) * n_stands,
+                    "merch_inc": [0.1] * 50 * n_stands,
+                    "other_inc": [0.1] * 50 * n_stands,
+                    "foliage_inc": [
+                        0.1 + i % 2 for i in range(n_stands) for _ in range(50)
+                    ],
+                }
+            ),
+        }
+    )
+    results = []
+    with cbm_exn_model.initialize() as model:
+        for reporting_func in [lambda t, spinup_vars: None, None]:
+            spinup_vars = cbm_exn_spinup.prepare_spinup_vars(
+                spinup_input.convert_backend(BackendType.pandas),
+                model.parameters,
+            )
+            results.append(
+                cbm_exn_spinup.spinup(model, spinup_vars, reporting_func)
+            )
+    for name in ["pools", "state"]:
+        pd.testing.assert_frame_equal(
+            results[0][name].to_pandas(), results[1][name].to_pandas()
+        )
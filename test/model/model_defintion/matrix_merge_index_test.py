@@ -87,3 +87,62 @@ def test_merge_error_fill_value_out_of_range():
         m.merge({"a": np.array([1.0]), "b": np.array([1])}, fill_value=3)
     with pytest.raises(ValueError):
         m.merge({"a": np.array([1.0]), "b": np.array([1])}, fill_value=1000)
+
+
+def test_merge_many_keys():
+    rng = np.random.default_rng(1)
+    n_keys = 12
+    n_rows = 5000
+    key_data = {
+        f"k{i}": rng.integers(-50, 50, size=n_rows) for i in range(n_keys)
+    }
+    key_data["k0"] = np.arange(n_rows)  # ensure unique rows
+    m = MatrixMergeIndex(n_rows, key_data)
+    assert m.merge_keys == list(key_data.keys())
+
+    take = rng.integers(0, n_rows, size=20000)
+    merge_data = {k: v[take] for k, v in key_data.items()}
+    assert (m.merge(merge_data) == take).all()
+
+    merge_data["k5"] = merge_data["k5"].copy()
+    merge_data["k5"][7] = 1000
+    with pytest.raises(ValueError):
+        m.merge(merge_data)
+    result = m.merge(merge_data, fill_value=3)
+    assert result[7] == 3
+    assert (np.delete(result, 7) == np.delete(take, 7)).all()
+
+
+def test_update_merge_only_merges_changed_rows():
+    m = MatrixMergeIndex(
+        4,
+        {
+            "a": np.array([1, 1, 2, 2]),
+            "b": np.array([1, 2, 1, 2]),
+        },
+    )
+    previous_merge_data = {
+        "a": np.array([1, 2, 2, 1, 1]),
+        "b": np.array([1, 1, 2, 2, 1]),
+    }
+    previous_result = m.merge(previous_merge_data)
+    assert (previous_result == np.array([0, 2, 3, 1, 0])).all()
+
+    assert (
+        m.update_merge(
+            {k: v.copy() for k, v in previous_merge_data.items()},
+            previous_merge_data,
+            previous_result,
+        )
+        is None
+    )
+
+    merge_data = {
+        "a": np.array([1, 2, 1, 1, 1]),
+        "b": np.array([1, 1, 2, 2, 3]),
+    }
+    result = m.update_merge(
+        merge_data, previous_merge_data, previous_result, fill_value=0
+    )
+    assert (result == m.merge(merge_data, fill_value=0)).all()
+    assert (previous_result == np.array([0, 2, 3, 1, 0])).all()
@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+import pandas as pd
+from libcbm.model.model_definition.model_handle import ModelHandle
+
+
+def test_matrix_list_from_list_and_long_form():
+    handle = ModelHandle(None, {"a": 0, "b": 1, "c": 2}, [])
+    matrices = [
+        [["a", "b", 0.5], ["a", "a", 0.5]],
+        [],
+        [["c", "a", 1.0]],
+    ]
+    result = handle._get_pool_id_matrices(matrices, "matrix_list")
+    expected = [
+        np.array([[0, 1, 0.5], [0, 0, 0.5]]),
+        np.zeros(shape=(0, 3)),
+        np.array([[2, 0, 1.0]]),
+    ]
+    assert len(result) == len(expected)
+    for r, e in zip(result, expected):
+        assert r.flags["C_CONTIGUOUS"]
+        np.testing.assert_array_equal(r, e)
+
+    long_form = pd.DataFrame(
+        {
+            "matrix_idx": [2, 0, 0],
+            "source": ["c", "a", "a"],
+            "sink": ["a", "b", "a"],
+            "value": [1.0, 0.5, 0.5],
+        }
+    )
+    long_form_result = handle._get_pool_id_matrices(long_form, "matrix_list")
+    assert len(long_form_result) == len(expected)
+    for r, e in zip(long_form_result, expected):
+        np.testing.assert_array_equal(r, e)
+
+
+def test_matrix_list_unknown_pool_error():
+    handle = ModelHandle(None, {"a": 0, "b": 1}, [])
+    with pytest.raises(KeyError):
+        handle._get_pool_id_matrices([[["a", "x", 1.0]]], "matrix_list")
@@ -0,0 +1,55 @@
+import tempfile
+import pytest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from libcbm.model.model_definition.model_variables import ModelVariables
+from libcbm.model.model_definition.output_processor import (
+    ModelOutputProcessor,
+)
+from libcbm.model.model_definition.output_processor import (
+    ParquetOutputProcessor,
+)
+
+
+def _make_results(t: int) -> ModelVariables:
+    return ModelVariables.from_pandas(
+        {
+            "pools": pd.DataFrame({"a": np.arange(4) * t, "b": 1.0}),
+            "state": pd.DataFrame({"age": np.arange(4) + t}),
+        }
+    )
+
+
+def test_parquet_output_processor_row_groups():
+    pq = pytest.importorskip("pyarrow.parquet")
+    in_memory = ModelOutputProcessor()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with ParquetOutputProcessor(temp_dir) as parquet_output:
+            for t in range(1, 6):
+                in_memory.append_results(t, _make_results(t))
+                parquet_output.append_results(t, _make_results(t))
+
+        expected = in_memory.get_results()
+        for name in ["pools", "state"]:
+            path = parquet_output.get_path(name)
+            assert pq.ParquetFile(path).metadata.num_row_groups == 5
+            assert_frame_equal(
+                pd.read_parquet(path), expected[name].to_pandas()
+            )
+            # each row group holds one timestep, so a timestep filter is
+            # resolved from the row group statistics
+            metadata = pq.ParquetFile(path).metadata
+            timestep_col = metadata.schema.names.index("timestep")
+            for i in range(metadata.num_row_groups):
+                stats = metadata.row_group(i).column(timestep_col).statistics
+                assert stats.min == stats.max == i + 1
+            assert_frame_equal(
+                pq.read_table(path, filters=[("timestep", "=", 3)])
+                .to_pandas()
+                .reset_index(drop=True),
+                expected[name]
+                .to_pandas()
+                .query("timestep == 3")
+                .reset_index(drop=True),
+            )
@@ -1,4 +1,6 @@
 import numpy as np
+import pandas as pd
+from libcbm.storage import dataframe
 from libcbm.storage import series
 from libcbm.model.model_definition.spinup_engine import SpinupState
 from libcbm.model.model_definition import spinup_engine
@@ -252,3 +254,26 @@ def test_advance_spinup_state():
         this_rotation_slow=100,
         enabled=1,
     )
+
+
+def test_get_spinup_groups():
+    tables = [
+        dataframe.from_pandas(
+            pd.DataFrame(
+                {
+                    "a": [1, 2, 1, 2, 1],
+                    "b": ["x", "y", "x", "y", "y"],
+                    "area": [1.0, 2.0, 3.0, 4.0, 5.0],
+                }
+            )
+        ),
+        dataframe.from_pandas(
+            pd.DataFrame({"c": [np.nan, 0.5, np.nan, 0.5, np.nan]})
+        ),
+    ]
+    representative_index, group_index = spinup_engine.get_spinup_groups(
+        tables, exclude_columns=["area"]
+    )
+    assert representative_index.to_list() == [0, 1, 4]
+    assert group_index.to_list() == [0, 1, 0, 1, 2]
+    assert spinup_engine.get_spinup_groups(tables) is None
@@ -1,4 +1,6 @@
 import os
+import shutil
+import tempfile
 import unittest
 import numpy as np
 import pandas as pd
@@ -48,3 +50,32 @@ class MossCIntegrationTest(unittest.TestCase):
         self.assertTrue(spinup_debug is not None)
 
         self.assertTrue(model.spinup(ctx, enable_debugging=False) is None)
+
+    def test_grouped_spinup_matches_full_spinup(self):
+        test_data_dir = os.path.join(
+            resources.get_test_resources_dir(), "moss_c_test_case"
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for fn in os.listdir(test_data_dir):
+                shutil.copy(os.path.join(test_data_dir, fn), temp_dir)
+            inventory = pd.read_csv(os.path.join(temp_dir, "inventory.csv"))
+            # rows 0, 1 and 3 have an identical spinup signature
+            inventory = pd.concat([inventory] * 4, ignore_index=True)
+            inventory["id"] = inventory.index + 1
+            inventory["area"] = [1.0, 2.0, 3.0, 4.0]
+            inventory["age"] = [0, 0, 50, 0]
+            inventory.to_csv(
+                os.path.join(temp_dir, "inventory.csv"), index=False
+            )
+
+            full_ctx = model_context_factory.create_from_csv(temp_dir)
+            model.spinup(full_ctx, enable_debugging=True)
+            grouped_ctx = model_context_factory.create_from_csv(temp_dir)
+            model.spinup(grouped_ctx, enable_debugging=False)
+
+        pd.testing.assert_frame_equal(
+            full_ctx.pools.to_pandas(), grouped_ctx.pools.to_pandas()
+        )
+        pd.testing.assert_frame_equal(
+            full_ctx.state.to_pandas(), grouped_ctx.state.to_pandas()
+        )
@@ -172,3 +172,30 @@ def test_series():
             s_base.indices_nonzero().to_list()
             == list(np.arange(0, 100, dtype="int32"))[1:]
         )
+
+
+def test_series_map_value_types():
+    rng = np.random.default_rng(0)
+    keys = rng.permutation(np.arange(-500, 500))
+    values = rng.integers(0, 10, size=keys.shape[0]).astype("float")
+    d = dict(zip(keys.tolist(), values.tolist()))
+    data = rng.choice(keys, size=10000)
+    expected = [d[x] for x in data.tolist()]
+
+    str_d = {k: f"v{v}" for k, v in d.items()}
+    str_keyed_d = {f"k{k}": v for k, v in d.items()}
+    str_data = np.array([f"k{x}" for x in data.tolist()], dtype=object)
+    for backend in BackendType:
+        s = dataframe.convert_series_backend(
+            series.from_numpy("s", data), backend
+        )
+        assert s.map(d).to_list() == expected
+        assert s.map(str_d).to_list() == [f"v{x}" for x in expected]
+        s_str = dataframe.convert_series_backend(
+            series.from_numpy("s", str_data), backend
+        )
+        assert s_str.map(str_keyed_d).to_list() == expected
+        with pytest.raises(KeyError):
+            s.map({k: v for k, v in d.items() if k != data[5]})
+        with pytest.raises(KeyError):
+            s_str.map({"k0": 1.0})
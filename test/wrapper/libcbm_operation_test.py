@@ -46,3 +46,40 @@ class LibCBMOperationTest(unittest.TestCase):
                 )
             ).all()
         )
+
+    def test_update_assigns_new_values(self):
+        pool_dict = {"a": 0, "b": 1, "c": 2}
+        pooldef = pool_flux_helpers.create_pools(list(pool_dict.keys()))
+        dll = pool_flux_helpers.load_dll(
+            {"pools": pooldef, "flux_indicators": []}
+        )
+
+        def get_data(a_b_flow: np.ndarray) -> list:
+            return [
+                [pool_dict["a"], pool_dict["a"], 1.0],
+                [pool_dict["a"], pool_dict["b"], a_b_flow],
+                [pool_dict["b"], pool_dict["b"], 1.0],
+                [pool_dict["c"], pool_dict["c"], 1.0],
+            ]
+
+        op = libcbm_operation.Operation(
+            dll,
+            libcbm_operation.OperationFormat.RepeatingCoordinates,
+            data=get_data(np.array([2.0, 3.0, 4.0])),
+            matrix_index=np.array([0, 1, 2, 0], dtype=np.uint64),
+            op_process_id=0,
+        )
+        op.update(
+            get_data(np.array([5.0, 6.0, 7.0])),
+            np.array([2, 1, 0, 0], dtype=np.uint64),
+        )
+
+        pools_orig = np.ones(shape=(4, len(pool_dict)))
+        pools_out = dataframe.from_numpy(
+            {name: pools_orig[:, idx] for name, idx in pool_dict.items()}
+        )
+        libcbm_operation.compute(dll, pools_out, [op])
+        self.assertTrue(
+            (pools_out["b"].to_numpy() == np.array([8.0, 7.0, 6.0, 6.0])).all()
+        )
+        op.dispose()